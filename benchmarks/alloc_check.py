@@ -0,0 +1,230 @@
+"""Checks that a steady-state simulation tick allocates (near) nothing.
+
+Builds a world with a player walking and shooting under scripted input, enemies chasing and
+patrolling, projectiles in flight and particles, and warms it up. Then:
+- traces ticks with tracemalloc and reports how much memory allocated by game code is still
+  alive at the end;
+- counts the allocations each further tick makes, temporaries included (see AllocationCounter).
+Exits non-zero if the allocations of a typical (median) tick or the retained bytes exceed their
+limits. The median rather than the worst tick: every few seconds enemies redraw their patrol
+direction together, and each draw boxes the 64-bit ints of the counter-based stream.
+
+    SDL_VIDEODRIVER=dummy python benchmarks/alloc_check.py --ticks 600
+"""
+from __future__ import annotations
+import argparse
+import gc
+import math
+import os
+import sys
+import tracemalloc
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+
+from game.core.camera import Camera
+from game.world.enemy import Enemy
+from game.world.entities import EntityRegistry
+from game.world.particles import ParticleSystem
+from game.world.player import Player
+from game.world.projectiles import ProjectilePool
+from game.world.tilemap import TileMap
+
+GAME_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "game")
+
+
+class ScriptedInput:
+	"""Walks in a slow circle and holds fire, aiming at a fixed screen point."""
+
+	def __init__(self):
+		self.tick = 0
+		self._move = (0.0, 0.0)
+
+	def advance(self) -> None:
+		self.tick += 1
+		angle = self.tick * 0.02
+		self._move = (math.cos(angle), math.sin(angle))
+
+	def get_move_vector(self):
+		return self._move
+
+	def is_action_held(self, action: str) -> bool:
+		return action == "fire"
+
+	def get_mouse_screen(self):
+		return (900, 300)
+
+
+class AllocationCounter:
+	"""Counts the allocations Python code makes, including temporaries freed right after.
+
+	tracemalloc's current size only says what is alive, so a Rect created and dropped within one
+	expression never shows up in it. Here the peak is reset before every bytecode (opcode tracing)
+	and read after it: an opcode that allocated anything raised the peak, even if the same opcode
+	freed other memory. Each rise counts as one allocation.
+
+	calibrate() first records the rises of code that allocates only in ways every line of Python does,
+	and those sizes are then ignored: boxed ints (pixel coordinates are past the small-int cache),
+	range loops, and the argument handling inside pygame's Rect and Vector2 methods. Objects of
+	exactly those sizes are invisible too. Tracing makes code ~100x slower, so count a few ticks.
+	"""
+
+	def __init__(self):
+		self.allocations = 0
+		self._start = 0
+		self._skip = False
+		self._ignored: frozenset = frozenset()
+		self._samples: set | None = None
+		# Returning a stored bound method; `return self._trace` would allocate one per event
+		self._tracer = self._trace
+
+	def _trace(self, frame, event, arg):
+		if event == "call" or event == "return":
+			if event == "call":
+				frame.f_trace_opcodes = True
+				frame.f_trace_lines = False
+			# Tracing materializes the frame object of every call; skip the opcode that sees it
+			self._skip = True
+			return self._tracer
+		grown = tracemalloc.get_traced_memory()[1] - self._start
+		if self._skip:
+			self._skip = False
+		elif grown > 0:
+			if self._samples is not None:
+				self._samples.add(grown)
+			elif grown not in self._ignored:
+				self.allocations += 1
+		del grown
+		self._start = tracemalloc.get_traced_memory()[0]
+		tracemalloc.reset_peak()
+		return self._tracer
+
+	def count(self, fn) -> int:
+		"""Allocations made while running fn(), with the cyclic GC off so it cannot run midway."""
+		self.allocations = 0
+		self._skip = True
+		gc.disable()
+		tracemalloc.start()
+		sys.settrace(self._tracer)
+		try:
+			fn()
+		finally:
+			sys.settrace(None)
+			tracemalloc.stop()
+			gc.enable()
+		return self.allocations
+
+	def calibrate(self) -> None:
+		self._samples = set()
+		for _ in range(3):
+			self.count(_interpreter_churn)
+		self._ignored = frozenset(self._samples)
+		self._samples = None
+
+
+_CHURN_INT = 1 << 20
+_CHURN_VECTOR = pygame.Vector2()
+_CHURN_RECT = pygame.Rect(0, 0, 4, 4)
+_CHURN_BOUNDS = pygame.Rect(0, 0, 8, 8)
+
+
+def _interpreter_churn() -> None:
+	"""Allocates only what any Python code does: boxed ints, range loops, pygame method calls."""
+	n = _CHURN_INT
+	for i in range(3):
+		n = n + i
+		for j in range(n, n + 2):
+			n = j
+	_CHURN_VECTOR.update(1.5, 2.5)
+	_CHURN_VECTOR.distance_to(_CHURN_VECTOR)
+	_CHURN_RECT.colliderect(_CHURN_BOUNDS)
+	_CHURN_RECT.clamp_ip(_CHURN_BOUNDS)
+
+
+def build_world(enemy_count: int):
+	tile_map = TileMap(96, 96, 32)
+	ts = tile_map.tile_size
+	for ty in range(40, 56):
+		for tx in range(40, 56):
+			tile_map.set_tile(tx, ty, False)
+	tile_map.apply_tile_changes()
+	projectiles = ProjectilePool(256)
+	particles = ParticleSystem(512)
+	controls = ScriptedInput()
+	player = Player(spawn_pos=(ts * 48, ts * 48), input_manager=controls, projectiles=projectiles, particles=particles, tile_map=tile_map)
+	registry = EntityRegistry(lambda: Enemy(spawn_pos=(0, 0), tile_map=tile_map, target_getter=lambda: player, projectiles=projectiles, particles=particles))
+	for i in range(enemy_count):
+		# Half close enough to chase and shoot, half patrolling further out
+		radius = ts * (4 if i % 2 == 0 else 20)
+		angle = i * 2.399
+		registry.spawn((ts * 48 + math.cos(angle) * radius, ts * 48 + math.sin(angle) * radius))
+	camera = Camera(1280, 720, tile_map.pixel_width, tile_map.pixel_height)
+	for i in range(64):
+		particles.spawn((ts * 48, ts * 48), (math.cos(i) * 30.0, math.sin(i) * 30.0), (255, 200, 80), 1e9)
+
+	def tick() -> None:
+		controls.advance()
+		player.update(camera)
+		for e in registry.active:
+			e.update()
+		projectiles.update(tile_map=tile_map, player=player, enemies=registry.active)
+		particles.update()
+		camera.update_follow(player.position)
+		registry.flush()
+		# Keep the fight going: the player is immortal and fallen enemies respawn
+		player.health = 100.0
+		while len(registry) < enemy_count:
+			registry.spawn((ts * 48 + ts * 6, ts * 48))
+
+	return tick
+
+
+def main() -> None:
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+	parser.add_argument("--ticks", type=int, default=600, help="ticks traced for retained memory")
+	parser.add_argument("--counted-ticks", type=int, default=20, help="ticks whose allocations are counted")
+	parser.add_argument("--enemies", type=int, default=200)
+	parser.add_argument("--warmup", type=int, default=120)
+	parser.add_argument("--max-allocations", type=int, default=8, help="allocations a typical tick may make (median)")
+	parser.add_argument("--max-retained", type=int, default=1024, help="bytes game code may still hold after the run")
+	args = parser.parse_args()
+
+	pygame.display.init()
+	tick = build_world(args.enemies)
+	# Warm-up runs traced too: values replaced every tick (floats in attributes) then count on both sides
+	tracemalloc.start()
+	for _ in range(args.warmup):
+		tick()
+	before = tracemalloc.take_snapshot()
+	for _ in range(args.ticks):
+		tick()
+	after = tracemalloc.take_snapshot()
+	tracemalloc.stop()
+
+	# Counted after the retained run: the counter restarts tracemalloc, which forgets earlier traces
+	counter = AllocationCounter()
+	counter.calibrate()
+	# The first traced ticks fill caches tracing itself needs
+	for _ in range(2):
+		counter.count(tick)
+	allocations = sorted(counter.count(tick) for _ in range(args.counted_ticks))
+
+	game_only = [tracemalloc.Filter(True, os.path.join(GAME_DIR, "*"))]
+	growth = after.filter_traces(game_only).compare_to(before.filter_traces(game_only), "lineno")
+	retained = sum(stat.size_diff for stat in growth if stat.size_diff > 0)
+	p50 = allocations[len(allocations) // 2]
+	print(f"allocations per tick ({args.enemies} enemies): p50={p50} p99={allocations[int(len(allocations) * 0.99)]} max={allocations[-1]}")
+	print(f"retained by game code after {args.ticks} ticks: {retained} bytes")
+	for stat in growth[:5]:
+		if stat.size_diff > 0:
+			print(f"  {stat}")
+	failed = p50 > args.max_allocations or retained > args.max_retained
+	print("FAIL" if failed else "OK")
+	pygame.quit()
+	sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,121 @@
+"""Hitches while the camera pans across unvisited parts of the tile map.
+
+Pans a camera along a scripted path at a constant speed and times every frame: the tile map draw,
+plus in the prefetch case the ChunkPrefetcher slice that main.py runs in the frame's spare time.
+Compares building chunks inside draw() (unbudgeted, and capped at two per frame as main.py does,
+which shows placeholders instead) against prefetching them ahead of the camera. A hitch is a frame
+over the frame budget.
+
+    SDL_VIDEODRIVER=dummy python benchmarks/chunk_prefetch.py --target-fps 144 --speed 1500
+"""
+from __future__ import annotations
+import argparse
+import math
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+
+from game.core.camera import Camera
+from game.world.prefetch import ChunkPrefetcher
+from game.world.tilemap import TileMap
+
+VIEW = (1280, 720)
+DT = 1.0 / 60.0
+
+
+def pan_path(tile_map: TileMap, speed: float):
+	"""Camera positions of a serpentine pan over the whole map, one per frame."""
+	half_w = VIEW[0] * 0.5
+	half_h = VIEW[1] * 0.5
+	rows = []
+	y = half_h
+	while y <= tile_map.pixel_height - half_h:
+		rows.append(y)
+		y += VIEW[1] * 1.5
+	waypoints = []
+	for i, y in enumerate(rows):
+		xs = (half_w, tile_map.pixel_width - half_w)
+		if i % 2:
+			xs = xs[::-1]
+		waypoints.extend((x, y) for x in xs)
+	step = speed * DT
+	x, y = waypoints[0]
+	for tx, ty in waypoints[1:]:
+		dist = math.hypot(tx - x, ty - y)
+		n = max(1, int(dist // step))
+		for k in range(1, n + 1):
+			yield x + (tx - x) * k / n, y + (ty - y) * k / n
+		x, y = tx, ty
+
+
+def run(scene: pygame.Surface, tiles: int, speed: float, mode: str, budget_ms: float) -> dict:
+	tile_map = TileMap(tiles, tiles, 32)
+	tile_map.max_chunk_builds_per_frame = None if mode == "draw" else 2
+	placeholders = [0]
+	draw_placeholder = tile_map._draw_chunk_placeholder
+
+	def counting_placeholder(*args):
+		placeholders[0] += 1
+		draw_placeholder(*args)
+
+	tile_map._draw_chunk_placeholder = counting_placeholder
+	camera = Camera(VIEW[0], VIEW[1], tile_map.pixel_width, tile_map.pixel_height)
+	prefetcher = ChunkPrefetcher(tile_map) if mode == "prefetch" else None
+	frame_ms = []
+	placeholder_frames = 0
+	path = pan_path(tile_map, speed)
+	# The chunks around the start are built untimed, as the game does over its first frames
+	camera.position_x, camera.position_y = next(path)
+	builds = tile_map.max_chunk_builds_per_frame
+	tile_map.max_chunk_builds_per_frame = None
+	tile_map.draw(scene, camera)
+	tile_map.max_chunk_builds_per_frame = builds
+	for x, y in path:
+		camera.position_x = x
+		camera.position_y = y
+		before = placeholders[0]
+		start = time.perf_counter()
+		scene.fill((16, 16, 20))
+		tile_map.draw(scene, camera)
+		if prefetcher is not None:
+			prefetcher.update(camera, DT)
+			prefetcher.run(max(0.5, budget_ms - (time.perf_counter() - start) * 1000.0 - 1.0))
+		frame_ms.append((time.perf_counter() - start) * 1000.0)
+		if placeholders[0] != before:
+			placeholder_frames += 1
+	frame_ms.sort()
+	return {
+		"frames": len(frame_ms),
+		"p50": frame_ms[len(frame_ms) // 2],
+		"p99": frame_ms[int(len(frame_ms) * 0.99)],
+		"max": frame_ms[-1],
+		"hitches": sum(1 for ms in frame_ms if ms > budget_ms),
+		"placeholder_frames": placeholder_frames,
+	}
+
+
+def main() -> None:
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+	parser.add_argument("--tiles", type=int, default=192, help="map width and height in tiles")
+	parser.add_argument("--speed", type=float, default=900.0, help="pan speed in pixels per second")
+	parser.add_argument("--target-fps", type=float, default=60.0)
+	args = parser.parse_args()
+
+	pygame.display.init()
+	pygame.display.set_mode(VIEW)
+	scene = pygame.Surface(VIEW).convert_alpha()
+	budget_ms = 1000.0 / args.target_fps
+	names = {"draw": "build in draw      ", "budgeted": "2 builds per frame ", "prefetch": "prefetch           "}
+	for mode in ("draw", "budgeted", "prefetch"):
+		r = run(scene, args.tiles, args.speed, mode, budget_ms)
+		print(f"{names[mode]} frame ms p50={r['p50']:.2f} p99={r['p99']:.2f} max={r['max']:.2f}  hitches(>{budget_ms:.1f} ms)={r['hitches']}/{r['frames']}  frames with placeholders={r['placeholder_frames']}")
+	pygame.quit()
+
+
+if __name__ == "__main__":
+	main()
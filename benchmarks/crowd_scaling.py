@@ -0,0 +1,187 @@
+"""Cost and effect of crowd separation while enemies converge on the player.
+
+Spawns N enemies in a ring around a stationary player in an open arena, all chasing, and steps them
+for a number of ticks. Per tick it times the separation pass (run every --period ticks) and the
+enemy steps separately, and reports both next to the full tick, which is what has to fit the 60 Hz
+budget. Three modes are compared:
+- none: no separation
+- naive: every pair is tested
+- grid: CrowdSeparation
+At the end it counts the enemies overlapping another one. Enemies do not fire, so the numbers are
+steering and movement only.
+
+    SDL_VIDEODRIVER=dummy python benchmarks/crowd_scaling.py --counts 250 500 1000 2000 4000
+"""
+from __future__ import annotations
+import argparse
+import math
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+
+from game.world.crowd import CrowdSeparation
+from game.world.enemy import Enemy
+from game.world.particles import ParticleSystem
+from game.world.player import Player
+from game.world.projectiles import ProjectilePool
+from game.world.tilemap import TileMap
+
+TILE = 32
+BUDGET_MS = 1000.0 / 60.0
+
+
+class _StillInput:
+	def get_move_vector(self):
+		return (0.0, 0.0)
+
+	def is_action_held(self, action: str) -> bool:
+		return False
+
+	def get_mouse_screen(self):
+		return (0, 0)
+
+
+def build_arena(count: int, arena_tiles: int):
+	tiles = arena_tiles + 2
+	tile_map = TileMap(tiles, tiles, TILE)
+	for ty in range(1, tiles - 1):
+		for tx in range(1, tiles - 1):
+			tile_map.set_tile(tx, ty, False)
+	tile_map.apply_tile_changes()
+	projectiles = ProjectilePool(16)
+	particles = ParticleSystem(16)
+	center = tile_map.pixel_width * 0.5
+	player = Player(spawn_pos=(center, center), input_manager=_StillInput(), projectiles=projectiles, particles=particles, tile_map=tile_map)
+	enemies = []
+	inner = 200.0
+	outer = center - TILE * 2
+	for i in range(count):
+		# Even spread over the ring: golden-angle spiral on the ring's area
+		radius = math.sqrt(inner * inner + (outer * outer - inner * inner) * (i + 0.5) / count)
+		angle = i * 2.399963
+		e = Enemy(spawn_pos=(center + math.cos(angle) * radius, center + math.sin(angle) * radius), tile_map=tile_map, target_getter=lambda: player, projectiles=projectiles, particles=particles)
+		e.state = "chase"
+		e._fire_timer = 1e12
+		enemies.append(e)
+	return tile_map, enemies
+
+
+def naive_separation(enemies, crowd: CrowdSeparation) -> None:
+	"""The same steering as CrowdSeparation.update(), testing every pair."""
+	r = crowd.radius
+	r2 = r * r
+	n = len(enemies)
+	xs = [e.position.x for e in enemies]
+	ys = [e.position.y for e in enemies]
+	for k in range(n):
+		x = xs[k]
+		y = ys[k]
+		push_x = 0.0
+		push_y = 0.0
+		crowding = 0.0
+		for j in range(n):
+			if j == k:
+				continue
+			dx = x - xs[j]
+			dy = y - ys[j]
+			d2 = dx * dx + dy * dy
+			if d2 < r2:
+				if d2 > 1e-6:
+					d = math.sqrt(d2)
+					f = (r - d) / d2
+					push_x += dx * f
+					push_y += dy * f
+					crowding += 1.0 - d / r
+				else:
+					push_x += 1.0 if k > j else -1.0
+					crowding += 1.0
+		enemies[k].separation_x = push_x * crowd.strength
+		enemies[k].separation_y = push_y * crowd.strength
+		enemies[k].crowding = crowding * crowd.give_way
+
+
+def overlapping(enemies, min_distance: float) -> int:
+	"""Enemies whose center is closer than `min_distance` to another enemy's."""
+	cells = {}
+	for i, e in enumerate(enemies):
+		cells.setdefault((int(e.position.x // TILE), int(e.position.y // TILE)), []).append(i)
+	d2_min = min_distance * min_distance
+	count = 0
+	for i, e in enumerate(enemies):
+		cx = int(e.position.x // TILE)
+		cy = int(e.position.y // TILE)
+		found = False
+		for ny in (cy - 1, cy, cy + 1):
+			for nx in (cx - 1, cx, cx + 1):
+				for j in cells.get((nx, ny), ()):
+					if j != i and (enemies[j].position - e.position).length_squared() < d2_min:
+						found = True
+		count += found
+	return count
+
+
+def run(count: int, mode: str, ticks: int, arena_tiles: int, period: int = 1) -> dict:
+	tile_map, enemies = build_arena(count, arena_tiles)
+	crowd = CrowdSeparation(enemies, tile_map)
+	separate_ms = []
+	step_ms = []
+	for tick in range(ticks):
+		start = time.perf_counter()
+		if tick % period == 0:
+			if mode == "grid":
+				crowd.update()
+			elif mode == "naive":
+				naive_separation(enemies, crowd)
+		middle = time.perf_counter()
+		for e in enemies:
+			e.step()
+		end = time.perf_counter()
+		separate_ms.append((middle - start) * 1000.0)
+		step_ms.append((end - middle) * 1000.0)
+	# The crowd is densest at the end; time the second half
+	half = ticks // 2
+	sep = sorted(separate_ms[half:])
+	total = sorted(s + m for s, m in zip(separate_ms[half:], step_ms[half:]))
+	return {
+		"separate_avg": sum(sep) / len(sep),
+		"separate_p99": sep[int(len(sep) * 0.99)],
+		"step_avg": sum(step_ms[half:]) / len(step_ms[half:]),
+		"total_avg": sum(total) / len(total),
+		"total_p99": total[int(len(total) * 0.99)],
+		"overlapping": overlapping(enemies, 16.0),
+	}
+
+
+def main() -> None:
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+	parser.add_argument("--counts", type=int, nargs="+", default=[250, 500, 1000, 2000, 4000])
+	parser.add_argument("--ticks", type=int, default=600)
+	parser.add_argument("--arena", type=int, default=120, help="arena size in tiles")
+	parser.add_argument("--period", type=int, default=2, help="ticks between separation passes; main.py runs it at 30 Hz")
+	parser.add_argument("--naive-max", type=int, default=1000, help="largest count to run the pairwise version for")
+	args = parser.parse_args()
+
+	pygame.display.init()
+	print(f"{'enemies':>7} {'mode':>6} {'separation ms':>14} {'tick ms':>8} {'sep p99':>8} {'tick p99':>9} {'steps ms':>9} {'overlap':>8}")
+	for count in args.counts:
+		for mode in ("none", "naive", "grid"):
+			if mode == "naive" and count > args.naive_max:
+				continue
+			r = run(count, mode, args.ticks, args.arena, args.period)
+			if r["total_avg"] > BUDGET_MS:
+				over = " misses 60 Hz"
+			elif r["total_p99"] > BUDGET_MS:
+				over = " over budget (p99)"
+			else:
+				over = ""
+			print(f"{count:>7} {mode:>6} {r['separate_avg']:>14.2f} {r['total_avg']:>8.2f} {r['separate_p99']:>8.2f} {r['total_p99']:>9.2f} {r['step_avg']:>9.2f} {r['overlapping']:>8}{over}", flush=True)
+	pygame.quit()
+
+
+if __name__ == "__main__":
+	main()
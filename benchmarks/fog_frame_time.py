@@ -0,0 +1,87 @@
+"""Frame time with and without fog of war on a large map.
+
+Walks a player across a 1024x1024 tile map with the camera following it and times the world render
+(tile map + fog) per frame, reporting percentiles and how often visibility was recomputed.
+
+    SDL_VIDEODRIVER=dummy python benchmarks/fog_frame_time.py --size 1024 --frames 600
+"""
+from __future__ import annotations
+import argparse
+import os
+import statistics
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+
+from game.core.camera import Camera
+from game.world.fog import FogOfWar
+from game.world.tilemap import TileMap
+
+VIEW = (1280, 720)
+
+
+def run(tile_map: TileMap, frames: int, fog_enabled: bool, scene: pygame.Surface) -> dict:
+	tile_map._chunk_cache.clear()
+	camera = Camera(VIEW[0], VIEW[1], tile_map.pixel_width, tile_map.pixel_height)
+	fog = FogOfWar(tile_map) if fog_enabled else None
+	ts = tile_map.tile_size
+	x = ts * 20.0
+	y = ts * 20.0
+	fog_ms = []
+	frame_ms = []
+	for i in range(frames):
+		# Diagonal walk at ~220 px/s, like the player's max speed
+		x += 220.0 / 60.0
+		y += 110.0 / 60.0
+		camera.update_follow((x, y))
+		start = time.perf_counter()
+		scene.fill((16, 16, 20))
+		tile_map.draw(scene, camera)
+		if fog is not None:
+			fog_start = time.perf_counter()
+			fog.update((x, y))
+			fog.draw(scene, camera)
+			fog_ms.append((time.perf_counter() - fog_start) * 1000.0)
+		frame_ms.append((time.perf_counter() - start) * 1000.0)
+	frame_ms.sort()
+	result = {
+		"p50": frame_ms[len(frame_ms) // 2],
+		"p95": frame_ms[int(len(frame_ms) * 0.95)],
+		"max": frame_ms[-1],
+		"mean": statistics.fmean(frame_ms),
+	}
+	if fog is not None:
+		fog_ms.sort()
+		result["fog_p50"] = fog_ms[len(fog_ms) // 2]
+		result["fog_p95"] = fog_ms[int(len(fog_ms) * 0.95)]
+		result["recomputes"] = fog.recomputes
+	return result
+
+
+def main() -> None:
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+	parser.add_argument("--size", type=int, default=1024, help="map size in tiles (square)")
+	parser.add_argument("--frames", type=int, default=600)
+	args = parser.parse_args()
+
+	pygame.display.init()
+	pygame.display.set_mode(VIEW)
+	scene = pygame.Surface(VIEW).convert_alpha()
+	start = time.perf_counter()
+	tile_map = TileMap(args.size, args.size, 32)
+	print(f"map {args.size}x{args.size} generated in {time.perf_counter() - start:.2f} s")
+	for enabled in (False, True):
+		r = run(tile_map, args.frames, enabled, scene)
+		line = f"fog {'on ' if enabled else 'off'}  frame ms p50={r['p50']:.2f} p95={r['p95']:.2f} max={r['max']:.2f} mean={r['mean']:.2f}"
+		if enabled:
+			line += f"  | fog ms p50={r['fog_p50']:.2f} p95={r['fog_p95']:.2f}, {r['recomputes']} FOV recomputes in {args.frames} frames"
+		print(line)
+	pygame.quit()
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,141 @@
+"""Frame time percentiles with automatic garbage collection versus ManualGC.
+
+Builds a world like main.py (tile map, pooled enemies chasing a target, projectiles, particles and a
+snapshot ring that captures every tick, which keeps a large population of long-lived tuples) and
+times frames of simulation plus tile and enemy drawing. With automatic collection the collector
+runs whenever allocations cross its thresholds; with ManualGC the world is frozen after setup and
+collection runs in the frame's leftover time. Frame time includes that collection.
+
+    SDL_VIDEODRIVER=dummy python benchmarks/gc_frame_time.py --frames 1800
+"""
+from __future__ import annotations
+import argparse
+import gc
+import os
+import statistics
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+
+from game.core.camera import Camera
+from game.core.gc_control import ManualGC
+from game.core.profiling import GCMonitor
+from game.saves.snapshots import SnapshotRing
+from game.world.enemy import Enemy
+from game.world.entities import EntityRegistry
+from game.world.particles import ParticleSystem
+from game.world.projectiles import ProjectilePool
+from game.world.tilemap import TileMap
+
+VIEW = (1280, 720)
+
+
+class _Target:
+	def __init__(self, x: float, y: float):
+		self.position = pygame.Vector2(x, y)
+		self.velocity = pygame.Vector2(0, 0)
+		self.size = pygame.Vector2(28, 28)
+		self.health = 1e9
+		self.armor = 0.0
+		self._fire_timer = 0.0
+		self.is_dead = False
+
+	@property
+	def rect(self) -> pygame.Rect:
+		return pygame.Rect(int(self.position.x) - 14, int(self.position.y) - 14, 28, 28)
+
+	def take_damage(self, amount: float, damage_type: str = "") -> None:
+		self.health -= amount
+
+
+def run(scene: pygame.Surface, frames: int, enemy_count: int, manual: bool, budget_ms: float) -> dict:
+	tile_map = TileMap(160, 160, 32)
+	ts = tile_map.tile_size
+	target = _Target(ts * 80.0, ts * 80.0)
+	projectiles = ProjectilePool(256)
+	particles = ParticleSystem(512)
+	registry = EntityRegistry(lambda: Enemy(spawn_pos=(0, 0), tile_map=tile_map, target_getter=lambda: target, projectiles=projectiles, particles=particles))
+	for i in range(enemy_count):
+		registry.spawn((ts * (60 + i % 40), ts * (60 + i // 40)))
+	enemies = registry.active
+	snapshots = SnapshotRing(target, registry, projectiles, particles, tile_map, capacity=60)
+	camera = Camera(VIEW[0], VIEW[1], tile_map.pixel_width, tile_map.pixel_height)
+	camera.update_follow(target.position)
+	tile_map.draw(scene, camera)
+
+	monitor = GCMonitor()
+	monitor.install()
+	collector = ManualGC() if manual else None
+	if collector is not None:
+		collector.freeze()
+	monitor.take()
+	frame_ms = []
+	gc_counts = [0, 0, 0]
+	gc_ms = 0.0
+	gc_hitches = 0
+	try:
+		for tick in range(frames):
+			start = time.perf_counter()
+			for e in enemies:
+				e.update()
+			projectiles.update(tile_map=tile_map, player=target, enemies=enemies)
+			particles.update()
+			snapshots.capture(tick)
+			scene.fill((16, 16, 20))
+			tile_map.draw(scene, camera)
+			for e in enemies:
+				e.draw(scene, camera)
+			if collector is not None:
+				collector.collect(budget_ms - (time.perf_counter() - start) * 1000.0 - 1.0)
+			frame_ms.append((time.perf_counter() - start) * 1000.0)
+			counts, ms = monitor.take()
+			if frame_ms[-1] > budget_ms and ms > 0.0:
+				gc_hitches += 1
+			for gen in range(3):
+				gc_counts[gen] += counts[gen]
+			gc_ms += ms
+	finally:
+		monitor.uninstall()
+		if collector is not None:
+			collector.release()
+			gc.unfreeze()
+	frame_ms.sort()
+	return {
+		"p50": frame_ms[len(frame_ms) // 2],
+		"p90": frame_ms[int(len(frame_ms) * 0.9)],
+		"p99": frame_ms[int(len(frame_ms) * 0.99)],
+		"max": frame_ms[-1],
+		"mean": statistics.fmean(frame_ms),
+		"hitches": sum(1 for ms in frame_ms if ms > budget_ms),
+		"gc_hitches": gc_hitches,
+		"gc_counts": gc_counts,
+		"gc_ms": gc_ms,
+	}
+
+
+def main() -> None:
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+	parser.add_argument("--frames", type=int, default=1800)
+	parser.add_argument("--enemies", type=int, default=120)
+	parser.add_argument("--target-fps", type=float, default=60.0)
+	args = parser.parse_args()
+
+	pygame.display.init()
+	pygame.display.set_mode(VIEW)
+	scene = pygame.Surface(VIEW).convert_alpha()
+	budget_ms = 1000.0 / args.target_fps
+	for manual in (False, True):
+		r = run(scene, args.frames, args.enemies, manual, budget_ms)
+		gc.collect()
+		name = "manual gc   " if manual else "automatic gc"
+		gen0, gen1, gen2 = r["gc_counts"]
+		print(f"{name}  frame ms p50={r['p50']:.2f} p90={r['p90']:.2f} p99={r['p99']:.2f} max={r['max']:.2f} mean={r['mean']:.2f}  hitches(>{budget_ms:.1f} ms)={r['hitches']} with gc={r['gc_hitches']}  gc {gen0}/{gen1}/{gen2} collections {r['gc_ms']:.0f} ms")
+	pygame.quit()
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,139 @@
+"""Cost of streaming per-frame metrics, as a share of frame time.
+
+Runs a world like main.py through the Scheduler (pooled enemies chasing a target, projectiles,
+particles) plus tile and enemy drawing, and records every frame with MetricsEmitter into a JSON-lines
+file or a UDP statsd endpoint. Reports the time spent in record() on the frame and the CPU time of
+the background flush thread against the frame time; the emitter is flushed on a short interval so
+the flush cost lands inside the measured run.
+
+    SDL_VIDEODRIVER=dummy python benchmarks/metrics_overhead.py --frames 1800
+"""
+from __future__ import annotations
+import argparse
+import os
+import socket
+import statistics
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+
+from game.core.camera import Camera
+from game.core.metrics import JsonLinesSink, MetricsEmitter, StatsdSink
+from game.core.scheduler import Scheduler
+from game.core.time_step import FixedTimeStep
+from game.world.enemy import Enemy
+from game.world.entities import EntityRegistry
+from game.world.particles import ParticleSystem
+from game.world.projectiles import ProjectilePool
+from game.world.tilemap import TileMap
+
+VIEW = (1280, 720)
+
+
+class _Target:
+	def __init__(self, x: float, y: float):
+		self.position = pygame.Vector2(x, y)
+		self.size = pygame.Vector2(28, 28)
+		self.health = 1e9
+		self.is_dead = False
+
+	@property
+	def rect(self) -> pygame.Rect:
+		return pygame.Rect(int(self.position.x) - 14, int(self.position.y) - 14, 28, 28)
+
+	def take_damage(self, amount: float, damage_type: str = "") -> None:
+		self.health -= amount
+
+
+def run(scene: pygame.Surface, frames: int, enemy_count: int, sink_name: str, out_dir: str, flush_interval: float) -> dict:
+	tile_map = TileMap(160, 160, 32)
+	ts = tile_map.tile_size
+	target = _Target(ts * 80.0, ts * 80.0)
+	projectiles = ProjectilePool(256)
+	particles = ParticleSystem(512)
+	registry = EntityRegistry(lambda: Enemy(spawn_pos=(0, 0), tile_map=tile_map, target_getter=lambda: target, projectiles=projectiles, particles=particles))
+	for i in range(enemy_count):
+		registry.spawn((ts * (60 + i % 40), ts * (60 + i // 40)))
+	enemies = registry.active
+	camera = Camera(VIEW[0], VIEW[1], tile_map.pixel_width, tile_map.pixel_height)
+	camera.update_follow(target.position)
+
+	scheduler = Scheduler(FixedTimeStep(1.0 / 60.0))
+	scheduler.register("enemies", lambda dt: [e.update() for e in enemies])
+	scheduler.register("projectiles", lambda dt: projectiles.update(tile_map=tile_map, player=target, enemies=enemies))
+	scheduler.register("particles", particles.update, rate_hz=30)
+
+	emitter = None
+	receiver = None
+	if sink_name == "jsonl":
+		sink = JsonLinesSink(os.path.join(out_dir, "frames.jsonl"))
+	elif sink_name == "statsd":
+		receiver = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+		receiver.bind(("127.0.0.1", 0))
+		receiver.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 20)
+		sink = StatsdSink(receiver.getsockname())
+	if sink_name != "none":
+		emitter = MetricsEmitter(sink, scheduler.systems, {
+			"enemies": lambda: len(enemies),
+			"projectiles": lambda: sum(1 for p in projectiles.projectiles if p.active),
+			"particles": lambda: sum(1 for p in particles.particles if p.active),
+			"chunks": lambda: tile_map.cached_chunks,
+		}, flush_interval=flush_interval)
+		emitter.start()
+
+	frame_ms = []
+	record_ms = 0.0
+	last = time.perf_counter()
+	for frame in range(frames):
+		start = time.perf_counter()
+		scheduler.tick()
+		scene.fill((16, 16, 20))
+		tile_map.draw(scene, camera)
+		for e in enemies:
+			e.draw(scene, camera)
+		end = time.perf_counter()
+		if emitter is not None:
+			emitter.record(frame, (end - last) * 1000.0, (end - start) * 1000.0)
+			record_ms += (time.perf_counter() - end) * 1000.0
+		frame_ms.append((time.perf_counter() - start) * 1000.0)
+		last = end
+
+	result = {"mean": statistics.fmean(frame_ms), "record_ms": record_ms / frames, "flush_ms": 0.0, "rows": 0, "dropped": 0}
+	if emitter is not None:
+		emitter.close()
+		result["flush_ms"] = emitter.flush_cpu_ms / frames
+		result["rows"] = emitter.emitted
+		result["dropped"] = emitter.dropped
+	if receiver is not None:
+		receiver.close()
+	frame_ms.sort()
+	result["p50"] = frame_ms[len(frame_ms) // 2]
+	result["p99"] = frame_ms[int(len(frame_ms) * 0.99)]
+	return result
+
+
+def main() -> None:
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+	parser.add_argument("--frames", type=int, default=1800)
+	parser.add_argument("--enemies", type=int, default=120)
+	parser.add_argument("--flush-interval", type=float, default=0.25, help="seconds between background flushes")
+	args = parser.parse_args()
+
+	pygame.display.init()
+	pygame.display.set_mode(VIEW)
+	scene = pygame.Surface(VIEW).convert_alpha()
+	with tempfile.TemporaryDirectory() as out_dir:
+		for sink_name in ("none", "jsonl", "statsd"):
+			r = run(scene, args.frames, args.enemies, sink_name, out_dir, args.flush_interval)
+			overhead = (r["record_ms"] + r["flush_ms"]) / r["mean"] * 100.0
+			print(f"{sink_name:<6}  frame ms p50={r['p50']:.2f} p99={r['p99']:.2f} mean={r['mean']:.2f}  record {r['record_ms'] * 1000.0:.1f} us/frame  flush {r['flush_ms'] * 1000.0:.1f} us/frame  overhead {overhead:.2f}%  ({r['rows']} rows, {r['dropped']} dropped)")
+	pygame.quit()
+
+
+if __name__ == "__main__":
+	main()
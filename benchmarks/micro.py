@@ -0,0 +1,412 @@
+"""Microbenchmarks of the hot paths, with stored JSON baselines and a regression check.
+
+Each case times one function over a batch of prepared inputs and reports microseconds per call,
+parametrized by map size and entity count. `run` prints the results and can write them to a file;
+`save` stores them as the baseline; `compare` runs the suite (or reads --results) and exits non-zero
+if any case got slower than its baseline by more than --threshold.
+
+    SDL_VIDEODRIVER=dummy python benchmarks/micro.py run --filter collides
+    SDL_VIDEODRIVER=dummy python benchmarks/micro.py save
+    SDL_VIDEODRIVER=dummy python benchmarks/micro.py compare --threshold 0.15
+
+Baselines are per machine: the file records the Python and platform it was taken on and compare
+warns when they differ.
+"""
+from __future__ import annotations
+import argparse
+import gc
+import json
+import math
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, Iterator, List, Tuple
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+
+from game.core.camera import Camera
+from game.core.config import Config, DEFAULTS_DEEP_COPY
+from game.core.input import InputManager
+from game.saves.save_manager import SaveManager
+from game.world.enemy import Enemy
+from game.world.entities import EntityRegistry
+from game.world.particles import ParticleSystem
+from game.world.player import Player
+from game.world.projectiles import ProjectilePool
+from game.world.tilemap import TileMap
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines", "micro.json")
+FORMAT_VERSION = 1
+TILE = 32
+MAP_SIZES = (64, 160, 320)
+ENTITY_COUNTS = (50, 200, 1000)
+
+
+class Case:
+	"""One benchmark: setup() builds the world and returns a callable doing `ops` calls of the function under test."""
+
+	def __init__(self, name: str, params: Dict[str, object], setup: Callable[[], Tuple[Callable[[], None], int]]):
+		self.name = name
+		self.params = params
+		self.setup = setup
+
+	@property
+	def key(self) -> str:
+		return self.name + "[" + ",".join(f"{k}={v}" for k, v in self.params.items()) + "]"
+
+
+class _StillInput:
+	"""Stands still, aiming at the middle of the screen."""
+
+	def get_move_vector(self):
+		return (0.0, 0.0)
+
+	def is_action_held(self, action: str) -> bool:
+		return False
+
+	def get_mouse_screen(self):
+		return (640, 360)
+
+
+def _world(tiles: int, enemies: int = 0, projectiles: int = 256, particles: int = 512):
+	"""A generated map with the player in the middle and `enemies` spawned on free tiles around it."""
+	tile_map = TileMap(tiles, tiles, TILE)
+	pool = ProjectilePool(projectiles)
+	fx = ParticleSystem(particles)
+	center = (tiles // 2 * TILE + TILE // 2, tiles // 2 * TILE + TILE // 2)
+	tile_map.set_tile(tiles // 2, tiles // 2, False)
+	player = Player(spawn_pos=center, input_manager=_StillInput(), projectiles=pool, particles=fx, tile_map=tile_map)
+	registry = EntityRegistry(lambda: Enemy(spawn_pos=(0, 0), tile_map=tile_map, target_getter=lambda: player, projectiles=pool, particles=fx))
+	rng = random.Random(3)
+	while len(registry) < enemies:
+		tx = rng.randint(1, tiles - 2)
+		ty = rng.randint(1, tiles - 2)
+		if not tile_map.collision[ty][tx]:
+			registry.spawn((tx * TILE + TILE // 2, ty * TILE + TILE // 2))
+	registry.flush()
+	tile_map.apply_tile_changes()
+	return tile_map, player, registry, pool, fx
+
+
+def _random_points(tile_map: TileMap, n: int, seed: int = 1) -> List[Tuple[float, float]]:
+	rng = random.Random(seed)
+	return [(rng.uniform(0, tile_map.pixel_width - 1), rng.uniform(0, tile_map.pixel_height - 1)) for _ in range(n)]
+
+
+def setup_collides_aabb(tiles: int):
+	tile_map = TileMap(tiles, tiles, TILE)
+	rects = [pygame.Rect(int(x), int(y), 24, 24) for x, y in _random_points(tile_map, 1024)]
+	collides = tile_map.collides_aabb
+
+	def run() -> None:
+		for r in rects:
+			collides(r)
+
+	return run, len(rects)
+
+
+def setup_resolve_movement(tiles: int):
+	tile_map = TileMap(tiles, tiles, TILE)
+	rng = random.Random(2)
+	moves = [(pygame.Rect(int(x), int(y), 24, 24), rng.uniform(-6.0, 6.0), rng.uniform(-6.0, 6.0)) for x, y in _random_points(tile_map, 1024)]
+	resolve = tile_map.resolve_movement
+
+	def run() -> None:
+		for rect, dx, dy in moves:
+			resolve(rect, dx, dy)
+
+	return run, len(moves)
+
+
+def setup_raycast_block(tiles: int, length: int):
+	tile_map = TileMap(tiles, tiles, TILE)
+	rng = random.Random(4)
+	rays = []
+	for x, y in _random_points(tile_map, 512):
+		angle = rng.uniform(0.0, math.tau)
+		rays.append(((x, y), (x + math.cos(angle) * length, y + math.sin(angle) * length)))
+	raycast = tile_map.raycast_block
+
+	def run() -> None:
+		for start, end in rays:
+			raycast(start, end)
+
+	return run, len(rays)
+
+
+def setup_build_chunk_surface(scale: float):
+	tile_map = TileMap(64, 64, TILE)
+	ts = tile_map.scaled_tile_size(scale)
+	chunks = [(cx, cy) for cy in range(tile_map.chunks_h) for cx in range(tile_map.chunks_w)]
+	build = tile_map._build_chunk_surface
+	cache = tile_map._chunk_cache
+
+	def run() -> None:
+		for cx, cy in chunks:
+			build(cx, cy, ts)
+		cache.clear()
+
+	return run, len(chunks)
+
+
+def setup_projectiles_update(projectiles: int, enemies: int):
+	tile_map, player, registry, pool, _ = _world(160, enemies=enemies, projectiles=projectiles)
+	rng = random.Random(5)
+	starts = []
+	for x, y in _random_points(tile_map, projectiles, seed=6):
+		angle = rng.uniform(0.0, math.tau)
+		starts.append(((x, y), (math.cos(angle), math.sin(angle)), "player" if rng.random() < 0.5 else "enemy"))
+	# Damage dealt by hits does not kill: enemies stay in place for every call
+	for e in registry.active:
+		e.health = 1e12
+	player.health = 1e12
+	active = registry.active
+	update = pool.update
+	items = list(zip(pool.projectiles, starts))
+
+	def run() -> None:
+		# Projectiles stopped by walls or hits are re-armed, so every call moves the full pool
+		for p, (pos, direction, owner) in items:
+			if not p.active:
+				p.active = True
+				p.position.update(pos)
+				p.velocity.update(direction[0] * 400.0, direction[1] * 400.0)
+				p.ttl = 1e9
+				p.damage = 0.0
+				p.owner = owner
+		update(tile_map=tile_map, player=player, enemies=active)
+
+	return run, 1
+
+
+def _filled_particles(count: int) -> ParticleSystem:
+	fx = ParticleSystem(count)
+	rng = random.Random(7)
+	for _ in range(count):
+		fx.spawn((rng.uniform(0, 1280), rng.uniform(0, 720)), (rng.uniform(-60, 60), rng.uniform(-60, 60)), (255, 200, 80), 1e12)
+	return fx
+
+
+def setup_particles_update(particles: int):
+	fx = _filled_particles(particles)
+	return fx.update, 1
+
+
+def setup_particles_draw(particles: int):
+	fx = _filled_particles(particles)
+	surface = pygame.Surface((1280, 720))
+	camera = Camera(1280, 720, 4096, 4096)
+	camera.position_x, camera.position_y = 640.0, 360.0
+
+	def run() -> None:
+		fx.draw(surface, camera)
+
+	return run, 1
+
+
+def setup_enemy_update(enemies: int, tiles: int):
+	_, player, registry, _, _ = _world(tiles, enemies=enemies)
+	player.health = 1e12
+	active = list(registry.active)
+
+	def run() -> None:
+		for e in active:
+			e.update()
+
+	return run, len(active)
+
+
+def setup_apply_key_event(bindings: int):
+	settings = DEFAULTS_DEEP_COPY()
+	# Extra actions stand in for a larger binding table; they are bound to keys that are never pressed
+	for i in range(len(settings["input"]), bindings):
+		settings["input"][f"extra_{i}"] = ["K_F15", "K_KP0"]
+	manager = InputManager(Config(settings))
+	keys = [pygame.K_w, pygame.K_a, pygame.K_s, pygame.K_d, pygame.K_F5, pygame.K_SPACE]
+	apply_key = manager._apply_key_event
+
+	def run() -> None:
+		for key in keys:
+			apply_key(key, True)
+			apply_key(key, False)
+
+	return run, 2 * len(keys)
+
+
+def setup_quick_save(enemies: int, modified_tiles: int):
+	tile_map, player, registry, _, _ = _world(160, enemies=enemies)
+	rng = random.Random(8)
+	while len(tile_map.modified) < modified_tiles:
+		tx = rng.randint(1, tile_map.tiles_w - 2)
+		ty = rng.randint(1, tile_map.tiles_h - 2)
+		tile_map.set_tile(tx, ty, not tile_map.collision[ty][tx])
+	tile_map.apply_tile_changes()
+	manager = SaveManager()
+	manager.redirect_quick_save(os.path.join(tempfile.mkdtemp(prefix="bench-"), "quick_save.json"), None)
+	config = Config(DEFAULTS_DEEP_COPY())
+
+	def run() -> None:
+		manager.quick_save(player, registry, tile_map, config)
+
+	return run, 1
+
+
+def cases() -> Iterator[Case]:
+	for tiles in MAP_SIZES:
+		yield Case("TileMap.collides_aabb", {"map": tiles}, lambda tiles=tiles: setup_collides_aabb(tiles))
+		yield Case("TileMap.resolve_movement", {"map": tiles}, lambda tiles=tiles: setup_resolve_movement(tiles))
+		for length in (200, 800):
+			yield Case("TileMap.raycast_block", {"map": tiles, "length": length}, lambda tiles=tiles, length=length: setup_raycast_block(tiles, length))
+	for scale in (0.5, 1.0):
+		yield Case("TileMap._build_chunk_surface", {"scale": scale}, lambda scale=scale: setup_build_chunk_surface(scale))
+	for projectiles in (256, 1024):
+		for enemies in ENTITY_COUNTS:
+			yield Case("ProjectilePool.update", {"projectiles": projectiles, "enemies": enemies}, lambda p=projectiles, e=enemies: setup_projectiles_update(p, e))
+	for particles in (512, 4096):
+		yield Case("ParticleSystem.update", {"particles": particles}, lambda n=particles: setup_particles_update(n))
+		yield Case("ParticleSystem.draw", {"particles": particles}, lambda n=particles: setup_particles_draw(n))
+	for enemies in ENTITY_COUNTS:
+		for tiles in (64, 160):
+			yield Case("Enemy.update", {"enemies": enemies, "map": tiles}, lambda e=enemies, t=tiles: setup_enemy_update(e, t))
+	for bindings in (14, 64):
+		yield Case("InputManager._apply_key_event", {"bindings": bindings}, lambda b=bindings: setup_apply_key_event(b))
+	for enemies in ENTITY_COUNTS:
+		yield Case("SaveManager.quick_save", {"enemies": enemies, "tiles": 500}, lambda e=enemies: setup_quick_save(e, 500))
+
+
+def measure(fn: Callable[[], None], ops: int, min_time: float, repeat: int) -> Dict[str, float]:
+	"""Times `fn` like timeit: loops per repeat are calibrated to last at least `min_time` seconds, GC off."""
+	fn()
+	loops = 1
+	while True:
+		start = time.perf_counter()
+		for _ in range(loops):
+			fn()
+		elapsed = time.perf_counter() - start
+		if elapsed >= min_time or loops >= 1 << 20:
+			break
+		loops = max(loops * 2, int(loops * min_time / max(elapsed, 1e-9) * 1.1))
+	gc_was_enabled = gc.isenabled()
+	gc.disable()
+	try:
+		per_op = []
+		for _ in range(repeat):
+			start = time.perf_counter()
+			for _ in range(loops):
+				fn()
+			per_op.append((time.perf_counter() - start) / (loops * ops) * 1e6)
+	finally:
+		if gc_was_enabled:
+			gc.enable()
+	return {"best_us": min(per_op), "median_us": statistics.median(per_op), "loops": loops, "ops": ops}
+
+
+def run_suite(name_filter: str | None, min_time: float, repeat: int) -> dict:
+	results = {}
+	for case in cases():
+		if name_filter and name_filter.lower() not in case.key.lower():
+			continue
+		fn, ops = case.setup()
+		result = measure(fn, ops, min_time, repeat)
+		results[case.key] = result
+		print(f"{case.key:<64} {result['best_us']:>11.3f} us  (median {result['median_us']:.3f})", flush=True)
+	return {"format": FORMAT_VERSION, "machine": machine_info(), "results": results}
+
+
+def machine_info() -> Dict[str, str]:
+	return {
+		"python": platform.python_version(),
+		"implementation": platform.python_implementation(),
+		"platform": platform.platform(),
+		"processor": platform.processor() or platform.machine(),
+		"pygame": pygame.version.ver,
+	}
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> List[str]:
+	"""Prints each case against the baseline and returns the keys slower by more than `threshold`."""
+	if baseline.get("machine") != current.get("machine"):
+		print(f"warning: baseline was taken on {baseline.get('machine')}, this run is {current.get('machine')}")
+	regressions = []
+	base_results = baseline.get("results", {})
+	for key, result in current["results"].items():
+		base = base_results.get(key)
+		if base is None:
+			print(f"{key:<64} new")
+			continue
+		ratio = result["best_us"] / base["best_us"] if base["best_us"] > 0 else 1.0
+		if ratio > 1.0 + threshold:
+			mark = "REGRESSION"
+			regressions.append(key)
+		elif ratio < 1.0 / (1.0 + threshold):
+			mark = "faster"
+		else:
+			mark = ""
+		print(f"{key:<64} {base['best_us']:>11.3f} -> {result['best_us']:>11.3f} us  {ratio - 1.0:+7.1%}  {mark}")
+	for key in base_results.keys() - current["results"].keys():
+		print(f"{key:<64} not run")
+	return regressions
+
+
+def write_json(path: str, data: dict) -> None:
+	os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+	with open(path, "w", encoding="utf-8") as f:
+		json.dump(data, f, indent=2, sort_keys=True)
+		f.write("\n")
+
+
+def main() -> None:
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+	parser.add_argument("command", choices=("run", "save", "compare"))
+	parser.add_argument("--filter", help="only cases whose name contains this text")
+	parser.add_argument("--min-time", type=float, default=0.05, help="seconds per timing repeat")
+	parser.add_argument("--repeat", type=int, default=5)
+	parser.add_argument("--out", help="run: also write the results to this file")
+	parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+	parser.add_argument("--results", help="compare: read results from this file instead of running the suite")
+	parser.add_argument("--threshold", type=float, default=0.15, help="compare: allowed slowdown, as a fraction")
+	args = parser.parse_args()
+
+	if args.command == "compare" and args.results:
+		with open(args.results, "r", encoding="utf-8") as f:
+			current = json.load(f)
+	else:
+		pygame.display.init()
+		# Chunk surfaces are created in the display format, as in the game
+		pygame.display.set_mode((1280, 720))
+		current = run_suite(args.filter, args.min_time, args.repeat)
+		pygame.quit()
+
+	if args.command == "run":
+		if args.out:
+			write_json(args.out, current)
+	elif args.command == "save":
+		if args.filter and os.path.exists(args.baseline):
+			# A filtered run only replaces the cases it ran
+			with open(args.baseline, "r", encoding="utf-8") as f:
+				merged = json.load(f)
+			merged["results"].update(current["results"])
+			merged["machine"] = current["machine"]
+			current = merged
+		write_json(args.baseline, current)
+		print(f"baseline written to {args.baseline}")
+	else:
+		if not os.path.exists(args.baseline):
+			print(f"no baseline at {args.baseline}; take one with `micro.py save`")
+			sys.exit(2)
+		with open(args.baseline, "r", encoding="utf-8") as f:
+			baseline = json.load(f)
+		regressions = compare(baseline, current, args.threshold)
+		print(f"{len(regressions)} regression(s) over {args.threshold:.0%}" if regressions else "OK")
+		sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,126 @@
+"""Load test for the UDP multiplayer server.
+
+Runs a GameServer and N GameClients in one process on localhost, keeps a few hundred projectiles
+alive and reports server tick time and per-client bandwidth.
+
+    SDL_VIDEODRIVER=dummy python benchmarks/net_load.py --clients 8 --projectiles 400
+"""
+from __future__ import annotations
+import argparse
+import os
+import random
+import statistics
+import sys
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+
+from game.net import protocol
+from game.net.client import GameClient
+from game.net.server import GameServer
+from game.world.enemy import Enemy
+from game.world.entities import EntityRegistry
+from game.world.particles import ParticleSystem
+from game.world.player import Player
+from game.world.projectiles import ProjectilePool
+from game.world.tilemap import TileMap
+
+
+class _ScriptedInput:
+	def __init__(self, rng: random.Random):
+		self.rng = rng
+		self.move = (0.0, 0.0)
+		self.mouse = (640, 360)
+		self.fire = False
+
+	def next(self) -> None:
+		if self.rng.random() < 0.05:
+			self.move = (self.rng.uniform(-1, 1), self.rng.uniform(-1, 1))
+			self.mouse = (self.rng.randint(0, 1279), self.rng.randint(0, 719))
+			self.fire = self.rng.random() < 0.5
+
+	def get_move_vector(self):
+		return self.move
+
+	def get_mouse_screen(self):
+		return self.mouse
+
+	def is_action_held(self, action: str) -> bool:
+		return action == "fire" and self.fire
+
+
+def enemy_registry(tile_map: TileMap, player: Player, pool: ProjectilePool, particles: ParticleSystem) -> EntityRegistry:
+	"""Client-side enemy mirror; the factory runs on spawn, after the client loop, so it binds its own world."""
+	return EntityRegistry(lambda: Enemy(spawn_pos=(0, 0), tile_map=tile_map, target_getter=lambda: player, projectiles=pool, particles=particles))
+
+
+def main() -> None:
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+	parser.add_argument("--clients", type=int, default=8)
+	parser.add_argument("--projectiles", type=int, default=400, help="projectiles kept alive on the server")
+	parser.add_argument("--enemies", type=int, default=32)
+	parser.add_argument("--ticks", type=int, default=600)
+	args = parser.parse_args()
+
+	pygame.init()
+	rng = random.Random(7)
+	ts = 32
+	spawns = [(ts * rng.randint(8, 150), ts * rng.randint(8, 150)) for _ in range(args.enemies)]
+	server = GameServer(host="127.0.0.1", port=0, max_clients=args.clients, enemy_spawns=spawns, max_projectiles=max(256, args.projectiles + 64))
+
+	clients = []
+	inputs = []
+	for _ in range(args.clients):
+		tile_map = TileMap(160, 160, ts)
+		pool = ProjectilePool(max_projectiles=len(server.projectiles.projectiles))
+		particles = ParticleSystem(max_particles=16)
+		player = Player(spawn_pos=(0, 0), input_manager=None, projectiles=pool, particles=particles, tile_map=tile_map)
+		client = GameClient(server.address, (1280, 720), player, enemy_registry(tile_map, player, pool, particles), pool, tile_map)
+		client.connect()
+		clients.append(client)
+		inputs.append(_ScriptedInput(random.Random(len(inputs))))
+
+	server.poll()
+	for c in clients:
+		c.poll()
+
+	tick_ms = []
+	full_sizes = []
+	for tick in range(args.ticks):
+		for c, inp in zip(clients, inputs):
+			inp.next()
+			c.send_input(inp)
+
+		# Keep the projectile count topped up with long-lived shots spread over the map
+		live = sum(1 for p in server.projectiles.projectiles if p.active)
+		for _ in range(max(0, args.projectiles - live)):
+			pos = (rng.uniform(ts * 2, ts * 158), rng.uniform(ts * 2, ts * 158))
+			server.projectiles.spawn(pos, (rng.uniform(-1, 1), rng.uniform(-1, 1)), speed=200.0, ttl=3.0, damage=0.0, owner="enemy")
+
+		server.tick()
+		tick_ms.append(server.last_tick_ms)
+		if tick % 60 == 0:
+			state = server._history[server.tick_count]
+			full_sizes.append(len(protocol.encode_snapshot(server.tick_count, -1, state, protocol.EMPTY_STATE)))
+		for c in clients:
+			c.poll()
+
+	seconds = args.ticks / 60.0
+	sent = [s.bytes_sent for s in server.clients.values()]
+	tick_ms.sort()
+	print(f"clients={len(server.clients)} enemies={args.enemies} projectiles~{args.projectiles} ticks={args.ticks}")
+	print(f"server tick ms: mean={statistics.fmean(tick_ms):.3f} p50={tick_ms[len(tick_ms) // 2]:.3f} p95={tick_ms[int(len(tick_ms) * 0.95)]:.3f} max={tick_ms[-1]:.3f}")
+	print(f"per-client bandwidth: {statistics.fmean(sent) / seconds / 1024.0:.1f} KiB/s (delta) vs {statistics.fmean(full_sizes) * 60 / 1024.0:.1f} KiB/s (full snapshots)")
+	print(f"mean packet: {statistics.fmean(sent) / max(1, args.ticks):.0f} B delta, {statistics.fmean(full_sizes):.0f} B full")
+	print(f"client received: {statistics.fmean(c.bytes_received for c in clients) / seconds / 1024.0:.1f} KiB/s, latest tick {min(c.latest_tick for c in clients)}/{server.tick_count}")
+
+	for c in clients:
+		c.disconnect()
+	server.close()
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,89 @@
+"""Frame time of the world render at different render scales and window sizes.
+
+Draws the tile map, fog and enemies at each render scale and presents them like main.py does: at
+full scale through the native scene surface, otherwise upscaled straight into the display, with the
+HUD drawn on top at native resolution. Reports percentiles per case.
+
+    SDL_VIDEODRIVER=dummy python benchmarks/render_scale.py --frames 300
+"""
+from __future__ import annotations
+import argparse
+import os
+import statistics
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+
+from game.core.camera import Camera
+from game.world.enemy import Enemy
+from game.world.fog import FogOfWar
+from game.world.tilemap import TileMap
+
+WINDOWS = ((1280, 720), (1920, 1080), (2560, 1440))
+SCALES = (1.0, 0.75, 0.5)
+
+
+class _Target:
+	def __init__(self, x: float, y: float):
+		self.position = pygame.Vector2(x, y)
+
+
+def run(tile_map: TileMap, window, scale: float, frames: int) -> dict:
+	screen = pygame.display.set_mode(window)
+	scene = pygame.Surface(window).convert_alpha()
+	world = scene if scale == 1.0 else pygame.Surface((int(window[0] * scale), int(window[1] * scale)), 0, screen)
+	camera = Camera(window[0], window[1], tile_map.pixel_width, tile_map.pixel_height)
+	camera.render_scale = scale
+	fog = FogOfWar(tile_map)
+	ts = tile_map.tile_size
+	target = _Target(ts * 20.0, ts * 20.0)
+	enemies = [Enemy(spawn_pos=(ts * (10 + i % 40), ts * (10 + i // 40)), tile_map=tile_map, target_getter=lambda: target, projectiles=None, particles=None) for i in range(200)]
+	font = pygame.font.Font(None, 18)
+	frame_ms = []
+	for _ in range(frames):
+		target.position.x += 220.0 / 60.0
+		target.position.y += 110.0 / 60.0
+		camera.update_follow(target.position)
+		start = time.perf_counter()
+		world.fill((16, 16, 20))
+		tile_map.draw(world, camera)
+		for e in enemies:
+			e.draw(world, camera)
+		fog.update(target.position.xy)
+		fog.draw(world, camera)
+		if world is scene:
+			screen.blit(scene, (0, 0))
+		else:
+			pygame.transform.scale(world, window, screen)
+		screen.blit(font.render("HP: 100 | Enemies: 200 | FPS: 60", True, (235, 235, 245)), (8, 8))
+		frame_ms.append((time.perf_counter() - start) * 1000.0)
+	# The first frames build chunk caches; measure steady state
+	frame_ms = sorted(frame_ms[frames // 10:])
+	return {
+		"p50": frame_ms[len(frame_ms) // 2],
+		"p95": frame_ms[int(len(frame_ms) * 0.95)],
+		"mean": statistics.fmean(frame_ms),
+	}
+
+
+def main() -> None:
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+	parser.add_argument("--frames", type=int, default=300)
+	args = parser.parse_args()
+
+	pygame.display.init()
+	pygame.font.init()
+	tile_map = TileMap(256, 256, 32)
+	for window in WINDOWS:
+		for scale in SCALES:
+			r = run(tile_map, window, scale, args.frames)
+			print(f"{window[0]}x{window[1]} scale {scale:.2f}  frame ms p50={r['p50']:.2f} p95={r['p95']:.2f} mean={r['mean']:.2f}")
+	pygame.quit()
+
+
+if __name__ == "__main__":
+	main()
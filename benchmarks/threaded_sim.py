@@ -0,0 +1,149 @@
+"""Sequential vs threaded simulation benchmark.
+
+Runs the same world for a fixed wall-clock duration twice: once with simulation and rendering on the
+main thread, once with the simulation on a SimulationThread publishing render snapshots. Reports
+rendered frames per second, simulation ticks per second and frame-time percentiles.
+
+    SDL_VIDEODRIVER=dummy python benchmarks/threaded_sim.py --enemies 300 --seconds 5
+"""
+from __future__ import annotations
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+
+from game.core.camera import Camera
+from game.core.config import Config, DEFAULTS_DEEP_COPY
+from game.core.input import InputManager
+from game.core.scheduler import Scheduler
+from game.core.threaded import RenderBuffer, SimulationThread
+from game.core.time_step import FixedTimeStep
+from game.world.enemy import Enemy
+from game.world.particles import ParticleSystem
+from game.world.player import Player
+from game.world.projectiles import ProjectilePool
+from game.world.render_state import capture_render_state, draw_render_state, interpolate_camera
+from game.world.tilemap import TileMap
+
+VIEW = (1280, 720)
+
+
+def build_world(enemy_count: int):
+	rng = random.Random(5)
+	input_manager = InputManager(Config(DEFAULTS_DEEP_COPY()))
+	tile_map = TileMap(160, 160, 32)
+	projectiles = ProjectilePool(max_projectiles=512)
+	particles = ParticleSystem(max_particles=512)
+	player = Player(spawn_pos=(32 * 40, 32 * 40), input_manager=input_manager, projectiles=projectiles, particles=particles, tile_map=tile_map)
+	enemies = [
+		Enemy(spawn_pos=(32 * rng.randint(25, 55), 32 * rng.randint(25, 55)), tile_map=tile_map, target_getter=lambda: player, projectiles=projectiles, particles=particles)
+		for _ in range(enemy_count)
+	]
+	camera = Camera(VIEW[0], VIEW[1], tile_map.pixel_width, tile_map.pixel_height)
+	camera.update_follow(player.position)
+	return input_manager, tile_map, projectiles, particles, player, enemies, camera
+
+
+def make_scheduler(time_step, input_manager, tile_map, projectiles, particles, player, enemies, camera) -> Scheduler:
+	def step_enemies(_dt: float) -> None:
+		for enemy in enemies:
+			enemy.step()
+
+	scheduler = Scheduler(time_step)
+	scheduler.register("input", lambda dt: input_manager.update())
+	scheduler.register("player", lambda dt: player.update(camera))
+	scheduler.register_staggered("enemy_ai", lambda: enemies, lambda enemy, dt: enemy.think(), rate_hz=10)
+	scheduler.register("enemies", step_enemies)
+	scheduler.register("projectiles", lambda dt: projectiles.update(tile_map=tile_map, player=player, enemies=enemies))
+	scheduler.register("particles", particles.update, rate_hz=30)
+	scheduler.register("camera", lambda dt: camera.update_follow(player.position))
+	return scheduler
+
+
+def run(mode: str, enemy_count: int, seconds: float, screen: pygame.Surface) -> dict:
+	input_manager, tile_map, projectiles, particles, player, enemies, camera = build_world(enemy_count)
+	scene = pygame.Surface(VIEW).convert_alpha()
+	time_step = FixedTimeStep(target_fps=60)
+	scheduler = make_scheduler(time_step, input_manager, tile_map, projectiles, particles, player, enemies, camera)
+	frame_ms = []
+	ticks = 0
+
+	if mode == "threaded":
+		buffer = RenderBuffer()
+		render_camera = Camera(VIEW[0], VIEW[1], tile_map.pixel_width, tile_map.pixel_height)
+
+		def publish() -> None:
+			buffer.publish(capture_render_state(scheduler.tick_count, time_step.dt, camera, player, enemies, projectiles, particles, scheduler.get("particles").ahead_time))
+
+		publish()
+		worker = SimulationThread(time_step, scheduler.tick, publish)
+		worker.start()
+	else:
+		time_step.reset()
+
+	end = time.perf_counter() + seconds
+	while time.perf_counter() < end:
+		start = time.perf_counter()
+		pygame.event.pump()
+		if mode == "threaded":
+			prev, curr = buffer.read()
+			alpha = RenderBuffer.alpha(curr)
+			interpolate_camera(render_camera, prev, curr, alpha)
+			scene.fill((16, 16, 20))
+			tile_map.draw(scene, render_camera)
+			draw_render_state(scene, render_camera, prev, curr, alpha)
+		else:
+			for _ in time_step.step():
+				scheduler.tick()
+				ticks += 1
+			scene.fill((16, 16, 20))
+			tile_map.draw(scene, camera)
+			for enemy in enemies:
+				enemy.draw(scene, camera)
+			player.draw(scene, camera)
+			projectiles.draw(scene, camera)
+			particles.draw(scene, camera)
+		screen.blit(scene, (0, 0))
+		pygame.display.flip()
+		frame_ms.append((time.perf_counter() - start) * 1000.0)
+
+	if mode == "threaded":
+		worker.stop()
+		ticks = worker.ticks
+		if worker.error is not None:
+			raise worker.error
+
+	frame_ms.sort()
+	return {
+		"fps": len(frame_ms) / seconds,
+		"ticks_per_s": ticks / seconds,
+		"p50": frame_ms[len(frame_ms) // 2],
+		"p95": frame_ms[int(len(frame_ms) * 0.95)],
+		"mean": statistics.fmean(frame_ms),
+	}
+
+
+def main() -> None:
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+	parser.add_argument("--enemies", type=int, default=300)
+	parser.add_argument("--seconds", type=float, default=5.0)
+	args = parser.parse_args()
+
+	pygame.display.init()
+	screen = pygame.display.set_mode(VIEW)
+	for mode in ("sequential", "threaded"):
+		r = run(mode, args.enemies, args.seconds, screen)
+		print(f"{mode:<11} render {r['fps']:6.1f} fps  sim {r['ticks_per_s']:5.1f} ticks/s (target 60)  frame ms p50={r['p50']:.2f} p95={r['p95']:.2f} mean={r['mean']:.2f}")
+	pygame.quit()
+
+
+if __name__ == "__main__":
+	main()
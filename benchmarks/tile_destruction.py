@@ -0,0 +1,121 @@
+"""Frame time around mass tile destruction.
+
+Fills a region of the map with walls, then every `--interval` frames alternately detonates a large
+explosion in it or walls the crater back up, while the camera looks at it and the minimap and fog
+listen for tile changes. Compares patching cached
+chunk surfaces per tile (TileMap.apply_tile_changes) against dropping and rebuilding affected chunks,
+and checks that patched chunks match freshly built ones pixel for pixel.
+
+    SDL_VIDEODRIVER=dummy python benchmarks/tile_destruction.py --frames 600
+"""
+from __future__ import annotations
+import argparse
+import os
+import statistics
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+
+from game.core.camera import Camera
+from game.ui.minimap import Minimap
+from game.world.fog import FogOfWar
+from game.world.tilemap import TileMap
+
+VIEW = (1280, 720)
+
+
+def fill_walls(tile_map: TileMap, x0: int, y0: int, w: int, h: int) -> int:
+	placed = 0
+	for ty in range(y0, y0 + h):
+		for tx in range(x0, x0 + w):
+			if tile_map.set_tile(tx, ty, True):
+				placed += 1
+	return placed
+
+
+def run(frames: int, interval: int, radius: float, rebuild: bool, scene: pygame.Surface) -> dict:
+	tile_map = TileMap(256, 256, 32)
+	ts = tile_map.tile_size
+	fill_walls(tile_map, 40, 40, 60, 60)
+	tile_map.apply_tile_changes()
+	camera = Camera(VIEW[0], VIEW[1], tile_map.pixel_width, tile_map.pixel_height)
+	fog = FogOfWar(tile_map)
+	minimap = Minimap(tile_map)
+	tile_map.tile_listeners.append(fog.on_tiles_changed)
+	tile_map.tile_listeners.append(minimap.update_tiles)
+	center = [70 * ts, 70 * ts]
+	camera.position_x, camera.position_y = center
+	frame_ms = []
+	changed_total = 0
+	for i in range(frames):
+		if i % interval == interval - 1:
+			if (i // interval) % 2 == 0:
+				changed_total += tile_map.destroy_tiles_in_radius(center, radius)
+			else:
+				changed_total += fill_walls(tile_map, 40, 40, 60, 60)
+		start = time.perf_counter()
+		scene.fill((16, 16, 20))
+		if rebuild:
+			# Baseline: invalidate every chunk touched by a change and rebuild it from scratch
+			chunk = tile_map._chunk_size_tiles
+			keys = {(tx // chunk, ty // chunk) for tx, ty in tile_map._changed_tiles}
+			for key in keys:
+				tile_map._chunk_cache.pop(key, None)
+			tile_map.max_chunk_builds_per_frame = None
+		tile_map.apply_tile_changes()
+		tile_map.draw(scene, camera)
+		fog.update(center)
+		fog.draw(scene, camera)
+		minimap.draw(scene, _Viewer(center), [], camera)
+		frame_ms.append((time.perf_counter() - start) * 1000.0)
+	frame_ms.sort()
+	return {
+		"p50": frame_ms[len(frame_ms) // 2],
+		"p99": frame_ms[int(len(frame_ms) * 0.99)],
+		"max": frame_ms[-1],
+		"mean": statistics.fmean(frame_ms),
+		"changed": changed_total,
+		"tile_map": tile_map,
+	}
+
+
+class _Viewer:
+	def __init__(self, pos):
+		self.position = pygame.Vector2(pos)
+
+
+def check_patched_chunks(tile_map: TileMap) -> int:
+	mismatches = 0
+	for key, (surf, _) in list(tile_map._chunk_cache.items()):
+		patched = pygame.image.tobytes(surf, "RGB")
+		tile_map._build_chunk_surface(key[0], key[1], tile_map.scaled_tile_size(tile_map._chunk_scale))
+		if pygame.image.tobytes(tile_map._chunk_cache[key][0], "RGB") != patched:
+			mismatches += 1
+	return mismatches
+
+
+def main() -> None:
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+	parser.add_argument("--frames", type=int, default=600)
+	parser.add_argument("--interval", type=int, default=30, help="frames between explosions")
+	parser.add_argument("--radius", type=float, default=320.0, help="explosion radius in pixels")
+	args = parser.parse_args()
+
+	pygame.display.init()
+	pygame.display.set_mode(VIEW)
+	scene = pygame.Surface(VIEW).convert_alpha()
+	for rebuild in (True, False):
+		r = run(args.frames, args.interval, args.radius, rebuild, scene)
+		name = "rebuild chunks" if rebuild else "patch tiles   "
+		print(f"{name}  frame ms p50={r['p50']:.2f} p99={r['p99']:.2f} max={r['max']:.2f} mean={r['mean']:.2f}  ({r['changed']} tiles changed)")
+		if not rebuild:
+			print(f"patched chunks differing from a fresh build: {check_patched_chunks(r['tile_map'])}")
+	pygame.quit()
+
+
+if __name__ == "__main__":
+	main()
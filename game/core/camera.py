@@ -13,6 +13,8 @@ class Camera:
 		self.deadzone_width = view_width * 0.35
 		self.deadzone_height = view_height * 0.35
 		self.zoom = 1.0
+		# Render-target pixels per world pixel; the world may be drawn smaller and upscaled to the window
+		self.render_scale = 1.0
 		self.shake_timer = 0.0
 		self.shake_magnitude = 0.0
 
@@ -46,12 +48,18 @@ class Camera:
 		self.position_y = max(half_h, min(self.world_height - half_h, self.position_y))
 
 	def world_to_screen(self, world_pos: Tuple[float, float]) -> Tuple[int, int]:
+		"""Maps a world position to render-target pixels (scaled by render_scale)."""
 		wx, wy = world_pos
-		sx = int(wx - self.position_x + self.view_width * 0.5)
-		sy = int(wy - self.position_y + self.view_height * 0.5)
+		s = self.render_scale
+		sx = int((wx - self.position_x + self.view_width * 0.5) * s)
+		sy = int((wy - self.position_y + self.view_height * 0.5) * s)
 		return sx, sy
 
+	def to_screen_length(self, length: float) -> int:
+		return max(1, int(length * self.render_scale))
+
 	def screen_to_world(self, screen_pos: Tuple[int, int]) -> Tuple[float, float]:
+		"""Maps window pixels (e.g. the mouse) to the world; independent of render_scale."""
 		sx, sy = screen_pos
 		wx = sx + self.position_x - self.view_width * 0.5
 		wy = sy + self.position_y - self.view_height * 0.5
@@ -13,10 +13,31 @@ class Config:
         "lang": "ru",
         "graphics": {
             "scale": 1.0,
+            "fog_of_war": False,
+            "minimap": True,
+            "dynamic_resolution": False,
+            "target_fps": 60,
         },
         "audio": {
             "master_volume": 1.0,
         },
+        "performance": {
+            # Collect garbage between frames instead of at arbitrary allocations
+            "manual_gc": False,
+            # Print every frame over the frame budget together with the GC work done during it
+            "log_hitches": False,
+            # Profile captures (profile_capture key): frames per capture and output directory; a
+            # nonzero profile_at_frame also starts one automatically once that frame is reached
+            "profile_frames": 300,
+            "profile_dir": "profiles",
+            "profile_at_frame": 0,
+            # Per-frame and per-system timings plus entity counts, streamed while running: "off",
+            # "jsonl" (appended to metrics_path) or "statsd" (UDP to metrics_address)
+            "metrics": "off",
+            "metrics_path": "metrics/frames.jsonl",
+            "metrics_address": "127.0.0.1:8125",
+            "metrics_flush_s": 1.0,
+        },
         "input": {
             # Multiple bindings per action are supported
             "move_up": ["K_w", "K_UP"],
@@ -28,6 +49,11 @@ class Config:
             "pause": ["K_ESCAPE"],
             "quicksave": ["K_F5"],
             "quickload": ["K_F9"],
+            "rewind": ["K_BACKSPACE"],
+            "spawn_wave": ["K_F8"],
+            "alt_fire": ["K_f"],
+            "build": ["K_q"],
+            "profile_capture": ["K_F10"],
         },
     }
 
@@ -0,0 +1,62 @@
+from __future__ import annotations
+import gc
+import time
+from typing import List
+
+
+class ManualGC:
+	"""Runs the cyclic garbage collector in leftover frame time instead of at arbitrary allocations.
+
+	freeze() is called once the world is set up: it collects, moves every surviving object into the
+	permanent generation (gc.freeze) so later collections never traverse them, and turns automatic
+	collection off. collect() is then given each frame's spare time. It runs the oldest generation
+	that is due by CPython's own thresholds and whose measured cost fits the budget, falling back to
+	younger ones; once garbage piles up to `overdue_factor` times a threshold it collects regardless,
+	so a frame that never has spare time cannot grow memory without bound.
+	"""
+
+	def __init__(self, overdue_factor: int = 2):
+		self.overdue_factor = overdue_factor
+		self.thresholds = gc.get_threshold()
+		# Smoothed cost of one collection per generation; unknown (0) until the first one is measured
+		self.cost_ms: List[float] = [0.0, 0.0, 0.0]
+		self.collections = [0, 0, 0]
+		self.active = False
+		self._was_enabled = gc.isenabled()
+
+	def freeze(self) -> None:
+		self._was_enabled = gc.isenabled()
+		gc.collect()
+		gc.freeze()
+		gc.disable()
+		self.active = True
+
+	def release(self) -> None:
+		"""Returns to automatic collection; frozen objects stay in the permanent generation."""
+		if self.active:
+			self.active = False
+			if self._was_enabled:
+				gc.enable()
+
+	def collect(self, budget_ms: float) -> int:
+		"""Collects the oldest due generation that fits `budget_ms`. Returns it, or -1 if nothing ran."""
+		if not self.active:
+			return -1
+		counts = gc.get_count()
+		generation = -1
+		for gen in (2, 1, 0):
+			if counts[gen] < self.thresholds[gen]:
+				continue
+			overdue = counts[gen] >= self.thresholds[gen] * self.overdue_factor
+			if overdue or self.cost_ms[gen] <= budget_ms:
+				generation = gen
+				break
+		if generation < 0:
+			return -1
+		start = time.perf_counter()
+		gc.collect(generation)
+		ms = (time.perf_counter() - start) * 1000.0
+		cost = self.cost_ms[generation]
+		self.cost_ms[generation] = ms if cost == 0.0 else cost + (ms - cost) * 0.25
+		self.collections[generation] += 1
+		return generation
\ No newline at end of file
@@ -25,8 +25,14 @@ class InputManager:
         self._mouse_pos: Tuple[int, int] = (0, 0)
         self._mouse_buttons: Tuple[int, int, int] = (0, 0, 0)
 
-        # Gamepad
-        pygame.joystick.init()
+        # Gamepad: opened on first update or hot-plug instead of during startup
+        self._joystick = None
+        self._joystick_checked = False
+
+    def _init_joystick(self) -> None:
+        self._joystick_checked = True
+        if not pygame.joystick.get_init():
+            pygame.joystick.init()
         self._joystick = pygame.joystick.Joystick(0) if pygame.joystick.get_count() > 0 else None
         if self._joystick is not None:
             self._joystick.init()
@@ -49,6 +55,8 @@ class InputManager:
                 self._released_actions.add("fire")
                 if "fire" in self._held_actions:
                     self._held_actions.remove("fire")
+        elif event.type == pygame.JOYDEVICEADDED or event.type == pygame.JOYDEVICEREMOVED:
+            self._init_joystick()
         elif event.type == pygame.JOYBUTTONDOWN:
             if event.button == 0:
                 self._pressed_actions.add("fire")
@@ -94,6 +102,8 @@ class InputManager:
             y += 1.0
 
         # Gamepad axes
+        if not self._joystick_checked:
+            self._init_joystick()
         if self._joystick is not None:
             ax_x = self._joystick.get_axis(0) if self._joystick.get_numaxes() > 0 else 0.0
             ax_y = self._joystick.get_axis(1) if self._joystick.get_numaxes() > 1 else 0.0
@@ -123,6 +133,13 @@ class InputManager:
     def was_action_pressed(self, action: str) -> bool:
         return action in self._pressed_actions
 
+    def take_action_pressed(self, action: str) -> bool:
+        """Like was_action_pressed, but consumes the press so it fires once per key down."""
+        if action in self._pressed_actions:
+            self._pressed_actions.discard(action)
+            return True
+        return False
+
     def is_action_held(self, action: str) -> bool:
         return action in self._held_actions
 
@@ -0,0 +1,210 @@
+from __future__ import annotations
+import os
+import socket
+import threading
+import time
+from array import array
+from typing import Callable, Dict, List, NamedTuple, Sequence, Tuple
+
+from .scheduler import ScheduledSystem
+
+
+class Column(NamedTuple):
+	"""One value per recorded frame. kind is "frame", "time" (unix seconds), "ms" (a timing) or "gauge"."""
+
+	name: str
+	kind: str
+
+
+class JsonLinesSink:
+	"""Appends one JSON object per frame to a file.
+
+	Past max_bytes the file is moved to `path`.1 (replacing an older one) and a new file is started,
+	so a long-running instance keeps at most two files.
+	"""
+
+	def __init__(self, path: str, max_bytes: int = 64 * 1024 * 1024):
+		self.path = path
+		self.max_bytes = max_bytes
+		directory = os.path.dirname(path)
+		if directory:
+			os.makedirs(directory, exist_ok=True)
+		self._file = open(path, "a", encoding="utf-8")
+
+	def write(self, columns: Sequence[Column], rows: Sequence[Sequence[float]]) -> None:
+		names = [c.name for c in columns]
+		kinds = [c.kind for c in columns]
+		lines = []
+		for row in rows:
+			fields = []
+			for name, kind, value in zip(names, kinds, row):
+				if kind == "ms" or kind == "time":
+					fields.append(f'"{name}":{value:.3f}')
+				elif value == int(value):
+					fields.append(f'"{name}":{int(value)}')
+				else:
+					fields.append(f'"{name}":{value!r}')
+			lines.append("{" + ",".join(fields) + "}\n")
+		self._file.write("".join(lines))
+		self._file.flush()
+		if self.max_bytes and self._file.tell() >= self.max_bytes:
+			self._file.close()
+			os.replace(self.path, self.path + ".1")
+			self._file = open(self.path, "a", encoding="utf-8")
+
+	def close(self) -> None:
+		self._file.close()
+
+
+class StatsdSink:
+	"""Sends timings and gauges as statsd lines over UDP ("prefix.name:value|ms" / "|g").
+
+	Every frame's timings are sent; gauges only with their latest value per batch. Lines are packed into
+	datagrams of at most max_packet bytes. Send failures (nothing listening) are counted, not raised.
+	"""
+
+	def __init__(self, address: Tuple[str, int], prefix: str = "game", max_packet: int = 1432):
+		self.address = address
+		self.prefix = prefix
+		self.max_packet = max_packet
+		self.errors = 0
+		self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+		self._sock.setblocking(False)
+
+	def write(self, columns: Sequence[Column], rows: Sequence[Sequence[float]]) -> None:
+		if not rows:
+			return
+		prefix = self.prefix
+		timings = [(i, f"{prefix}.{c.name}:") for i, c in enumerate(columns) if c.kind == "ms"]
+		lines = []
+		for row in rows:
+			lines.extend(f"{key}{row[i]:.3f}|ms" for i, key in timings)
+		last = rows[-1]
+		lines.extend(f"{prefix}.{c.name}:{last[i]:g}|g" for i, c in enumerate(columns) if c.kind == "gauge")
+
+		packet: List[str] = []
+		size = 0
+		for line in lines:
+			if packet and size + len(line) + 1 > self.max_packet:
+				self._send("\n".join(packet))
+				packet = []
+				size = 0
+			packet.append(line)
+			size += len(line) + 1
+		if packet:
+			self._send("\n".join(packet))
+
+	def _send(self, payload: str) -> None:
+		try:
+			self._sock.sendto(payload.encode("ascii"), self.address)
+		except OSError:
+			self.errors += 1
+
+	def close(self) -> None:
+		self._sock.close()
+
+
+class MetricsEmitter:
+	"""Records per-frame timings and gauges into a bounded ring and flushes them to a sink in the background.
+
+	record() copies one row of floats into a preallocated array under a short lock and never does I/O;
+	a flush thread wakes every `flush_interval` seconds (or when the ring is half full), copies out the
+	pending rows and hands them to the sink. If the sink falls behind by a whole ring, the oldest rows
+	are overwritten and counted in `dropped`.
+
+	Per-system times come from ScheduledSystem.total_ms, so a frame reports the time of every tick it
+	ran (zero when none did). Gauges are callables sampled once per recorded frame.
+	"""
+
+	def __init__(self, sink, systems: Sequence[ScheduledSystem] = (), gauges: Dict[str, Callable[[], float]] | None = None, capacity: int = 1024, flush_interval: float = 1.0):
+		self.sink = sink
+		self.systems = list(systems)
+		self.gauges = list((gauges or {}).items())
+		self.columns: List[Column] = [Column("frame", "frame"), Column("time", "time"), Column("frame_ms", "ms"), Column("work_ms", "ms")]
+		self.columns.extend(Column(f"system.{s.name}", "ms") for s in self.systems)
+		self.columns.extend(Column(name, "gauge") for name, _ in self.gauges)
+		self.capacity = max(2, capacity)
+		self.flush_interval = flush_interval
+		self.dropped = 0
+		self.emitted = 0
+		self.flush_cpu_ms = 0.0
+		self._width = len(self.columns)
+		self._ring = array("d", bytes(8 * self._width * self.capacity))
+		self._written = 0
+		self._read = 0
+		self._system_totals = [s.total_ms for s in self.systems]
+		self._lock = threading.Lock()
+		self._wake = threading.Event()
+		self._stop = False
+		self._thread: threading.Thread | None = None
+
+	@property
+	def pending(self) -> int:
+		return self._written - self._read
+
+	def start(self) -> None:
+		if self._thread is None:
+			self._thread = threading.Thread(target=self._run, name="metrics-flush", daemon=True)
+			self._thread.start()
+
+	def record(self, frame: int, frame_ms: float, work_ms: float) -> None:
+		ring = self._ring
+		with self._lock:
+			if self._written - self._read >= self.capacity:
+				self._read += 1
+				self.dropped += 1
+			o = (self._written % self.capacity) * self._width
+			ring[o] = frame
+			ring[o + 1] = time.time()
+			ring[o + 2] = frame_ms
+			ring[o + 3] = work_ms
+			o += 4
+			totals = self._system_totals
+			for i, system in enumerate(self.systems):
+				total = system.total_ms
+				ring[o] = total - totals[i]
+				totals[i] = total
+				o += 1
+			for _, gauge in self.gauges:
+				ring[o] = gauge()
+				o += 1
+			self._written += 1
+		if self._written - self._read >= self.capacity // 2:
+			self._wake.set()
+
+	def flush(self) -> int:
+		"""Writes pending rows to the sink on the calling thread. Returns the number written."""
+		start = time.thread_time()
+		with self._lock:
+			first, end = self._read, self._written
+			if first == end:
+				return 0
+			w = self._width
+			a = first % self.capacity
+			b = end % self.capacity
+			if a < b:
+				flat = self._ring[a * w:b * w]
+			else:
+				flat = self._ring[a * w:] + self._ring[:b * w]
+			self._read = end
+		rows = [flat[i:i + w] for i in range(0, len(flat), w)]
+		self.sink.write(self.columns, rows)
+		self.emitted += len(rows)
+		self.flush_cpu_ms += (time.thread_time() - start) * 1000.0
+		return len(rows)
+
+	def _run(self) -> None:
+		while not self._stop:
+			self._wake.wait(self.flush_interval)
+			self._wake.clear()
+			self.flush()
+
+	def close(self, timeout: float | None = 5.0) -> None:
+		"""Stops the flush thread, writes what is left and closes the sink."""
+		self._stop = True
+		self._wake.set()
+		if self._thread is not None:
+			self._thread.join(timeout)
+			self._thread = None
+		self.flush()
+		self.sink.close()
\ No newline at end of file
@@ -1,20 +1,245 @@
 from __future__ import annotations
 import collections
+import contextlib
+import cProfile
+import gc
+import os
+import threading
 import time
+import tracemalloc
+from typing import Callable, Deque, Iterator, List, NamedTuple, Tuple
+
+
+class GCMonitor:
+	"""Counts garbage collections and their pause time through gc.callbacks, per frame."""
+
+	def __init__(self):
+		self.collections = [0, 0, 0]
+		self.pause_ms = 0.0
+		self._started = 0.0
+
+	def install(self) -> None:
+		if self._on_gc not in gc.callbacks:
+			gc.callbacks.append(self._on_gc)
+
+	def uninstall(self) -> None:
+		if self._on_gc in gc.callbacks:
+			gc.callbacks.remove(self._on_gc)
+
+	def _on_gc(self, phase: str, info: dict) -> None:
+		if phase == "start":
+			self._started = time.perf_counter()
+		else:
+			self.collections[info["generation"]] += 1
+			self.pause_ms += (time.perf_counter() - self._started) * 1000.0
+
+	def take(self) -> Tuple[Tuple[int, int, int], float]:
+		"""Returns collections per generation and total pause since the last call, and resets them."""
+		counts = tuple(self.collections)
+		pause_ms = self.pause_ms
+		self.collections = [0, 0, 0]
+		self.pause_ms = 0.0
+		return counts, pause_ms
+
+
+class Hitch(NamedTuple):
+	"""A frame that took longer than the frame budget, with the garbage collection that ran during it."""
+
+	frame: int
+	frame_ms: float
+	work_ms: float
+	gc_collections: Tuple[int, int, int]
+	gc_ms: float
+
+	def __str__(self) -> str:
+		gen0, gen1, gen2 = self.gc_collections
+		return f"hitch: frame {self.frame} took {self.frame_ms:.1f} ms (work {self.work_ms:.1f} ms), gc {gen0}/{gen1}/{gen2} collections {self.gc_ms:.1f} ms"
+
+
+class ProfileCapture:
+	"""Profiles a window of frames with cProfile and tracemalloc while the game keeps running.
+
+	request() arms a capture; it starts at the next begin_frame() and covers `frames` frames. Memory is
+	traced only during the window (tracemalloc is started and stopped around it unless something else
+	already runs it). The end snapshot, the .prof file and a text report with the largest allocation
+	changes by line are made on a background thread, which stops tracemalloc once it has the snapshot.
+	Copying the traces holds the GIL for a few to a few hundred ms depending on how much the window
+	allocated, so the frames it overlaps are still slowed; overlaps() reports them so they are not
+	counted as hitches. cProfile only sees the thread that renders the frames; in threaded mode that
+	is not the simulation.
+	"""
+
+	def __init__(self, out_dir: str = "profiles", frames: int = 300, top: int = 25):
+		self.out_dir = out_dir
+		self.frames = max(1, frames)
+		self.top = top
+		self.last_path: str | None = None
+		self._armed = False
+		self._profile: cProfile.Profile | None = None
+		self._frames_left = 0
+		self._started = 0.0
+		self._start_snapshot: tracemalloc.Snapshot | None = None
+		self._owns_tracemalloc = False
+		self._writer: threading.Thread | None = None
+		# perf_counter() when the writer finished copying traces; inf while it is still copying
+		self._snapshot_done = 0.0
+
+	@property
+	def active(self) -> bool:
+		return self._profile is not None
+
+	@property
+	def status(self) -> str:
+		"""Short state for the HUD; empty when idle."""
+		if self._profile is not None:
+			return f"Profiling: frame {self.frames - self._frames_left + 1}/{self.frames}"
+		if self._armed:
+			return "Profiling: starting"
+		if self._writer is not None and self._writer.is_alive():
+			return "Profiling: writing"
+		return ""
+
+	def overlaps(self, since: float) -> bool:
+		"""True if the capture slowed the game after `since` (a perf_counter() time): profiling, or taking the end snapshot."""
+		return self._profile is not None or self._snapshot_done > since
+
+	def request(self, frames: int | None = None) -> bool:
+		"""Arms a capture of the next `frames` frames. Ignored while one is pending, running or being written."""
+		if self._armed or self._profile is not None or (self._writer is not None and self._writer.is_alive()):
+			return False
+		if frames is not None:
+			self.frames = max(1, frames)
+		self._armed = True
+		return True
+
+	def wait(self, timeout: float | None = None) -> None:
+		"""Waits for files of a finished capture to be written (used on exit)."""
+		if self._writer is not None:
+			self._writer.join(timeout)
+
+	def begin_frame(self) -> None:
+		if not self._armed:
+			return
+		self._armed = False
+		self._owns_tracemalloc = not tracemalloc.is_tracing()
+		if self._owns_tracemalloc:
+			tracemalloc.start()
+		self._start_snapshot = tracemalloc.take_snapshot()
+		self._frames_left = self.frames
+		self._started = time.perf_counter()
+		self._profile = cProfile.Profile()
+		self._profile.enable()
+
+	def end_frame(self) -> None:
+		if self._profile is None:
+			return
+		self._frames_left -= 1
+		if self._frames_left > 0:
+			return
+		profile = self._profile
+		profile.disable()
+		self._profile = None
+		elapsed_s = time.perf_counter() - self._started
+		start_snapshot = self._start_snapshot
+		self._start_snapshot = None
+		base = os.path.join(self.out_dir, time.strftime("frames-%Y%m%d-%H%M%S"))
+		self.last_path = base + ".prof"
+		self._snapshot_done = float("inf")
+		self._writer = threading.Thread(target=self._write, args=(base, profile, start_snapshot, self._owns_tracemalloc, self.frames, elapsed_s), name="profile-writer", daemon=True)
+		self._writer.start()
+
+	def _write(self, base: str, profile: cProfile.Profile, start: tracemalloc.Snapshot, owns_tracemalloc: bool, frames: int, elapsed_s: float) -> None:
+		try:
+			end = tracemalloc.take_snapshot()
+			if owns_tracemalloc:
+				tracemalloc.stop()
+		finally:
+			self._snapshot_done = time.perf_counter()
+		os.makedirs(self.out_dir, exist_ok=True)
+		profile.dump_stats(base + ".prof")
+		# The capture's own bookkeeping would otherwise top the list
+		ignore = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__)]
+		stats = end.filter_traces(ignore).compare_to(start.filter_traces(ignore), "lineno")
+		growth = sum(s.size_diff for s in stats)
+		lines = [
+			f"{frames} frames in {elapsed_s:.2f} s ({elapsed_s * 1000.0 / frames:.2f} ms/frame)",
+			f"traced memory change: {growth / 1024.0:+.1f} KiB",
+			f"top {self.top} allocation changes by line:",
+		]
+		lines.extend(f"  {stat}" for stat in stats[:self.top])
+		with open(base + "-alloc.txt", "w", encoding="utf-8") as f:
+			f.write("\n".join(lines) + "\n")
 
 
 class FrameProfiler:
-	def __init__(self, window: int = 120):
+	def __init__(self, window: int = 120, budget_ms: float | None = None, hitch_log: int = 64):
 		self.times_ms = collections.deque(maxlen=window)
+		# Time spent updating and rendering, excluding the frame-cap sleep; this is the actual headroom
+		self.work_ms = collections.deque(maxlen=window)
 		self.last_frame_start = time.perf_counter()
+		# Frames longer than budget_ms are recorded in `hitches` (most recent last) and passed to on_hitch
+		self.budget_ms = budget_ms
+		self.hitches: Deque[Hitch] = collections.deque(maxlen=hitch_log)
+		self.hitch_count = 0
+		self.on_hitch: Callable[[Hitch], None] | None = None
+		self.gc_monitor: GCMonitor | None = None
+		# On-demand cProfile/tracemalloc window driven by begin_frame/end_frame
+		self.capture: ProfileCapture | None = None
+		self.frames = 0
+		self._work_ended = False
 
 	def begin_frame(self) -> None:
 		self.last_frame_start = time.perf_counter()
+		if self.gc_monitor is not None:
+			# Collections between frames (setup, loading) are not part of this one
+			self.gc_monitor.take()
+		if self.capture is not None:
+			self.capture.begin_frame()
+
+	def track_gc(self) -> GCMonitor:
+		"""Starts attributing garbage collection pauses to frames; hitches then report them."""
+		if self.gc_monitor is None:
+			self.gc_monitor = GCMonitor()
+			self.gc_monitor.install()
+		return self.gc_monitor
+
+	def end_work(self) -> None:
+		self.work_ms.append((time.perf_counter() - self.last_frame_start) * 1000.0)
+		self._work_ended = True
+
+	@property
+	def elapsed_ms(self) -> float:
+		"""Time since begin_frame()."""
+		return (time.perf_counter() - self.last_frame_start) * 1000.0
 
 	def end_frame(self, _frame_limit_ms: int) -> None:
 		now = time.perf_counter()
 		elapsed_ms = (now - self.last_frame_start) * 1000.0
 		self.times_ms.append(elapsed_ms)
+		self.frames += 1
+		work_ms = self.work_ms[-1] if self._work_ended else elapsed_ms
+		self._work_ended = False
+		if self.gc_monitor is not None:
+			gc_collections, gc_ms = self.gc_monitor.take()
+		else:
+			gc_collections, gc_ms = (0, 0, 0), 0.0
+		# Frames slowed down by a profile capture, including its end snapshot, are not hitches
+		capturing = self.capture is not None and self.capture.overlaps(self.last_frame_start)
+		if self.budget_ms is not None and elapsed_ms > self.budget_ms and not capturing:
+			hitch = Hitch(self.frames, elapsed_ms, work_ms, gc_collections, gc_ms)
+			self.hitches.append(hitch)
+			self.hitch_count += 1
+			if self.on_hitch is not None:
+				self.on_hitch(hitch)
+		if self.capture is not None:
+			self.capture.end_frame()
+
+	def percentile(self, p: float) -> float:
+		"""Frame time at percentile `p` (0-100) over the window."""
+		if not self.times_ms:
+			return 0.0
+		ordered = sorted(self.times_ms)
+		return ordered[min(len(ordered) - 1, int(len(ordered) * p / 100.0))]
 
 	@property
 	def avg_ms(self) -> float:
@@ -22,9 +247,42 @@ class FrameProfiler:
 			return 0.0
 		return sum(self.times_ms) / len(self.times_ms)
 
+	@property
+	def avg_work_ms(self) -> float:
+		if not self.work_ms:
+			return 0.0
+		return sum(self.work_ms) / len(self.work_ms)
+
 	@property
 	def fps(self) -> float:
 		ms = self.avg_ms
 		if ms <= 0.0001:
 			return 0.0
-		return 1000.0 / ms
\ No newline at end of file
+		return 1000.0 / ms
+
+
+class StartupProfiler:
+	"""Records how long each initialization phase takes and the time to the first presented frame."""
+
+	def __init__(self, start: float | None = None):
+		self.start = time.perf_counter() if start is None else start
+		self.phases: List[Tuple[str, float]] = []
+		self.first_frame_ms: float | None = None
+
+	@contextlib.contextmanager
+	def phase(self, name: str) -> Iterator[None]:
+		t0 = time.perf_counter()
+		try:
+			yield
+		finally:
+			self.phases.append((name, (time.perf_counter() - t0) * 1000.0))
+
+	def mark_first_frame(self) -> None:
+		if self.first_frame_ms is None:
+			self.first_frame_ms = (time.perf_counter() - self.start) * 1000.0
+
+	def report(self) -> str:
+		lines = [f"  {name:<24}{ms:8.2f} ms" for name, ms in self.phases]
+		if self.first_frame_ms is not None:
+			lines.append(f"  {'time to first frame':<24}{self.first_frame_ms:8.2f} ms")
+		return "Startup:\n" + "\n".join(lines)
\ No newline at end of file
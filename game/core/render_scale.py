@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+from .profiling import FrameProfiler
+
+
+class DynamicResolution:
+	"""Picks the world render scale from measured frame work time.
+
+	Scales are multiples of `step` (1/8 keeps a 32 px tile an integer size at every level). The scale
+	drops one step when the average work time exceeds the frame budget and rises one step when there
+	is clear headroom; after every change it waits `settle_frames` so the profiler window reflects the
+	new scale before deciding again. Rising back after a drop waits `raise_delay_frames` instead, so a
+	load near the budget does not make the scale flip back and forth.
+	"""
+
+	def __init__(self, target_fps: float = 60.0, min_scale: float = 0.5, max_scale: float = 1.0, step: float = 0.125, settle_frames: int = 90, raise_delay_frames: int = 600, low_ratio: float = 0.95, high_ratio: float = 0.6):
+		self.budget_ms = 1000.0 / target_fps
+		self.step = step
+		self.min_scale = quantize_scale(min_scale, step)
+		self.max_scale = max(self.min_scale, quantize_scale(max_scale, step))
+		self.settle_frames = settle_frames
+		self.raise_delay_frames = raise_delay_frames
+		self.low_ratio = low_ratio
+		self.high_ratio = high_ratio
+		self.scale = self.max_scale
+		self.changes = 0
+		self._frames_since_change = 0
+		self._dropped = False
+
+	def update(self, profiler: FrameProfiler) -> float:
+		self._frames_since_change += 1
+		if self._frames_since_change < self.settle_frames or len(profiler.work_ms) < self.settle_frames:
+			return self.scale
+		work = profiler.avg_work_ms
+		new_scale = self.scale
+		if work > self.budget_ms * self.low_ratio and self.scale > self.min_scale:
+			new_scale = max(self.min_scale, self.scale - self.step)
+		elif work < self.budget_ms * self.high_ratio and self.scale < self.max_scale:
+			if self._dropped and self._frames_since_change < self.raise_delay_frames:
+				return self.scale
+			new_scale = min(self.max_scale, self.scale + self.step)
+		if new_scale != self.scale:
+			self._dropped = new_scale < self.scale
+			self.scale = new_scale
+			self.changes += 1
+			self._frames_since_change = 0
+			profiler.work_ms.clear()
+		return self.scale
+
+
+def quantize_scale(scale: float, step: float = 0.125) -> float:
+	return max(step, min(1.0, round(scale / step) * step))
\ No newline at end of file
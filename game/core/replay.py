@@ -0,0 +1,194 @@
+from __future__ import annotations
+import gzip
+import json
+import struct
+from typing import Dict, List, Sequence, Tuple
+
+FORMAT_VERSION = 1
+
+# Record tags in the body, each followed by a fixed-size payload
+_INPUT = b"I"
+_CHECKSUM = b"C"
+# Move vector, mouse position, camera view size, held and pressed action bits
+_INPUT_RECORD = struct.Struct("<ddiiHHII")
+# Tick count and state checksum
+_CHECKSUM_RECORD = struct.Struct("<II")
+
+
+class InputFrame:
+	"""The input of one simulation tick, answering the queries the simulation makes of InputManager.
+
+	While recording or replaying the simulation reads this instead of the live InputManager, so each
+	tick sees one fixed state no matter when events arrive, and the same state again on replay.
+	"""
+
+	def __init__(self, actions: Sequence[str]):
+		if len(actions) > 32:
+			raise ValueError("at most 32 actions can be recorded")
+		self.actions = tuple(actions)
+		self._bits = {action: 1 << i for i, action in enumerate(self.actions)}
+		self.move: Tuple[float, float] = (0.0, 0.0)
+		self.mouse: Tuple[int, int] = (0, 0)
+		self.view: Tuple[int, int] = (0, 0)
+		self.held = 0
+		self.pressed = 0
+
+	def capture(self, input_manager, view: Tuple[int, int]) -> None:
+		held = 0
+		pressed = 0
+		for action, bit in self._bits.items():
+			if input_manager.is_action_held(action):
+				held |= bit
+			if input_manager.was_action_pressed(action):
+				pressed |= bit
+		move_x, move_y = input_manager.get_move_vector()
+		mouse_x, mouse_y = input_manager.get_mouse_screen()
+		self.move = (float(move_x), float(move_y))
+		self.mouse = (int(mouse_x), int(mouse_y))
+		self.view = (int(view[0]), int(view[1]))
+		self.held = held
+		self.pressed = pressed
+
+	def pack(self) -> bytes:
+		return _INPUT_RECORD.pack(self.move[0], self.move[1], self.mouse[0], self.mouse[1], self.view[0], self.view[1], self.held, self.pressed)
+
+	def unpack(self, data: bytes) -> None:
+		move_x, move_y, mouse_x, mouse_y, view_w, view_h, self.held, self.pressed = _INPUT_RECORD.unpack(data)
+		self.move = (move_x, move_y)
+		self.mouse = (mouse_x, mouse_y)
+		self.view = (view_w, view_h)
+
+	def get_move_vector(self) -> Tuple[float, float]:
+		return self.move
+
+	def is_action_held(self, action: str) -> bool:
+		return bool(self.held & self._bits.get(action, 0))
+
+	def was_action_pressed(self, action: str) -> bool:
+		return bool(self.pressed & self._bits.get(action, 0))
+
+	def get_mouse_screen(self) -> Tuple[int, int]:
+		return self.mouse
+
+
+class InputRecorder:
+	"""Writes the input of every simulation tick, and a state checksum every `checksum_interval` ticks, to a gzip file.
+
+	The file starts with one JSON line: the action names, the checksum interval and `session`, which
+	holds whatever else the simulation depends on (RNG seeds, world size, the quick save present at
+	the start); the tagged binary records follow.
+	"""
+
+	def __init__(self, path: str, input_manager, frame: InputFrame, session: dict, checksum_interval: int = 60):
+		self.path = path
+		self.input_manager = input_manager
+		self.frame = frame
+		self.checksum_interval = max(1, checksum_interval)
+		self.ticks = 0
+		self._last_checksum_tick = -1
+		header = {"format": FORMAT_VERSION, "actions": list(frame.actions), "checksum_interval": self.checksum_interval, "session": session}
+		self._file = gzip.open(path, "wb")
+		self._file.write(json.dumps(header, ensure_ascii=False).encode("utf-8") + b"\n")
+
+	def record_tick(self, view: Tuple[int, int]) -> None:
+		"""Captures the live input into `frame` for the tick about to run and writes it.
+
+		The live presses are consumed here, so each one is recorded on the one tick that sees it.
+		"""
+		self.frame.capture(self.input_manager, view)
+		self.input_manager.end_frame()
+		self._file.write(_INPUT + self.frame.pack())
+		self.ticks += 1
+
+	@property
+	def checksum_due(self) -> bool:
+		return self.ticks % self.checksum_interval == 0 and self._last_checksum_tick != self.ticks
+
+	def checksum(self, value: int) -> None:
+		self._file.write(_CHECKSUM + _CHECKSUM_RECORD.pack(self.ticks, value & 0xFFFFFFFF))
+		self._last_checksum_tick = self.ticks
+
+	def close(self, final_checksum: int | None = None) -> None:
+		"""Closes the file, ending it with the checksum of the final state if given."""
+		if final_checksum is not None and self._last_checksum_tick != self.ticks:
+			self.checksum(final_checksum)
+		self._file.close()
+
+
+class InputReplay:
+	"""Reads a file written by InputRecorder and feeds its ticks back through `frame`.
+
+	checksum() compares the state after a tick with the recorded one; `diverged_at` is the first tick
+	where they differ, so a replay doubles as a determinism check.
+	"""
+
+	def __init__(self, path: str):
+		self.path = path
+		with gzip.open(path, "rb") as f:
+			header = json.loads(f.readline())
+			body = f.read()
+		if header.get("format") != FORMAT_VERSION:
+			raise ValueError(f"{path}: unsupported replay format {header.get('format')!r}")
+		self.session: dict = header["session"]
+		self.frame = InputFrame(header["actions"])
+		self._inputs: List[bytes] = []
+		self._checksums: Dict[int, int] = {}
+		input_size = _INPUT_RECORD.size
+		checksum_size = _CHECKSUM_RECORD.size
+		o = 0
+		while o < len(body):
+			tag = body[o:o + 1]
+			o += 1
+			if tag == _INPUT:
+				self._inputs.append(body[o:o + input_size])
+				o += input_size
+			elif tag == _CHECKSUM:
+				tick, value = _CHECKSUM_RECORD.unpack_from(body, o)
+				self._checksums[tick] = value
+				o += checksum_size
+			else:
+				raise ValueError(f"{path}: corrupt record at byte {o - 1}")
+		self.ticks = 0
+		self.matched = 0
+		self.diverged_at: int | None = None
+
+	@property
+	def total_ticks(self) -> int:
+		return len(self._inputs)
+
+	@property
+	def finished(self) -> bool:
+		return self.ticks >= len(self._inputs)
+
+	def next_tick(self) -> bool:
+		"""Loads the input of the next tick into `frame`; False once the recording is exhausted."""
+		if self.ticks >= len(self._inputs):
+			return False
+		self.frame.unpack(self._inputs[self.ticks])
+		self.ticks += 1
+		return True
+
+	@property
+	def checksum_due(self) -> bool:
+		return self.ticks in self._checksums
+
+	def checksum(self, value: int) -> bool:
+		expected = self._checksums.pop(self.ticks, None)
+		if expected is None or expected == value & 0xFFFFFFFF:
+			self.matched += expected is not None
+			return True
+		if self.diverged_at is None:
+			self.diverged_at = self.ticks
+		return False
+
+	def report(self, tick_ms: Sequence[float], elapsed_s: float, tick_rate: float) -> str:
+		speed = self.ticks / tick_rate / elapsed_s if elapsed_s > 0 else 0.0
+		lines = [f"Replay: {self.ticks} ticks in {elapsed_s:.2f} s ({self.ticks / max(elapsed_s, 1e-9):.0f} ticks/s, {speed:.1f}x real time)"]
+		if tick_ms:
+			ordered = sorted(tick_ms)
+			lines.append(f"  tick ms p50={ordered[len(ordered) // 2]:.3f} p99={ordered[int(len(ordered) * 0.99)]:.3f} max={ordered[-1]:.3f}")
+		if self.diverged_at is None:
+			lines.append(f"  state identical to the recording ({self.matched} checksums matched)")
+		else:
+			lines.append(f"  DIVERGED from the recording at tick {self.diverged_at} ({self.matched} checksums matched)")
+		return "\n".join(lines)
\ No newline at end of file
@@ -0,0 +1,162 @@
+from __future__ import annotations
+import time
+from typing import Callable, List, Optional, Sequence
+
+from .time_step import FixedTimeStep
+
+
+class ScheduledSystem:
+	"""A callback run every `period` fixed steps, offset by `phase` steps."""
+
+	def __init__(self, scheduler: "Scheduler", name: str, callback: Callable[[float], None], period: int, phase: int, budget_ms: Optional[float]):
+		self.scheduler = scheduler
+		self.name = name
+		self.callback = callback
+		self.period = period
+		self.phase = phase % period
+		self.budget_ms = budget_ms
+		self.dt = period * scheduler.time_step.dt
+		self.enabled = True
+
+		self.last_run_tick = -1
+		self.last_ms = 0.0
+		self.max_ms = 0.0
+		self.runs = 0
+		self.overruns = 0
+		# Running total, so per-frame time can be read as a difference however many ticks a frame ran
+		self.total_ms = 0.0
+
+	@property
+	def rate_hz(self) -> float:
+		return 1.0 / self.dt
+
+	def is_due(self, tick: int) -> bool:
+		return (tick - self.phase) % self.period == 0
+
+	@property
+	def alpha(self) -> float:
+		"""Fraction (0..1) of this system's step elapsed since it last ran, for render interpolation."""
+		if self.last_run_tick < 0:
+			return 0.0
+		ticks_since = self.scheduler.tick_count - 1 - self.last_run_tick
+		return min(1.0, (ticks_since + self.scheduler.time_step.alpha) / self.period)
+
+	@property
+	def ahead_time(self) -> float:
+		"""Seconds this system's state is ahead of the last fixed step.
+
+		A run advances it by its whole period at once, so right after running it is period - 1 steps
+		ahead of systems that run every step, and the lead shrinks by one step per tick until it runs again.
+		"""
+		if self.last_run_tick < 0:
+			return 0.0
+		ticks_since = self.scheduler.tick_count - 1 - self.last_run_tick
+		return (self.period - 1 - ticks_since) * self.scheduler.time_step.dt
+
+	@property
+	def lead_time(self) -> float:
+		"""Seconds from this system's state to the frame's time; negative while its last run reaches past it.
+
+		Drawing at position + velocity * lead_time shows the state at the frame's time instead of
+		extrapolating past it.
+		"""
+		time_step = self.scheduler.time_step
+		return time_step.alpha * time_step.dt - self.ahead_time
+
+	def run(self, tick: int) -> None:
+		start = time.perf_counter()
+		self.callback(self.dt)
+		self._record(tick, start)
+
+	def _record(self, tick: int, start: float) -> None:
+		elapsed = (time.perf_counter() - start) * 1000.0
+		self.last_run_tick = tick
+		self.last_ms = elapsed
+		self.total_ms += elapsed
+		if elapsed > self.max_ms:
+			self.max_ms = elapsed
+		self.runs += 1
+		if self.budget_ms is not None and elapsed > self.budget_ms:
+			self.overruns += 1
+
+
+class StaggeredSystem(ScheduledSystem):
+	"""Runs a per-item callback at `period` steps per item, spreading the items evenly over the steps.
+
+	Item i is processed on the ticks where (tick - phase) % period == i % period. When a tick's share
+	exceeds the budget, the rest of that share is carried over to the next tick.
+	"""
+
+	def __init__(self, scheduler: "Scheduler", name: str, items: Callable[[], Sequence[object]], callback: Callable[[object, float], None], period: int, phase: int, budget_ms: Optional[float]):
+		super().__init__(scheduler, name, None, period, phase, budget_ms)
+		self.items = items
+		self.item_callback = callback
+		self._backlog: List[object] = []
+		self.deferred = 0
+
+	def is_due(self, tick: int) -> bool:
+		return True
+
+	def run(self, tick: int) -> None:
+		start = time.perf_counter()
+		budget_s = self.budget_ms / 1000.0 if self.budget_ms is not None else None
+		dt = self.dt
+		callback = self.item_callback
+
+		share = list(self.items()[(tick - self.phase) % self.period::self.period])
+		if self._backlog:
+			share = self._backlog + share
+			self._backlog = []
+		last = len(share) - 1
+		for k, item in enumerate(share):
+			callback(item, dt)
+			if budget_s is not None and k < last and time.perf_counter() - start > budget_s:
+				self._backlog = share[k + 1:]
+				break
+		self.deferred = len(self._backlog)
+		self._record(tick, start)
+
+
+class Scheduler:
+	"""Multi-rate system scheduler driven by FixedTimeStep.
+
+	Call tick() once per fixed step; every registered system whose rate divides into the base rate runs
+	on its own ticks, in registration order. Rates are rounded to a whole number of base steps.
+	"""
+
+	def __init__(self, time_step: FixedTimeStep):
+		self.time_step = time_step
+		self.systems: List[ScheduledSystem] = []
+		self.tick_count = 0
+
+	@property
+	def base_rate_hz(self) -> float:
+		return 1.0 / self.time_step.dt
+
+	def _period(self, rate_hz: Optional[float]) -> int:
+		if rate_hz is None or rate_hz <= 0:
+			return 1
+		return max(1, int(round(self.base_rate_hz / rate_hz)))
+
+	def register(self, name: str, callback: Callable[[float], None], rate_hz: Optional[float] = None, phase: int = 0, budget_ms: Optional[float] = None) -> ScheduledSystem:
+		system = ScheduledSystem(self, name, callback, self._period(rate_hz), phase, budget_ms)
+		self.systems.append(system)
+		return system
+
+	def register_staggered(self, name: str, items: Callable[[], Sequence[object]], callback: Callable[[object, float], None], rate_hz: float, phase: int = 0, budget_ms: Optional[float] = None) -> StaggeredSystem:
+		system = StaggeredSystem(self, name, items, callback, self._period(rate_hz), phase, budget_ms)
+		self.systems.append(system)
+		return system
+
+	def get(self, name: str) -> Optional[ScheduledSystem]:
+		for system in self.systems:
+			if system.name == name:
+				return system
+		return None
+
+	def tick(self) -> None:
+		tick = self.tick_count
+		for system in self.systems:
+			if system.enabled and system.is_due(tick):
+				system.run(tick)
+		self.tick_count += 1
\ No newline at end of file
@@ -0,0 +1,117 @@
+from __future__ import annotations
+import threading
+import time
+from typing import Callable, List, Optional, Sequence, Tuple
+
+from .replay import InputFrame
+from .time_step import FixedTimeStep
+
+
+class RenderBuffer:
+	"""Double buffer of immutable render snapshots shared between the simulation and render threads.
+
+	The simulation publishes a new snapshot every tick; the renderer reads the last two and
+	interpolates between them. Tile changes published with the snapshots pile up until the renderer
+	takes them, so none is lost when it skips a tick.
+	"""
+
+	def __init__(self):
+		self._lock = threading.Lock()
+		self._prev = None
+		self._curr = None
+		self._tile_changes: List[Tuple[int, int, bool]] = []
+
+	def publish(self, snapshot, tile_changes: Sequence[Tuple[int, int, bool]] = ()) -> None:
+		with self._lock:
+			self._prev = self._curr if self._curr is not None else snapshot
+			self._curr = snapshot
+			if tile_changes:
+				self._tile_changes.extend(tile_changes)
+
+	def take_tile_changes(self) -> Sequence[Tuple[int, int, bool]]:
+		"""Tile changes as (tx, ty, value) published since the last call, oldest first."""
+		with self._lock:
+			changes = self._tile_changes
+			if not changes:
+				return ()
+			self._tile_changes = []
+		return changes
+
+	def read(self) -> Tuple[Optional[object], Optional[object]]:
+		with self._lock:
+			return self._prev, self._curr
+
+	@staticmethod
+	def alpha(curr, now: float | None = None) -> float:
+		"""Same meaning as FixedTimeStep.alpha, measured from when `curr` was published."""
+		if curr is None or curr.dt <= 0:
+			return 1.0
+		if now is None:
+			now = time.perf_counter()
+		return max(0.0, min(1.0, (now - curr.published_at) / curr.dt))
+
+
+class InputMailbox:
+	"""Hands the live input from the render thread to the simulation thread.
+
+	The render thread handles the events and post()s the input once per frame; the simulation thread
+	take()s it into its own InputFrame at the start of each tick, so it never reads the InputManager
+	while events are being processed. Presses pile up until a tick takes them: none is lost when a
+	frame runs no tick, and none is seen by two ticks.
+	"""
+
+	def __init__(self, actions):
+		self._lock = threading.Lock()
+		self._pending = InputFrame(actions)
+
+	def post(self, input_manager, view: Tuple[int, int]) -> None:
+		"""Captures the live input and consumes its presses. Call on the thread that processes events."""
+		with self._lock:
+			pressed = self._pending.pressed
+			self._pending.capture(input_manager, view)
+			self._pending.pressed |= pressed
+		input_manager.end_frame()
+
+	def take(self, frame: InputFrame) -> None:
+		"""Copies the latest posted input into `frame`, taking the presses posted since the last call."""
+		with self._lock:
+			pending = self._pending
+			frame.move = pending.move
+			frame.mouse = pending.mouse
+			frame.view = pending.view
+			frame.held = pending.held
+			frame.pressed = pending.pressed
+			pending.pressed = 0
+
+
+class SimulationThread(threading.Thread):
+	"""Runs the fixed-step simulation on a worker thread and publishes a render snapshot after each step."""
+
+	def __init__(self, time_step: FixedTimeStep, tick: Callable[[], None], publish: Callable[[], None], is_paused: Callable[[], bool] = lambda: False):
+		super().__init__(name="simulation", daemon=True)
+		self.time_step = time_step
+		self._tick = tick
+		self._publish = publish
+		self._is_paused = is_paused
+		self._stop_event = threading.Event()
+		self.error: Optional[BaseException] = None
+		self.ticks = 0
+
+	def run(self) -> None:
+		try:
+			self.time_step.reset()
+			while not self._stop_event.is_set():
+				for _ in self.time_step.step():
+					if not self._is_paused():
+						self._tick()
+						self.ticks += 1
+						self._publish()
+				# Sleep until the next step is due; this also lets the render thread take the GIL
+				self._stop_event.wait(max(0.0005, self.time_step.time_to_next_step))
+		except BaseException as exc:
+			self.error = exc
+
+	def stop(self, timeout: float = 1.0) -> None:
+		self._stop_event.set()
+		if self.is_alive() and threading.current_thread() is not self:
+			self.join(timeout)
\ No newline at end of file
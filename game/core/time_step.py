@@ -8,6 +8,10 @@ class FixedTimeStep:
         self._accumulator = 0.0
         self._last_time = time.perf_counter()
 
+    def reset(self) -> None:
+        self._accumulator = 0.0
+        self._last_time = time.perf_counter()
+
     def step(self) -> Generator[None, None, None]:
         current_time = time.perf_counter()
         frame_time = current_time - self._last_time
@@ -25,4 +29,8 @@ class FixedTimeStep:
         # Interpolation alpha (0..1) if needed for render interpolation
         if self.dt <= 0:
             return 1.0
-        return self._accumulator / self.dt
\ No newline at end of file
+        return self._accumulator / self.dt
+
+    @property
+    def time_to_next_step(self) -> float:
+        return max(0.0, self.dt - self._accumulator)
\ No newline at end of file
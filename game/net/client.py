@@ -0,0 +1,165 @@
+from __future__ import annotations
+import socket
+from typing import Dict, List, Optional, Tuple
+
+from game.world.entities import EntityRegistry
+from game.world.player import Player
+from game.world.projectiles import ProjectilePool
+from game.world.tilemap import TileMap
+from . import protocol
+
+
+class GameClient:
+	"""Sends input commands to a GameServer and mirrors its snapshots into local world objects.
+
+	The local player, enemy registry and projectile pool are owned by the caller and updated in place;
+	other connected players are kept in `remote_players`. The caller's tile map must match the server's
+	size, which the welcome carries; otherwise the client gives up with `rejected` and `reject_reason`.
+	"""
+
+	HISTORY_TICKS = 64
+
+	def __init__(self, server_address: Tuple[str, int], view_size: Tuple[int, int], player: Player, enemies: EntityRegistry, projectiles: ProjectilePool, tile_map: TileMap):
+		self.server_address = server_address
+		self.view_size = view_size
+		self.player = player
+		self.enemies = enemies
+		self.projectiles = projectiles
+		self.tile_map = tile_map
+		self.remote_players: List[Optional[Player]] = []
+
+		self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+		self.sock.setblocking(False)
+		self.slot = -1
+		self.connected = False
+		self.rejected = False
+		self.reject_reason = ""
+		self.latest_tick = -1
+		self._input_seq = 0
+		self._states: Dict[int, protocol.WorldState] = {}
+		self.bytes_received = 0
+
+	def connect(self) -> None:
+		self.sock.sendto(protocol.CONNECT_FMT.pack(protocol.MSG_CONNECT, self.view_size[0], self.view_size[1]), self.server_address)
+
+	def disconnect(self) -> None:
+		try:
+			self.sock.sendto(bytes([protocol.MSG_DISCONNECT]), self.server_address)
+		except OSError:
+			pass
+		self.sock.close()
+
+	def send_input(self, input_manager) -> None:
+		if self.rejected:
+			return
+		if not self.connected:
+			# Keep retrying until the welcome arrives
+			self.connect()
+			return
+		move_x, move_y = input_manager.get_move_vector()
+		mouse_x, mouse_y = input_manager.get_mouse_screen()
+		buttons = protocol.BUTTON_FIRE if input_manager.is_action_held("fire") else 0
+		self._input_seq += 1
+		packet = protocol.INPUT_FMT.pack(
+			protocol.MSG_INPUT,
+			self._input_seq,
+			self.latest_tick,
+			int(round(move_x * protocol.AXIS_SCALE)),
+			int(round(move_y * protocol.AXIS_SCALE)),
+			buttons,
+			max(0, min(0xFFFF, int(mouse_x))),
+			max(0, min(0xFFFF, int(mouse_y))),
+		)
+		self.sock.sendto(packet, self.server_address)
+
+	def poll(self) -> bool:
+		"""Drains pending packets. Returns True if a newer snapshot was applied."""
+		newest: Optional[Tuple[int, protocol.WorldState]] = None
+		while True:
+			try:
+				data, _ = self.sock.recvfrom(65536)
+			except (BlockingIOError, InterruptedError):
+				break
+			except ConnectionResetError:
+				continue
+			if not data:
+				continue
+			self.bytes_received += len(data)
+			kind = data[0]
+			if kind == protocol.MSG_WELCOME:
+				_, slot, tiles_w, tiles_h, tile_size = protocol.WELCOME_FMT.unpack_from(data, 0)
+				tm = self.tile_map
+				if (tiles_w, tiles_h, tile_size) != (tm.tiles_w, tm.tiles_h, tm.tile_size):
+					# Snapshot positions would land on a different map; free the slot instead of playing on it
+					self.sock.sendto(bytes([protocol.MSG_DISCONNECT]), self.server_address)
+					self.rejected = True
+					self.reject_reason = f"server map is {tiles_w}x{tiles_h} tiles of {tile_size} px, local map is {tm.tiles_w}x{tm.tiles_h} tiles of {tm.tile_size} px"
+					continue
+				self.slot = slot
+				self.connected = True
+			elif kind == protocol.MSG_REJECT:
+				self.rejected = True
+				self.reject_reason = "server is full"
+			elif kind == protocol.MSG_SNAPSHOT and self.connected:
+				decoded = protocol.decode_snapshot(data, self._states.get)
+				if decoded is None:
+					continue
+				tick, state = decoded
+				if tick <= self.latest_tick:
+					continue
+				self._states[tick] = state
+				self._states.pop(tick - self.HISTORY_TICKS, None)
+				self.latest_tick = tick
+				newest = decoded
+		if newest is None:
+			return False
+		self._apply(newest[1])
+		return True
+
+	def _apply(self, state: protocol.WorldState) -> None:
+		players, enemies, projectiles = state
+		inv_pos = 1.0 / protocol.POS_SCALE
+		inv_hp = 1.0 / protocol.HP_SCALE
+
+		while len(self.remote_players) < len(players):
+			self.remote_players.append(None)
+		for i, (present, x, y, hp, dead) in enumerate(players):
+			if i == self.slot:
+				target = self.player
+				self.remote_players[i] = None
+			elif not present:
+				self.remote_players[i] = None
+				continue
+			else:
+				target = self.remote_players[i]
+				if target is None:
+					target = Player(spawn_pos=(0, 0), input_manager=None, projectiles=self.projectiles, particles=self.player.particles, tile_map=self.tile_map)
+					self.remote_players[i] = target
+			target.position.update(x * inv_pos, y * inv_pos)
+			target.health = hp * inv_hp
+			target.is_dead = bool(dead)
+
+		# Dead enemies are not mirrored; the registry is resized to the live ones and filled in order
+		live = [rec for rec in enemies if rec[2] > 0]
+		registry = self.enemies
+		while len(registry) < len(live):
+			registry.spawn((0, 0))
+		if len(registry) > len(live):
+			for e in registry.active[len(live):]:
+				registry.despawn(e.handle)
+			registry.flush()
+		for e, (x, y, hp, st) in zip(registry.active, live):
+			e.position.update(x * inv_pos, y * inv_pos)
+			e.health = hp * inv_hp
+			e.state = protocol.ENEMY_STATES[st]
+
+		for p, (active, x, y, owner) in zip(self.projectiles.projectiles, projectiles):
+			p.active = bool(active)
+			if active:
+				p.position.update(x * inv_pos, y * inv_pos)
+				p.owner = protocol.OWNERS[owner]
+
+	def draw_remote_players(self, surface, camera) -> None:
+		for pl in self.remote_players:
+			if pl is not None:
+				pl.draw(surface, camera)
\ No newline at end of file
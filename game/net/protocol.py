@@ -0,0 +1,153 @@
+from __future__ import annotations
+import struct
+from typing import Callable, List, Optional, Sequence, Tuple
+
+DEFAULT_PORT = 47800
+
+MSG_CONNECT = 1
+MSG_INPUT = 2
+MSG_DISCONNECT = 3
+MSG_WELCOME = 10
+MSG_SNAPSHOT = 11
+MSG_REJECT = 12
+
+# Quantization: 1/8 px positions, 1/4 hp, 1/127 move axis
+POS_SCALE = 8.0
+HP_SCALE = 4.0
+AXIS_SCALE = 127.0
+
+BUTTON_FIRE = 1
+
+CONNECT_FMT = struct.Struct("<BHH")
+INPUT_FMT = struct.Struct("<BIibbBHH")
+WELCOME_FMT = struct.Struct("<BBHHH")
+SNAPSHOT_HEADER_FMT = struct.Struct("<Bii")
+
+# Quantized entity records, all fields are ints
+#   player:     (present, x, y, hp, dead)
+#   enemy:      (x, y, hp, state)
+#   projectile: (active, x, y, owner)
+PLAYER_FIELDS = 5
+ENEMY_FIELDS = 4
+PROJECTILE_FIELDS = 4
+
+ENEMY_STATES = ("patrol", "chase")
+OWNERS = ("player", "enemy")
+
+Record = Tuple[int, ...]
+WorldState = Tuple[List[Record], List[Record], List[Record]]
+
+
+def _q(value: float, scale: float) -> int:
+	return int(round(value * scale))
+
+
+def quantize_world(players: Sequence[Optional[object]], enemies: Sequence[object], projectiles) -> WorldState:
+	player_records: List[Record] = []
+	for pl in players:
+		if pl is None:
+			player_records.append((0, 0, 0, 0, 0))
+		else:
+			player_records.append((1, _q(pl.position.x, POS_SCALE), _q(pl.position.y, POS_SCALE), _q(pl.health, HP_SCALE), 1 if pl.is_dead else 0))
+	enemy_records: List[Record] = [
+		(_q(e.position.x, POS_SCALE), _q(e.position.y, POS_SCALE), _q(e.health, HP_SCALE), ENEMY_STATES.index(e.state) if e.state in ENEMY_STATES else 0)
+		for e in enemies
+	]
+	projectile_records: List[Record] = []
+	for p in projectiles.projectiles:
+		if p.active:
+			projectile_records.append((1, _q(p.position.x, POS_SCALE), _q(p.position.y, POS_SCALE), 1 if p.owner == "enemy" else 0))
+		else:
+			projectile_records.append((0, 0, 0, 0))
+	return player_records, enemy_records, projectile_records
+
+
+def write_varint(buf: bytearray, value: int) -> None:
+	# Zigzag so small negative deltas stay small
+	v = (value << 1) ^ (value >> 63)
+	while v >= 0x80:
+		buf.append((v & 0x7F) | 0x80)
+		v >>= 7
+	buf.append(v)
+
+
+def read_varint(data: bytes, offset: int) -> Tuple[int, int]:
+	shift = 0
+	v = 0
+	while True:
+		b = data[offset]
+		offset += 1
+		v |= (b & 0x7F) << shift
+		if b < 0x80:
+			break
+		shift += 7
+	return (v >> 1) ^ -(v & 1), offset
+
+
+def _encode_section(buf: bytearray, current: List[Record], baseline: List[Record], fields: int) -> None:
+	zero = (0,) * fields
+	write_varint(buf, len(current))
+	changed: List[int] = [i for i, rec in enumerate(current) if rec != (baseline[i] if i < len(baseline) else zero)]
+	write_varint(buf, len(changed))
+	prev = -1
+	for i in changed:
+		rec = current[i]
+		base = baseline[i] if i < len(baseline) else zero
+		write_varint(buf, i - prev - 1)
+		prev = i
+		mask = 0
+		for f in range(fields):
+			if rec[f] != base[f]:
+				mask |= 1 << f
+		buf.append(mask)
+		for f in range(fields):
+			if mask & (1 << f):
+				write_varint(buf, rec[f] - base[f])
+
+
+def _decode_section(data: bytes, offset: int, baseline: List[Record], fields: int) -> Tuple[List[Record], int]:
+	zero = (0,) * fields
+	count, offset = read_varint(data, offset)
+	result = [baseline[i] if i < len(baseline) else zero for i in range(count)]
+	changed, offset = read_varint(data, offset)
+	idx = -1
+	for _ in range(changed):
+		skip, offset = read_varint(data, offset)
+		idx += skip + 1
+		mask = data[offset]
+		offset += 1
+		rec = list(result[idx])
+		for f in range(fields):
+			if mask & (1 << f):
+				d, offset = read_varint(data, offset)
+				rec[f] += d
+		result[idx] = tuple(rec)
+	return result, offset
+
+
+EMPTY_STATE: WorldState = ([], [], [])
+
+
+def encode_snapshot(tick: int, baseline_tick: int, current: WorldState, baseline: WorldState) -> bytes:
+	"""Encodes `current` as a field-level delta against `baseline` (EMPTY_STATE for a full snapshot)."""
+	buf = bytearray(SNAPSHOT_HEADER_FMT.pack(MSG_SNAPSHOT, tick, baseline_tick))
+	_encode_section(buf, current[0], baseline[0], PLAYER_FIELDS)
+	_encode_section(buf, current[1], baseline[1], ENEMY_FIELDS)
+	_encode_section(buf, current[2], baseline[2], PROJECTILE_FIELDS)
+	return bytes(buf)
+
+
+def decode_snapshot(data: bytes, get_baseline: Callable[[int], Optional[WorldState]]) -> Optional[Tuple[int, WorldState]]:
+	"""Returns (tick, state) or None when the referenced baseline is no longer known."""
+	_, tick, baseline_tick = SNAPSHOT_HEADER_FMT.unpack_from(data, 0)
+	if baseline_tick < 0:
+		baseline = EMPTY_STATE
+	else:
+		baseline = get_baseline(baseline_tick)
+		if baseline is None:
+			return None
+	offset = SNAPSHOT_HEADER_FMT.size
+	players, offset = _decode_section(data, offset, baseline[0], PLAYER_FIELDS)
+	enemies, offset = _decode_section(data, offset, baseline[1], ENEMY_FIELDS)
+	projectiles, offset = _decode_section(data, offset, baseline[2], PROJECTILE_FIELDS)
+	return tick, (players, enemies, projectiles)
\ No newline at end of file
@@ -0,0 +1,225 @@
+from __future__ import annotations
+import functools
+import socket
+import time
+from typing import Dict, List, Optional, Tuple
+
+import pygame
+
+from game.core.camera import Camera
+from game.core.time_step import FixedTimeStep
+from game.world.crowd import CrowdSeparation
+from game.world.enemy import Enemy
+from game.world.particles import ParticleSystem
+from game.world.player import Player
+from game.world.projectiles import ProjectilePool
+from game.world.tilemap import TileMap
+from . import protocol
+
+Address = Tuple[str, int]
+
+
+class RemoteInput:
+	"""Stands in for InputManager on the server, fed from client input commands."""
+
+	def __init__(self):
+		self._move_axis: Tuple[float, float] = (0.0, 0.0)
+		self._mouse_pos: Tuple[int, int] = (0, 0)
+		self._buttons = 0
+
+	def apply(self, move_x: int, move_y: int, buttons: int, mouse_x: int, mouse_y: int) -> None:
+		self._move_axis = (move_x / protocol.AXIS_SCALE, move_y / protocol.AXIS_SCALE)
+		self._buttons = buttons
+		self._mouse_pos = (mouse_x, mouse_y)
+
+	def get_move_vector(self) -> Tuple[float, float]:
+		return self._move_axis
+
+	def is_action_held(self, action: str) -> bool:
+		return action == "fire" and bool(self._buttons & protocol.BUTTON_FIRE)
+
+	def get_mouse_screen(self) -> Tuple[int, int]:
+		return self._mouse_pos
+
+
+class ClientSlot:
+	def __init__(self, slot: int, address: Address, player: Player, camera: Camera, remote_input: RemoteInput):
+		self.slot = slot
+		self.address = address
+		self.player = player
+		self.camera = camera
+		self.input = remote_input
+		self.last_input_seq = -1
+		self.acked_tick = -1
+		self.last_heard = time.perf_counter()
+		self.bytes_sent = 0
+		self.packets_sent = 0
+
+
+class GameServer:
+	"""Server-authoritative simulation that replicates delta-compressed snapshots over UDP."""
+
+	HISTORY_TICKS = 64
+	CLIENT_TIMEOUT = 5.0
+
+	def __init__(self, host: str = "127.0.0.1", port: int = protocol.DEFAULT_PORT, tiles_w: int = 160, tiles_h: int = 160, tile_size: int = 32, max_clients: int = 8, enemy_spawns: List[Tuple[float, float]] | None = None, max_projectiles: int = 256):
+		self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+		self.sock.bind((host, port))
+		self.sock.setblocking(False)
+		self.address: Address = self.sock.getsockname()
+
+		self.tile_map = TileMap(tiles_w, tiles_h, tile_size)
+		self.projectiles = ProjectilePool(max_projectiles=max_projectiles)
+		self.particles = ParticleSystem(max_particles=512)
+		self.max_clients = max_clients
+		self.slots: List[Optional[ClientSlot]] = [None] * max_clients
+		self.clients: Dict[Address, ClientSlot] = {}
+		if enemy_spawns is None:
+			enemy_spawns = [(tile_size * 50, tile_size * 40), (tile_size * 80, tile_size * 75)]
+		self.enemies: List[Enemy] = []
+		for pos in enemy_spawns:
+			enemy = Enemy(spawn_pos=pos, tile_map=self.tile_map, target_getter=None, projectiles=self.projectiles, particles=self.particles)
+			enemy.get_target = functools.partial(self._nearest_player, enemy)
+			self.enemies.append(enemy)
+		self.crowd = CrowdSeparation(self.enemies, self.tile_map)
+
+		self.tick_count = 0
+		self._history: Dict[int, protocol.WorldState] = {}
+		self.time_step = FixedTimeStep(target_fps=60)
+		self.last_tick_ms = 0.0
+
+	def _nearest_player(self, enemy: Enemy) -> Optional[Player]:
+		best = None
+		best_d = 0.0
+		for slot in self.clients.values():
+			if slot.player.is_dead:
+				continue
+			d = slot.player.position.distance_squared_to(enemy.position)
+			if best is None or d < best_d:
+				best = slot.player
+				best_d = d
+		return best
+
+	def _spawn_point(self, slot: int) -> Tuple[float, float]:
+		ts = self.tile_map.tile_size
+		return (ts * (4 + slot * 2), ts * 4)
+
+	def poll(self) -> None:
+		while True:
+			try:
+				data, addr = self.sock.recvfrom(2048)
+			except (BlockingIOError, InterruptedError):
+				return
+			except ConnectionResetError:
+				continue
+			if not data:
+				continue
+			kind = data[0]
+			if kind == protocol.MSG_CONNECT and len(data) >= protocol.CONNECT_FMT.size:
+				self._handle_connect(data, addr)
+			elif kind == protocol.MSG_INPUT and len(data) >= protocol.INPUT_FMT.size:
+				slot = self.clients.get(addr)
+				if slot is None:
+					continue
+				_, seq, ack, mx, my, buttons, mouse_x, mouse_y = protocol.INPUT_FMT.unpack_from(data, 0)
+				slot.last_heard = time.perf_counter()
+				if ack > slot.acked_tick:
+					slot.acked_tick = ack
+				# Drop reordered/duplicate commands
+				if seq > slot.last_input_seq:
+					slot.last_input_seq = seq
+					slot.input.apply(mx, my, buttons, mouse_x, mouse_y)
+			elif kind == protocol.MSG_DISCONNECT:
+				self._drop(addr)
+
+	def _handle_connect(self, data: bytes, addr: Address) -> None:
+		_, view_w, view_h = protocol.CONNECT_FMT.unpack_from(data, 0)
+		slot = self.clients.get(addr)
+		if slot is None:
+			free = next((i for i, s in enumerate(self.slots) if s is None), None)
+			if free is None:
+				self.sock.sendto(bytes([protocol.MSG_REJECT]), addr)
+				return
+			remote_input = RemoteInput()
+			player = Player(spawn_pos=self._spawn_point(free), input_manager=remote_input, projectiles=self.projectiles, particles=self.particles, tile_map=self.tile_map)
+			camera = Camera(view_width=view_w, view_height=view_h, world_width=self.tile_map.pixel_width, world_height=self.tile_map.pixel_height)
+			slot = ClientSlot(free, addr, player, camera, remote_input)
+			self.slots[free] = slot
+			self.clients[addr] = slot
+		else:
+			slot.camera.resize_view(view_w, view_h)
+		# Re-sent on every connect so a lost welcome is recovered by the client retrying
+		self.sock.sendto(protocol.WELCOME_FMT.pack(protocol.MSG_WELCOME, slot.slot, self.tile_map.tiles_w, self.tile_map.tiles_h, self.tile_map.tile_size), addr)
+
+	def _drop(self, addr: Address) -> None:
+		slot = self.clients.pop(addr, None)
+		if slot is not None:
+			self.slots[slot.slot] = None
+
+	def step(self) -> None:
+		players = [s.player for s in self.clients.values()]
+		for slot in self.clients.values():
+			slot.player.update(slot.camera)
+		if any(not pl.is_dead for pl in players):
+			self.crowd.update()
+			for enemy in self.enemies:
+				if enemy.health > 0:
+					enemy.update()
+		self.projectiles.update(tile_map=self.tile_map, player=None, enemies=self.enemies, players=players)
+		self.particles.update()
+		for slot in self.clients.values():
+			slot.camera.update_follow(slot.player.position)
+		self.tick_count += 1
+
+	def broadcast(self) -> None:
+		state = protocol.quantize_world([s.player if s is not None else None for s in self.slots], self.enemies, self.projectiles)
+		self._history[self.tick_count] = state
+		self._history.pop(self.tick_count - self.HISTORY_TICKS, None)
+		# Clients acking the same tick share one encoded payload
+		encoded: Dict[int, bytes] = {}
+		for slot in self.clients.values():
+			baseline_tick = slot.acked_tick if slot.acked_tick in self._history else -1
+			payload = encoded.get(baseline_tick)
+			if payload is None:
+				baseline = self._history[baseline_tick] if baseline_tick >= 0 else protocol.EMPTY_STATE
+				payload = protocol.encode_snapshot(self.tick_count, baseline_tick, state, baseline)
+				encoded[baseline_tick] = payload
+			try:
+				self.sock.sendto(payload, slot.address)
+			except OSError:
+				continue
+			slot.bytes_sent += len(payload)
+			slot.packets_sent += 1
+
+	def tick(self) -> None:
+		start = time.perf_counter()
+		self.poll()
+		now = time.perf_counter()
+		for addr in [a for a, s in self.clients.items() if now - s.last_heard > self.CLIENT_TIMEOUT]:
+			self._drop(addr)
+		self.step()
+		self.broadcast()
+		self.last_tick_ms = (time.perf_counter() - start) * 1000.0
+
+	def serve_forever(self) -> None:
+		try:
+			while True:
+				for _ in self.time_step.step():
+					self.tick()
+				time.sleep(0.001)
+		finally:
+			self.close()
+
+	def close(self) -> None:
+		self.sock.close()
+
+
+def run_server(host: str = "0.0.0.0", port: int = protocol.DEFAULT_PORT) -> None:
+	pygame.init()
+	server = GameServer(host=host, port=port)
+	print(f"Server listening on {server.address[0]}:{server.address[1]}")
+	server.serve_forever()
+
+
+if __name__ == "__main__":
+	run_server()
\ No newline at end of file
@@ -18,9 +18,11 @@ class SaveManager:
 				"hp": player.health,
 			},
 			"enemies": [
-				{"pos": [e.position.x, e.position.y], "hp": e.health}
-				for e in enemies
+				{"handle": list(e.handle), "pos": [e.position.x, e.position.y], "hp": e.health, "state": e.state}
+				for e in enemies.active
 			],
+			# Only tiles that differ from the generated map
+			"tiles": [[tx, ty, tile_map.collision[ty][tx]] for tx, ty in tile_map.modified],
 			"config": config.settings,
 		}
 
@@ -28,12 +30,17 @@ class SaveManager:
 		p = data.get("player", {})
 		player.position.xy = p.get("pos", [player.position.x, player.position.y])
 		player.health = float(p.get("hp", player.health))
-		ens: List[dict] = data.get("enemies", [])
-		for i, e in enumerate(enemies):
-			if i < len(ens):
-				info = ens[i]
-				e.position.xy = info.get("pos", [e.position.x, e.position.y])
-				e.health = float(info.get("hp", e.health))
+		ens: List[dict] = [info for info in data.get("enemies", []) if float(info.get("hp", 1.0)) > 0.0]
+		# Saves without handles (older format) get consecutive registry slots
+		restored = enemies.restore(info.get("handle", (i, 0)) for i, info in enumerate(ens))
+		for e, info in zip(restored, ens):
+			e.reset(info.get("pos", [e.position.x, e.position.y]))
+			e.health = float(info.get("hp", e.health))
+			e.state = info.get("state", e.state)
+		for (tx, ty), original in list(tile_map.modified.items()):
+			tile_map.set_tile(tx, ty, original)
+		for tx, ty, solid in data.get("tiles", []):
+			tile_map.set_tile(int(tx), int(ty), bool(solid))
 		config.settings = data.get("config", config.settings)
 
 	def quick_save(self, player, enemies, tile_map, config) -> None:
@@ -48,5 +55,22 @@ class SaveManager:
 			data = json.load(f)
 		self._deserialize(data, player, enemies, tile_map, config)
 
+	def read_quick_save(self) -> dict | None:
+		"""The stored quick save as plain data, or None if there is none."""
+		if not os.path.exists(self.QUICK_PATH):
+			return None
+		with open(self.QUICK_PATH, "r", encoding="utf-8") as f:
+			return json.load(f)
+
+	def redirect_quick_save(self, path: str, data: dict | None) -> None:
+		"""Points quick save and load at `path`, holding `data` (or nothing); the saves in SAVE_DIR stay untouched."""
+		self.QUICK_PATH = path
+		if data is None:
+			if os.path.exists(path):
+				os.remove(path)
+			return
+		with open(path, "w", encoding="utf-8") as f:
+			json.dump(data, f, ensure_ascii=False)
+
 	def auto_save(self, player, enemies, tile_map, config) -> None:
 		self.quick_save(player, enemies, tile_map, config)
\ No newline at end of file
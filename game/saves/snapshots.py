@@ -0,0 +1,310 @@
+from __future__ import annotations
+import zlib
+from array import array
+from typing import List, Sequence, Tuple
+
+from game.world.entities import EntityRegistry
+
+
+_ENEMY_STATES = ("patrol", "chase")
+_OWNERS = ("player", "enemy")
+
+# Floats per record in the flat buffers
+PLAYER_STRIDE = 8
+ENEMY_STRIDE = 10
+PROJECTILE_STRIDE = 9
+PARTICLE_STRIDE = 9
+WAVE_STRIDE = 5
+
+
+def _zeros(count: int) -> array:
+	return array("d", [0.0]) * count
+
+
+class WorldSnapshot:
+	"""Preallocated flat storage for the full simulation state of one tick."""
+
+	__slots__ = ("tick", "valid", "player", "tile_changes", "enemy_count", "enemy_handles", "enemies", "enemy_states", "projectiles", "particles", "projectile_draws", "spawner_draws", "spawner_spawned", "wave_count", "waves")
+
+	def __init__(self, enemy_count: int, projectile_count: int, particle_count: int):
+		self.tick = -1
+		self.valid = False
+		self.player = _zeros(PLAYER_STRIDE)
+		# Tile changes made during this tick as (tx, ty, previous value); undone by rewind
+		self.tile_changes: Sequence[Tuple[int, int, bool]] = ()
+		self.enemy_count = 0
+		# Registry index and generation per live enemy
+		self.enemy_handles = array("q", bytes(8 * 2 * enemy_count))
+		self.enemies = _zeros(ENEMY_STRIDE * enemy_count)
+		self.enemy_states = array("B", bytes(enemy_count))
+		self.projectiles = _zeros(PROJECTILE_STRIDE * projectile_count)
+		self.particles = _zeros(PARTICLE_STRIDE * particle_count)
+		# Draw counters of the projectile spread and spawner streams (enemy ones are in `enemies`);
+		# the tile map's RNG is only used to generate it
+		self.projectile_draws = 0
+		self.spawner_draws = 0
+		self.spawner_spawned = 0
+		# Queued spawner waves as remaining count, center x/y and ring radii
+		self.wave_count = 0
+		self.waves = _zeros(WAVE_STRIDE * 4)
+
+	def reserve_waves(self, count: int) -> None:
+		have = len(self.waves) // WAVE_STRIDE
+		if count > have:
+			self.waves.extend(_zeros(WAVE_STRIDE * max(count - have, have)))
+
+	def reserve_enemies(self, count: int) -> None:
+		"""Grows the enemy buffers; they never shrink, so a slot reallocates only when the live count peaks."""
+		have = len(self.enemy_states)
+		if count <= have:
+			return
+		extra = max(count - have, have)
+		self.enemy_handles.extend(bytes(8 * 2 * extra))
+		self.enemies.extend(_zeros(ENEMY_STRIDE * extra))
+		self.enemy_states.extend(bytes(extra))
+
+
+class SnapshotRing:
+	"""Fixed-size ring of the last N ticks of world state for rewind and rollback.
+
+	All buffers are allocated up front; capture and restore only copy values in place. Enemies are
+	recorded with their registry handles, so restoring also brings back despawned enemies and drops
+	ones spawned since. Tile changes are journaled per tick and undone by rewind() (restore() alone
+	leaves the map as it is). With a `spawner`, its queued waves are restored too.
+	"""
+
+	def __init__(self, player, enemies: EntityRegistry, projectiles, particles, tile_map, capacity: int = 120, spawner=None):
+		self.player = player
+		self.enemies = enemies
+		self.projectiles = projectiles
+		self.particles = particles
+		self.tile_map = tile_map
+		self.spawner = spawner
+		self.capacity = max(1, int(capacity))
+		if tile_map.journal is None:
+			tile_map.journal = []
+		# Every slot is allocated up front, sized for the enemy pool; capture only grows a slot past a new peak
+		pool = max(enemies.capacity, len(enemies.active))
+		self._slots: List[WorldSnapshot] = [WorldSnapshot(pool, len(projectiles.projectiles), len(particles.particles)) for _ in range(self.capacity)]
+		self._head = -1
+		self._count = 0
+
+	def __len__(self) -> int:
+		return self._count
+
+	@property
+	def latest_tick(self) -> int:
+		if self._count == 0:
+			return -1
+		return self._slots[self._head].tick
+
+	def clear(self) -> None:
+		for slot in self._slots:
+			slot.valid = False
+		self._head = -1
+		self._count = 0
+
+	def capture(self, tick: int) -> None:
+		enemies = self.enemies.active
+		self._head = (self._head + 1) % self.capacity
+		if self._count < self.capacity:
+			self._count += 1
+		slot = self._slots[self._head]
+		slot.reserve_enemies(len(enemies))
+		slot.enemy_count = len(enemies)
+		slot.tick = tick
+		slot.valid = True
+		slot.tile_changes = self.tile_map.take_journal()
+
+		pl = self.player
+		buf = slot.player
+		buf[0] = pl.position.x
+		buf[1] = pl.position.y
+		buf[2] = pl.velocity.x
+		buf[3] = pl.velocity.y
+		buf[4] = pl.health
+		buf[5] = pl.armor
+		buf[6] = pl._fire_timer
+		buf[7] = 1.0 if pl.is_dead else 0.0
+
+		handles = slot.enemy_handles
+		buf = slot.enemies
+		o = 0
+		h = 0
+		for e in enemies:
+			handles[h] = e.handle.index
+			handles[h + 1] = e.handle.generation
+			h += 2
+			buf[o] = e.position.x
+			buf[o + 1] = e.position.y
+			buf[o + 2] = e.velocity.x
+			buf[o + 3] = e.velocity.y
+			buf[o + 4] = e.health
+			buf[o + 5] = e._timer
+			buf[o + 6] = e._fire_timer
+			buf[o + 7] = e.patrol_dir.x
+			buf[o + 8] = e.patrol_dir.y
+			buf[o + 9] = e.rng_draws
+			o += ENEMY_STRIDE
+
+		buf = slot.projectiles
+		o = 0
+		for p in self.projectiles.projectiles:
+			if not p.active:
+				buf[o] = 0.0
+			else:
+				buf[o] = 1.0
+				buf[o + 1] = p.position.x
+				buf[o + 2] = p.position.y
+				buf[o + 3] = p.velocity.x
+				buf[o + 4] = p.velocity.y
+				buf[o + 5] = p.ttl
+				buf[o + 6] = p.damage
+				buf[o + 7] = 1.0 if p.owner == "enemy" else 0.0
+				buf[o + 8] = p.knockback
+			o += PROJECTILE_STRIDE
+
+		buf = slot.particles
+		o = 0
+		for p in self.particles.particles:
+			if not p.active:
+				buf[o] = 0.0
+			else:
+				buf[o] = 1.0
+				buf[o + 1] = p.position.x
+				buf[o + 2] = p.position.y
+				buf[o + 3] = p.velocity.x
+				buf[o + 4] = p.velocity.y
+				buf[o + 5] = p.color[0]
+				buf[o + 6] = p.color[1]
+				buf[o + 7] = p.color[2]
+				buf[o + 8] = p.ttl
+			o += PARTICLE_STRIDE
+
+		slot.projectile_draws = self.projectiles.rng_draws
+		spawner = self.spawner
+		if spawner is not None:
+			slot.spawner_draws = spawner.rng_draws
+			slot.spawner_spawned = spawner.spawned
+			waves = spawner._waves
+			slot.wave_count = len(waves)
+			if waves:
+				slot.reserve_waves(len(waves))
+				buf = slot.waves
+				o = 0
+				for count, center, min_radius, max_radius in waves:
+					buf[o] = count
+					buf[o + 1] = center[0]
+					buf[o + 2] = center[1]
+					buf[o + 3] = min_radius
+					buf[o + 4] = max_radius
+					o += WAVE_STRIDE
+
+		states = slot.enemy_states
+		for i, e in enumerate(enemies):
+			states[i] = _ENEMY_STATES.index(e.state)
+
+	def checksum(self) -> int:
+		"""CRC32 over the latest captured tick's buffers, for comparing runs of the same input; 0 when empty."""
+		if self._count == 0:
+			return 0
+		slot = self._slots[self._head]
+		n = slot.enemy_count
+		crc = zlib.crc32(slot.player)
+		crc = zlib.crc32(memoryview(slot.enemy_handles)[:2 * n], crc)
+		crc = zlib.crc32(memoryview(slot.enemies)[:ENEMY_STRIDE * n], crc)
+		crc = zlib.crc32(memoryview(slot.enemy_states)[:n], crc)
+		crc = zlib.crc32(slot.projectiles, crc)
+		return zlib.crc32(slot.particles, crc)
+
+	def restore(self, ticks_back: int = 0) -> int:
+		"""Restores the state captured `ticks_back` ticks before the latest one. Returns its tick or -1."""
+		if ticks_back < 0 or ticks_back >= self._count:
+			return -1
+		slot = self._slots[(self._head - ticks_back) % self.capacity]
+		if not slot.valid:
+			return -1
+
+		pl = self.player
+		buf = slot.player
+		pl.position.update(buf[0], buf[1])
+		pl.velocity.update(buf[2], buf[3])
+		pl.health = buf[4]
+		pl.armor = buf[5]
+		pl._fire_timer = buf[6]
+		pl.is_dead = buf[7] != 0.0
+
+		handles = slot.enemy_handles
+		n = slot.enemy_count
+		enemies = self.enemies.restore(zip(handles[0:2 * n:2], handles[1:2 * n:2]))
+		buf = slot.enemies
+		o = 0
+		for e in enemies:
+			e.position.update(buf[o], buf[o + 1])
+			e.velocity.update(buf[o + 2], buf[o + 3])
+			e.health = buf[o + 4]
+			e._timer = buf[o + 5]
+			e._fire_timer = buf[o + 6]
+			e.patrol_dir.update(buf[o + 7], buf[o + 8])
+			e.rng_draws = int(buf[o + 9])
+			o += ENEMY_STRIDE
+
+		buf = slot.projectiles
+		o = 0
+		for p in self.projectiles.projectiles:
+			if buf[o] == 0.0:
+				p.active = False
+			else:
+				p.active = True
+				p.position.update(buf[o + 1], buf[o + 2])
+				p.velocity.update(buf[o + 3], buf[o + 4])
+				p.ttl = buf[o + 5]
+				p.damage = buf[o + 6]
+				p.owner = _OWNERS[int(buf[o + 7])]
+				p.knockback = buf[o + 8]
+			o += PROJECTILE_STRIDE
+
+		buf = slot.particles
+		o = 0
+		for p in self.particles.particles:
+			if buf[o] == 0.0:
+				p.active = False
+			else:
+				p.active = True
+				p.position.update(buf[o + 1], buf[o + 2])
+				p.velocity.update(buf[o + 3], buf[o + 4])
+				p.color = (int(buf[o + 5]), int(buf[o + 6]), int(buf[o + 7]))
+				p.ttl = buf[o + 8]
+			o += PARTICLE_STRIDE
+
+		self.projectiles.rng_draws = slot.projectile_draws
+		spawner = self.spawner
+		if spawner is not None:
+			spawner.rng_draws = slot.spawner_draws
+			spawner.spawned = slot.spawner_spawned
+			waves = spawner._waves
+			waves.clear()
+			buf = slot.waves
+			for o in range(0, WAVE_STRIDE * slot.wave_count, WAVE_STRIDE):
+				waves.append([int(buf[o]), (buf[o + 1], buf[o + 2]), buf[o + 3], buf[o + 4]])
+
+		states = slot.enemy_states
+		for i, e in enumerate(enemies):
+			e.state = _ENEMY_STATES[states[i]]
+		return slot.tick
+
+	def rewind(self, ticks: int = 1) -> int:
+		"""Restores an older tick and drops everything newer, so simulation can resume from it."""
+		tick = self.restore(ticks)
+		if tick < 0:
+			return -1
+		set_tile = self.tile_map.set_tile
+		for _ in range(ticks):
+			dropped = self._slots[self._head]
+			for tx, ty, old in reversed(dropped.tile_changes):
+				set_tile(tx, ty, old, record=False)
+			dropped.tile_changes = ()
+			dropped.valid = False
+			self._head = (self._head - 1) % self.capacity
+			self._count -= 1
+		return tick
\ No newline at end of file
@@ -0,0 +1,62 @@
+from __future__ import annotations
+import json
+import os
+from typing import Dict, Optional, Tuple
+
+import pygame
+
+
+class FontCache:
+	"""Resolves system font names once and remembers the file paths across runs.
+
+	`pygame.font.SysFont` scans every installed font on first use; with the resolved path cached on disk
+	later starts open the font file directly.
+	"""
+
+	CACHE_PATH = os.path.join(os.getcwd(), "config", "font_cache.json")
+
+	_paths: Optional[Dict[str, str]] = None
+	_fonts: Dict[Tuple[str, int], pygame.font.Font] = {}
+
+	@classmethod
+	def _load_paths(cls) -> Dict[str, str]:
+		if cls._paths is None:
+			cls._paths = {}
+			if os.path.exists(cls.CACHE_PATH):
+				try:
+					with open(cls.CACHE_PATH, "r", encoding="utf-8") as f:
+						data = json.load(f)
+					# Drop entries whose files were removed since the cache was written
+					cls._paths = {k: v for k, v in data.items() if v == "" or os.path.exists(v)}
+				except (OSError, ValueError):
+					cls._paths = {}
+		return cls._paths
+
+	@classmethod
+	def resolve_path(cls, name: str) -> Optional[str]:
+		paths = cls._load_paths()
+		if name not in paths:
+			# "" records that the system has no match, so the default font is used without rescanning
+			paths[name] = pygame.font.match_font(name) or ""
+			cls._save_paths()
+		return paths[name] or None
+
+	@classmethod
+	def _save_paths(cls) -> None:
+		try:
+			os.makedirs(os.path.dirname(cls.CACHE_PATH), exist_ok=True)
+			with open(cls.CACHE_PATH, "w", encoding="utf-8") as f:
+				json.dump(cls._paths, f, ensure_ascii=False, indent=2)
+		except OSError:
+			pass
+
+	@classmethod
+	def get(cls, name: str, size: int) -> pygame.font.Font:
+		key = (name, size)
+		font = cls._fonts.get(key)
+		if font is None:
+			if not pygame.font.get_init():
+				pygame.font.init()
+			font = pygame.font.Font(cls.resolve_path(name), size)
+			cls._fonts[key] = font
+		return font
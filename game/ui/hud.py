@@ -2,15 +2,23 @@ from __future__ import annotations
 import pygame
 
 from game.core.profiling import FrameProfiler
+from .fonts import FontCache
 
 
 class HUD:
 	def __init__(self, localization, config):
 		self.localization = localization
 		self.config = config
-		self.font = pygame.font.SysFont("DejaVu Sans", 18)
+		self.font = FontCache.get("DejaVu Sans", 18)
 
 	def draw(self, surface: pygame.Surface, player, enemies, projectiles, config, profiler: FrameProfiler) -> None:
-		text = f"HP: {int(player.health)} | Enemies: {sum(1 for e in enemies if e.health > 0)} | Proj: {sum(1 for p in projectiles.projectiles if p.active)} | FPS: {profiler.fps:.0f}"
+		self.draw_counts(surface, player.health, len(enemies), sum(1 for p in projectiles.projectiles if p.active), profiler)
+
+	def draw_counts(self, surface: pygame.Surface, health: float, enemy_count: int, projectile_count: int, profiler: FrameProfiler) -> None:
+		"""draw() from plain values, e.g. those of a render snapshot."""
+		text = f"HP: {int(health)} | Enemies: {enemy_count} | Proj: {projectile_count} | FPS: {profiler.fps:.0f}"
 		render = self.font.render(text, True, (235, 235, 245))
-		surface.blit(render, (8, 8))
\ No newline at end of file
+		surface.blit(render, (8, 8))
+		status = profiler.capture.status if profiler.capture is not None else ""
+		if status:
+			surface.blit(self.font.render(status, True, (240, 200, 90)), (8, 8 + render.get_height()))
\ No newline at end of file
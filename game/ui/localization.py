@@ -6,21 +6,22 @@ from typing import Dict
 
 class Localization:
 	LOCALES_DIR = os.path.join(os.getcwd(), "locales")
+	# Minimal Russian locale, used when the locale file is missing
+	DEFAULT_TABLE: Dict[str, str] = {
+		"paused": "Пауза",
+		"resume": "Продолжить",
+		"quit": "Выход",
+	}
 
 	@classmethod
 	def load(cls, preferred_language: str = "ru") -> "Localization":
 		path = os.path.join(cls.LOCALES_DIR, f"{preferred_language}.json")
-		if not os.path.exists(path):
-			os.makedirs(cls.LOCALES_DIR, exist_ok=True)
-			# Write minimal Russian locale
-			with open(path, "w", encoding="utf-8") as f:
-				json.dump({
-					"paused": "Пауза",
-					"resume": "Продолжить",
-					"quit": "Выход",
-				}, f, ensure_ascii=False, indent=2)
-		with open(path, "r", encoding="utf-8") as f:
-			data: Dict[str, str] = json.load(f)
+		try:
+			with open(path, "r", encoding="utf-8") as f:
+				data: Dict[str, str] = json.load(f)
+		except FileNotFoundError:
+			# Startup does not write files; the built-in table covers a missing locale
+			data = dict(cls.DEFAULT_TABLE)
 		return Localization(data)
 
 	def __init__(self, table: Dict[str, str]):
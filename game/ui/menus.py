@@ -1,6 +1,8 @@
 from __future__ import annotations
 import pygame
 
+from .fonts import FontCache
+
 
 class PauseMenu:
 	def __init__(self, localization, config, input_manager):
@@ -9,10 +11,17 @@ class PauseMenu:
 		self.input = input_manager
 		self.is_open = False
 		self.request_quit = False
-		self.font = pygame.font.SysFont("DejaVu Sans", 28)
+		self._font: pygame.font.Font | None = None
 		self._selected = 0
 		self._options = ["resume", "quit"]
 
+	@property
+	def font(self) -> pygame.font.Font:
+		# Loaded on first draw; most sessions never open the menu
+		if self._font is None:
+			self._font = FontCache.get("DejaVu Sans", 28)
+		return self._font
+
 	def toggle(self) -> None:
 		self.is_open = not self.is_open
 
@@ -0,0 +1,125 @@
+from __future__ import annotations
+import math
+from typing import Iterable, List, Tuple
+
+import pygame
+
+
+class Minimap:
+	"""Cached overview of a TileMap's collision grid.
+
+	The map is sampled into an 8-bit palettized surface at one pixel per `scale` x `scale` tiles, where
+	`scale` is chosen so neither side exceeds `max_pixels` (a mip level for very large maps). A pixel's
+	palette index is the share of wall tiles in its block, so thin walls stay visible when downsampled.
+	The pixel buffer is shared with the surface, so a tile change rewrites a single byte.
+	"""
+
+	FLOOR_COLOR = (28, 28, 34)
+	WALL_COLOR = (150, 150, 170)
+
+	def __init__(self, tile_map, max_pixels: int = 256, display_size: int = 180, margin: int = 8):
+		self.tile_map = tile_map
+		self.scale = min(255, max(1, math.ceil(max(tile_map.tiles_w, tile_map.tiles_h) / max_pixels)))
+		self.width = math.ceil(tile_map.tiles_w / self.scale)
+		self.height = math.ceil(tile_map.tiles_h / self.scale)
+		self.display_size = display_size
+		self.margin = margin
+
+		self._pixels = bytearray(self.width * self.height)
+		self._build()
+		self._surface = pygame.image.frombuffer(self._pixels, (self.width, self.height), "P")
+		self._surface.set_palette(self._palette())
+		fit = display_size / max(self.width, self.height)
+		self._display_dims = (max(1, int(self.width * fit)), max(1, int(self.height * fit)))
+		self._scaled: pygame.Surface | None = None
+
+	def _palette(self) -> List[Tuple[int, int, int]]:
+		fr, fg, fb = self.FLOOR_COLOR
+		wr, wg, wb = self.WALL_COLOR
+		return [(fr + (wr - fr) * i // 255, fg + (wg - fg) * i // 255, fb + (wb - fb) * i // 255) for i in range(256)]
+
+	def _build(self) -> None:
+		tm = self.tile_map
+		k = self.scale
+		w = self.width
+		pixels = self._pixels
+		if k == 1:
+			# bytes(row of bools) gives 0/1 per tile; translate maps it to palette indices in C
+			table = bytes([0, 255]) + bytes(254)
+			for ty in range(tm.tiles_h):
+				pixels[ty * w:(ty + 1) * w] = bytes(tm.collision[ty]).translate(table)
+			return
+		tiles_w = tm.tiles_w
+		area = k * k
+		for py in range(self.height):
+			# Rows of 0/1 bytes read as big integers add column-wise without carries (k < 256),
+			# which sums a band of k rows in a handful of C-level operations
+			acc = 0
+			for ty in range(py * k, min(tm.tiles_h, (py + 1) * k)):
+				acc += int.from_bytes(bytes(tm.collision[ty]), "big")
+			columns = acc.to_bytes(tiles_w, "big")
+			base = py * w
+			for px in range(w):
+				pixels[base + px] = sum(columns[px * k:(px + 1) * k]) * 255 // area
+
+	def update_tile(self, tx: int, ty: int) -> None:
+		"""Refreshes the pixel covering tile (tx, ty) after it changed."""
+		tm = self.tile_map
+		k = self.scale
+		px = tx // k
+		py = ty // k
+		if k == 1:
+			value = 255 if tm.collision[ty][tx] else 0
+		else:
+			count = 0
+			for yy in range(py * k, min(tm.tiles_h, (py + 1) * k)):
+				row = tm.collision[yy]
+				for xx in range(px * k, min(tm.tiles_w, (px + 1) * k)):
+					if row[xx]:
+						count += 1
+			value = count * 255 // (k * k)
+		i = py * self.width + px
+		if self._pixels[i] != value:
+			self._pixels[i] = value
+			self._scaled = None
+
+	def update_tiles(self, tiles: Iterable[Tuple[int, int]]) -> None:
+		for tx, ty in tiles:
+			self.update_tile(tx, ty)
+
+	def draw(self, surface: pygame.Surface, player, enemies, camera) -> None:
+		ox, oy, fx, fy = self._draw_map(surface, camera)
+		enemy_color = (200, 80, 80)
+		for e in enemies:
+			if e.health > 0:
+				surface.fill(enemy_color, (ox + int(e.position.x * fx) - 1, oy + int(e.position.y * fy) - 1, 2, 2))
+		surface.fill((80, 200, 120), (ox + int(player.position.x * fx) - 2, oy + int(player.position.y * fy) - 2, 4, 4))
+
+	def draw_points(self, surface: pygame.Surface, player_pos: Tuple[float, float], enemy_records: Iterable[Tuple[float, ...]], camera) -> None:
+		"""draw() from positions, e.g. a render snapshot's; each enemy record starts with x, y."""
+		ox, oy, fx, fy = self._draw_map(surface, camera)
+		enemy_color = (200, 80, 80)
+		for rec in enemy_records:
+			surface.fill(enemy_color, (ox + int(rec[0] * fx) - 1, oy + int(rec[1] * fy) - 1, 2, 2))
+		surface.fill((80, 200, 120), (ox + int(player_pos[0] * fx) - 2, oy + int(player_pos[1] * fy) - 2, 4, 4))
+
+	def _draw_map(self, surface: pygame.Surface, camera) -> Tuple[int, int, float, float]:
+		"""Blits the map and the camera frame; returns the map's origin and world-to-map scale."""
+		if self._scaled is None:
+			self._scaled = pygame.transform.scale(self._surface, self._display_dims)
+		dw, dh = self._display_dims
+		ox = surface.get_width() - dw - self.margin
+		oy = self.margin
+		surface.blit(self._scaled, (ox, oy))
+
+		tm = self.tile_map
+		fx = dw / tm.pixel_width
+		fy = dh / tm.pixel_height
+		view = pygame.Rect(
+			ox + int((camera.position_x - camera.view_width * 0.5) * fx),
+			oy + int((camera.position_y - camera.view_height * 0.5) * fy),
+			max(1, int(camera.view_width * fx)),
+			max(1, int(camera.view_height * fy)),
+		)
+		pygame.draw.rect(surface, (90, 90, 110), view, width=1)
+		return ox, oy, fx, fy
\ No newline at end of file
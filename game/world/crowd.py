@@ -0,0 +1,201 @@
+from __future__ import annotations
+import math
+from array import array
+from typing import List, Sequence
+
+from .enemy import Enemy
+from .tilemap import TileMap
+
+
+class CrowdSeparation:
+	"""Separation steering that keeps enemies from piling into one blob, backed by an occupancy grid.
+
+	update() buckets every live enemy by the tile its center is in, then gives each moving enemy a push
+	away from the enemies closer than `radius`, looking only at the 3x3 tiles around its own; Enemy._move
+	adds the push to its steering. With `radius` at most a tile, those tiles hold every neighbour in
+	range, so a tick costs O(n) instead of O(n^2) pair tests.
+
+	The grid is one linked list per tile in flat arrays: `_head` holds each tile's first slot, `_next`
+	the following one. A rebuild only clears the tiles filled last tick and allocates nothing unless
+	the enemy count grows past every earlier tick.
+	"""
+
+	def __init__(self, enemies: List[Enemy], tile_map: TileMap, radius: float = 26.0, strength: float = 2.0, give_way: float = 3.0):
+		self.enemies = enemies
+		self.tile_map = tile_map
+		self.radius = min(radius, float(tile_map.tile_size))
+		self.strength = strength
+		self.give_way = give_way
+		self._head = array("i", [-1]) * (tile_map.tiles_w * tile_map.tiles_h)
+		# Per slot (index in `enemies` at the last update): next slot in the same tile, tile, position, push
+		self._next = array("i")
+		self._cell = array("i")
+		self._x = array("d")
+		self._y = array("d")
+		self._push_x = array("d")
+		self._push_y = array("d")
+		self._crowding = array("d")
+		self._used = 0
+		# Tiles holding at least one enemy, in the order they were first filled
+		self._occupied = array("i")
+		self._occupied_count = 0
+		self._firsts = array("i", [-1]) * 4
+
+	def _reserve(self, count: int) -> None:
+		grow = count - len(self._next)
+		if grow > 0:
+			self._next.extend([-1] * grow)
+			self._cell.extend([-1] * grow)
+			self._x.extend([0.0] * grow)
+			self._y.extend([0.0] * grow)
+			self._push_x.extend([0.0] * grow)
+			self._push_y.extend([0.0] * grow)
+			self._crowding.extend([0.0] * grow)
+			self._occupied.extend([-1] * grow)
+
+	def rebuild(self) -> None:
+		"""Rebuckets every live enemy at its current position."""
+		enemies = self.enemies
+		self._reserve(len(enemies))
+		head = self._head
+		nxt = self._next
+		cell_of = self._cell
+		xs = self._x
+		ys = self._y
+		occupied = self._occupied
+		for i in range(self._occupied_count):
+			head[occupied[i]] = -1
+		ts = self.tile_map.tile_size
+		max_tx = self.tile_map.tiles_w - 1
+		max_ty = self.tile_map.tiles_h - 1
+		w = max_tx + 1
+		k = 0
+		filled = 0
+		for e in enemies:
+			e.crowd_slot = k
+			if e.health <= 0.0:
+				cell_of[k] = -1
+			else:
+				# Unpacking the Vector2 would allocate an iterator per enemy
+				p = e.position
+				x = p.x
+				y = p.y
+				xs[k] = x
+				ys[k] = y
+				tx = int(x) // ts
+				ty = int(y) // ts
+				if tx < 0:
+					tx = 0
+				elif tx > max_tx:
+					tx = max_tx
+				if ty < 0:
+					ty = 0
+				elif ty > max_ty:
+					ty = max_ty
+				c = ty * w + tx
+				cell_of[k] = c
+				first = head[c]
+				if first < 0:
+					occupied[filled] = c
+					filled += 1
+				nxt[k] = first
+				head[c] = k
+			k += 1
+		self._used = k
+		self._occupied_count = filled
+
+	def update(self, movers: Sequence[Enemy] | None = None) -> None:
+		"""Rebuilds the grid and sets separation_x/y of every enemy in `movers` (default: all of them)."""
+		self.rebuild()
+		head = self._head
+		nxt = self._next
+		xs = self._x
+		ys = self._y
+		push_x = self._push_x
+		push_y = self._push_y
+		crowding = self._crowding
+		used = self._used
+		for k in range(used):
+			push_x[k] = 0.0
+			push_y[k] = 0.0
+			crowding[k] = 0.0
+		w = self.tile_map.tiles_w
+		h = self.tile_map.tiles_h
+		r = self.radius
+		r2 = r * r
+		inv_r = 1.0 / r
+		sqrt = math.sqrt
+		# Each pair is visited once, from the earlier of its two tiles: an enemy is tested against the
+		# rest of its own tile, the tile to the east and the three tiles below, and both get the push
+		occupied = self._occupied
+		firsts = self._firsts
+		size = w * h
+		for o in range(self._occupied_count):
+			c = occupied[o]
+			tx = c % w
+			# First slots of the non-empty tiles paired with this one
+			n = 0
+			if tx + 1 < w and head[c + 1] >= 0:
+				firsts[0] = head[c + 1]
+				n = 1
+			if c + w < size:
+				for nc in range(c + w - 1 if tx > 0 else c + w, c + w + 2 if tx + 1 < w else c + w + 1):
+					j = head[nc]
+					if j >= 0:
+						firsts[n] = j
+						n += 1
+			i = head[c]
+			while i >= 0:
+				x = xs[i]
+				y = ys[i]
+				pxi = 0.0
+				pyi = 0.0
+				ci = 0.0
+				j = nxt[i]
+				m = 0
+				while True:
+					while j >= 0:
+						dx = x - xs[j]
+						dy = y - ys[j]
+						d2 = dx * dx + dy * dy
+						if d2 < r2:
+							if d2 > 1e-6:
+								d = sqrt(d2)
+								f = (r - d) / (d * d)
+								dx *= f
+								dy *= f
+								closeness = 1.0 - d * inv_r
+							else:
+								# Exactly on top of each other: split them apart along x by slot order
+								dx = -1.0 if i < j else 1.0
+								dy = 0.0
+								closeness = 1.0
+							pxi += dx
+							pyi += dy
+							ci += closeness
+							push_x[j] -= dx
+							push_y[j] -= dy
+							crowding[j] += closeness
+						j = nxt[j]
+					if m == n:
+						break
+					j = firsts[m]
+					m += 1
+				push_x[i] += pxi
+				push_y[i] += pyi
+				crowding[i] += ci
+				i = nxt[i]
+
+		scale = self.strength
+		give_way = self.give_way
+		cell_of = self._cell
+		for e in (self.enemies if movers is None else movers):
+			k = e.crowd_slot
+			if 0 <= k < used and cell_of[k] >= 0:
+				e.separation_x = push_x[k] * scale
+				e.separation_y = push_y[k] * scale
+				e.crowding = crowding[k] * give_way
+			else:
+				e.separation_x = 0.0
+				e.separation_y = 0.0
+				e.crowding = 0.0
@@ -1,15 +1,16 @@
 from __future__ import annotations
+import math
 import pygame
-import random
 from typing import Callable, Tuple
 
 from .tilemap import TileMap
 from .projectiles import ProjectilePool
 from .particles import ParticleSystem
+from .rng import stream_value
 
 
 class Enemy:
-	def __init__(self, spawn_pos: Tuple[float, float], tile_map: TileMap, target_getter: Callable[[], object], projectiles: ProjectilePool, particles: ParticleSystem):
+	def __init__(self, spawn_pos: Tuple[float, float], tile_map: TileMap, target_getter: Callable[[], object], projectiles: ProjectilePool, particles: ParticleSystem, rng_seed: int = 42):
 		self.position = pygame.Vector2(spawn_pos)
 		self.velocity = pygame.Vector2(0, 0)
 		self.size = pygame.Vector2(24, 24)
@@ -19,70 +20,150 @@ class Enemy:
 		self.particles = particles
 		self.state = "patrol"
 		self.health = 50.0
-		self._rng = random.Random(42)
+		# Random stream indexed by a draw counter, so seed and counter are its whole state: snapshots
+		# store one number, and resetting the counter on spawn makes a pooled enemy behave the same
+		# whichever slot it reuses
+		self.rng_seed = rng_seed
+		self.rng_draws = 0
 		self._timer = 0.0
 		self._fire_timer = 0.0
 		self.patrol_dir = pygame.Vector2(1, 0)
 		self.max_speed = 160.0
+		# Push away from nearby enemies, set each tick by CrowdSeparation; crowd_slot is its index there
+		self.separation_x = 0.0
+		self.separation_y = 0.0
+		self.crowding = 0.0
+		self.crowd_slot = -1
+		# Called with the enemy after it takes damage (used to wake it up or drop it from update sets)
+		self.on_damaged: Callable[["Enemy"], None] | None = None
+		# Called once when health drops to zero (used to despawn it from the registry)
+		self.on_death: Callable[["Enemy"], None] | None = None
+		self.handle = None
+		self._rect = pygame.Rect(0, 0, int(self.size.x), int(self.size.y))
+
+	def reset(self, spawn_pos: Tuple[float, float]) -> None:
+		"""Reinitializes a pooled enemy in place for a new spawn."""
+		self.position.update(spawn_pos)
+		self.velocity.update(0, 0)
+		self.state = "patrol"
+		self.health = 50.0
+		self.rng_draws = 0
+		self._timer = 0.0
+		self._fire_timer = 0.0
+		self.patrol_dir.update(1, 0)
+		self.separation_x = 0.0
+		self.separation_y = 0.0
+		self.crowding = 0.0
+
+	def _uniform(self, a: float, b: float) -> float:
+		value = stream_value(self.rng_seed, self.rng_draws)
+		self.rng_draws += 1
+		return a + (b - a) * value
 
 	@property
 	def rect(self) -> pygame.Rect:
-		return pygame.Rect(int(self.position.x - self.size.x * 0.5), int(self.position.y - self.size.y * 0.5), int(self.size.x), int(self.size.y))
+		"""Bounds at the current position. One Rect refreshed in place on every access; copy it to keep it."""
+		r = self._rect
+		r.x = int(self.position.x - self.size.x * 0.5)
+		r.y = int(self.position.y - self.size.y * 0.5)
+		return r
 
 	def update(self) -> None:
-		dt = 1.0 / 60.0
-		self._timer += dt
-		self._fire_timer -= dt
-		target = self.get_target()
-		target_pos = pygame.Vector2(target.position.x, target.position.y)
+		# A tick where think() switches state only advances timers, as before the AI/movement split
+		self.step(move=not self.think())
 
-		dist = (target_pos - self.position).length()
-		los = not self.tile_map.raycast_block(self.position.xy, target_pos.xy)
+	def think(self) -> bool:
+		"""Line-of-sight check and state transitions. Returns True if the state changed.
 
+		This is the expensive part of the AI and may run at a lower rate than step().
+		"""
+		target = self.get_target()
+		dist = self.position.distance_to(target.position)
+		los = not self.tile_map.raycast_block(self.position, target.position)
 		if self.state == "patrol":
 			if dist < 280 and los:
 				self.state = "chase"
-			else:
-				if self._timer > 2.0:
-					self._timer = 0.0
-					angle = self._rng.uniform(0, 6.283)
-					self.patrol_dir = pygame.Vector2(pygame.math.Vector2(1, 0).rotate_rad(angle))
-				self._move(self.patrol_dir, dt)
+				return True
 		elif self.state == "chase":
 			if dist > 420 or not los:
 				self.state = "patrol"
-			else:
-				direction = (target_pos - self.position)
-				if direction.length_squared() > 1e-6:
-					direction = direction.normalize()
-				self._move(direction, dt)
-				if dist < 260 and self._fire_timer <= 0.0:
-					self.projectiles.spawn(self.position.xy, (target_pos - self.position).normalize().xy, speed=400.0, ttl=1.5, damage=8.0, owner="enemy", spread_deg=6.0, knockback=80.0)
-					self._fire_timer = 0.9
+				return True
+		return False
 
-	def _move(self, direction: pygame.Vector2, dt: float) -> None:
-		desired = direction * self.max_speed
-		self.velocity = self._approach(self.velocity, desired, 1600 * dt)
-		dx = self.velocity.x * dt
-		dy = self.velocity.y * dt
-		_, _, new_rect = self.tile_map.resolve_movement(self.rect, dx, dy)
-		self.position.update(new_rect.centerx, new_rect.centery)
+	def step(self, move: bool = True, dt: float = 1.0 / 60.0) -> None:
+		self._timer += dt
+		self._fire_timer -= dt
+		if not move:
+			return
+		# Steering works on plain floats and in-place updates, so a tick allocates no vectors or rects
+		target = self.get_target()
+		target_x = target.position.x
+		target_y = target.position.y
+
+		if self.state == "patrol":
+			if self._timer > 2.0:
+				self._timer = 0.0
+				angle = self._uniform(0, 6.283)
+				self.patrol_dir.update(math.cos(angle), math.sin(angle))
+			self._move(self.patrol_dir.x, self.patrol_dir.y, dt)
+		elif self.state == "chase":
+			dir_x = target_x - self.position.x
+			dir_y = target_y - self.position.y
+			dist = math.hypot(dir_x, dir_y)
+			if dist * dist > 1e-6:
+				dir_x /= dist
+				dir_y /= dist
+			self._move(dir_x, dir_y, dt)
+			aim_x = target_x - self.position.x
+			aim_y = target_y - self.position.y
+			aim_length2 = aim_x * aim_x + aim_y * aim_y
+			if dist < 260 and self._fire_timer <= 0.0 and aim_length2 > 1e-6:
+				aim_length = math.sqrt(aim_length2)
+				self.projectiles.spawn((self.position.x, self.position.y), (aim_x / aim_length, aim_y / aim_length), speed=400.0, ttl=1.5, damage=8.0, owner="enemy", spread_deg=6.0, knockback=80.0)
+				self._fire_timer = 0.9
+
+	def _move(self, dir_x: float, dir_y: float, dt: float) -> None:
+		if self.crowding > 0.0:
+			ease = 1.0 / (1.0 + self.crowding)
+			dir_x = dir_x * ease + self.separation_x
+			dir_y = dir_y * ease + self.separation_y
+			length2 = dir_x * dir_x + dir_y * dir_y
+			if length2 > 1.0:
+				length = math.sqrt(length2)
+				dir_x /= length
+				dir_y /= length
+		self._approach_velocity(dir_x * self.max_speed, dir_y * self.max_speed, 1600 * dt)
+		rect = self.rect
+		self.tile_map.resolve_movement_ip(rect, self.velocity.x * dt, self.velocity.y * dt)
+		self.position.update(rect.centerx, rect.centery)
 
 	def draw(self, surface: pygame.Surface, camera) -> None:
+		if self.health <= 0.0:
+			return
 		sx, sy = camera.world_to_screen(self.position.xy)
-		rect = pygame.Rect(0, 0, int(self.size.x), int(self.size.y))
+		rect = pygame.Rect(0, 0, camera.to_screen_length(self.size.x), camera.to_screen_length(self.size.y))
 		rect.center = (sx, sy)
 		pygame.draw.rect(surface, (200, 80, 80), rect, border_radius=4)
 
 	def take_damage(self, amount: float) -> None:
+		was_alive = self.health > 0.0
 		self.health -= amount
 		if self.health <= 0.0:
 			# simple death effect placeholder
 			self.position.xy = (-1000, -1000)
+		if self.on_damaged is not None:
+			self.on_damaged(self)
+		if was_alive and self.health <= 0.0 and self.on_death is not None:
+			self.on_death(self)
 
-	def _approach(self, current: pygame.Vector2, target: pygame.Vector2, delta: float) -> pygame.Vector2:
-		diff = target - current
-		length = diff.length()
+	def _approach_velocity(self, target_x: float, target_y: float, delta: float) -> None:
+		"""Moves velocity toward the target by at most `delta`, in place."""
+		v = self.velocity
+		diff_x = target_x - v.x
+		diff_y = target_y - v.y
+		length = math.hypot(diff_x, diff_y)
 		if length <= delta or length < 1e-6:
-			return target
-		return current + diff.normalize() * delta
\ No newline at end of file
+			v.update(target_x, target_y)
+		else:
+			k = delta / length
+			v.update(v.x + diff_x * k, v.y + diff_y * k)
\ No newline at end of file
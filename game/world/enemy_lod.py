@@ -0,0 +1,197 @@
+from __future__ import annotations
+from typing import Dict, List, Set, Tuple
+
+from .enemy import Enemy
+from .tilemap import TileMap
+
+LOD_FULL = 0
+LOD_REDUCED = 1
+LOD_SLEEPING = 2
+
+
+class EnemyLOD:
+	"""Simulation level of detail for enemies, chosen by distance to the player and the camera view.
+
+	- full: stepped every tick, AI thinks at the scheduler's AI rate
+	- reduced: stepped every `reduced_period` ticks with a proportionally larger dt
+	- sleeping: not updated at all until the player comes close or a wake-up trigger fires
+
+	Noise, damage and the player entering a zone wake enemies up to full detail for `wake_ticks`.
+	Dead enemies are dropped from every update set as soon as they die. With an EntityRegistry, wire
+	its on_spawn/on_despawn to add()/remove() so pooled enemies are tracked across respawns.
+	"""
+
+	def __init__(self, enemies: List[Enemy], tile_map: TileMap, full_radius: float = 700.0, reduced_radius: float = 1600.0, reduced_period: int = 4, wake_ticks: int = 180, zone_wake_radius: float = 500.0, view_margin: int = 64):
+		self.enemies = enemies
+		self.tile_map = tile_map
+		self.full_radius = full_radius
+		self.reduced_radius = reduced_radius
+		self.reduced_period = max(1, reduced_period)
+		self.wake_ticks = wake_ticks
+		self.zone_wake_radius = zone_wake_radius
+		self.view_margin = view_margin
+
+		self.full: List[Enemy] = []
+		self.reduced: List[Enemy] = []
+		self.awake: List[Enemy] = []
+		self.sleeping_count = 0
+		self.dead_count = 0
+		self._tier: Dict[int, int] = {}
+		# Position of each awake enemy in its tier list (full or reduced) and in `awake`, for swap-remove
+		self._tier_pos: Dict[int, int] = {}
+		self._awake_pos: Dict[int, int] = {}
+		self._awake_until: Dict[int, int] = {}
+		self._player_zones: Set[int] = set()
+		self._tick = 0
+		for e in enemies:
+			self.attach(e)
+
+	def attach(self, enemy: Enemy) -> None:
+		enemy.on_damaged = self._on_enemy_damaged
+
+	def add(self, enemy: Enemy) -> None:
+		"""Tracks a newly spawned enemy at full detail until the next reassign() picks its tier."""
+		self.attach(enemy)
+		self._awake_until.pop(id(enemy), None)
+		if enemy.health > 0.0:
+			self._set_tier(enemy, LOD_FULL)
+
+	def remove(self, enemy: Enemy) -> None:
+		"""Drops an enemy from every update set (e.g. when it is despawned)."""
+		tier = self._tier.pop(id(enemy), None)
+		self._awake_until.pop(id(enemy), None)
+		if tier == LOD_FULL:
+			self._swap_remove(self.full, self._tier_pos, enemy)
+			self._swap_remove(self.awake, self._awake_pos, enemy)
+		elif tier == LOD_REDUCED:
+			self._swap_remove(self.reduced, self._tier_pos, enemy)
+			self._swap_remove(self.awake, self._awake_pos, enemy)
+		elif tier == LOD_SLEEPING:
+			self.sleeping_count -= 1
+
+	def tier_of(self, enemy: Enemy) -> int:
+		return self._tier.get(id(enemy), LOD_SLEEPING)
+
+	def wake(self, enemy: Enemy) -> None:
+		if enemy.health <= 0.0:
+			return
+		self._awake_until[id(enemy)] = self._tick + self.wake_ticks
+		if self._tier.get(id(enemy)) != LOD_FULL:
+			self._set_tier(enemy, LOD_FULL)
+
+	def make_noise(self, position: Tuple[float, float], radius: float) -> None:
+		px, py = position
+		r2 = radius * radius
+		for e in self.enemies:
+			if e.health > 0.0:
+				dx = e.position.x - px
+				dy = e.position.y - py
+				if dx * dx + dy * dy <= r2:
+					self.wake(e)
+
+	def _on_enemy_damaged(self, enemy: Enemy) -> None:
+		if enemy.health <= 0.0:
+			if id(enemy) in self._tier:
+				self.remove(enemy)
+				self.dead_count += 1
+		else:
+			self.wake(enemy)
+
+	def _set_tier(self, enemy: Enemy, tier: int) -> None:
+		old = self._tier.get(id(enemy))
+		if old == tier:
+			return
+		if old == LOD_FULL:
+			self._swap_remove(self.full, self._tier_pos, enemy)
+		elif old == LOD_REDUCED:
+			self._swap_remove(self.reduced, self._tier_pos, enemy)
+		elif old == LOD_SLEEPING:
+			self.sleeping_count -= 1
+		if tier == LOD_FULL:
+			self._append(self.full, self._tier_pos, enemy)
+		elif tier == LOD_REDUCED:
+			self._append(self.reduced, self._tier_pos, enemy)
+		else:
+			self.sleeping_count += 1
+		awake_before = old in (LOD_FULL, LOD_REDUCED)
+		awake_after = tier in (LOD_FULL, LOD_REDUCED)
+		if awake_after and not awake_before:
+			self._append(self.awake, self._awake_pos, enemy)
+		elif awake_before and not awake_after:
+			self._swap_remove(self.awake, self._awake_pos, enemy)
+		self._tier[id(enemy)] = tier
+
+	@staticmethod
+	def _append(items: List[Enemy], positions: Dict[int, int], enemy: Enemy) -> None:
+		positions[id(enemy)] = len(items)
+		items.append(enemy)
+
+	@staticmethod
+	def _swap_remove(items: List[Enemy], positions: Dict[int, int], enemy: Enemy) -> None:
+		pos = positions.pop(id(enemy))
+		last = items.pop()
+		if pos < len(items):
+			# Swap-remove: the last enemy takes the freed position
+			items[pos] = last
+			positions[id(last)] = pos
+
+	def reassign(self, player, camera) -> None:
+		"""Recomputes every enemy's tier. Cheap (one distance test per enemy); run a few times per second."""
+		self._check_zone_entry(player)
+		px = player.position.x
+		py = player.position.y
+		full2 = self.full_radius * self.full_radius
+		reduced2 = self.reduced_radius * self.reduced_radius
+		m = self.view_margin
+		view_left = camera.position_x - camera.view_width * 0.5 - m
+		view_right = camera.position_x + camera.view_width * 0.5 + m
+		view_top = camera.position_y - camera.view_height * 0.5 - m
+		view_bottom = camera.position_y + camera.view_height * 0.5 + m
+		tick = self._tick
+		dead = 0
+		for e in self.enemies:
+			key = id(e)
+			if e.health <= 0.0:
+				dead += 1
+				if key in self._tier:
+					self.remove(e)
+				continue
+			ex = e.position.x
+			ey = e.position.y
+			dx = ex - px
+			dy = ey - py
+			d2 = dx * dx + dy * dy
+			if d2 <= full2 or self._awake_until.get(key, -1) > tick or (view_left <= ex <= view_right and view_top <= ey <= view_bottom):
+				tier = LOD_FULL
+			elif d2 <= reduced2:
+				tier = LOD_REDUCED
+			else:
+				tier = LOD_SLEEPING
+			self._set_tier(e, tier)
+		self.dead_count = dead
+
+	def _check_zone_entry(self, player) -> None:
+		rect = player.rect
+		inside: Set[int] = set()
+		for i, zone in enumerate(self.tile_map.zones):
+			zr = zone["rect"]
+			if rect.colliderect(zr):
+				inside.add(i)
+				if i not in self._player_zones:
+					self.make_noise(zr.center, self.zone_wake_radius)
+		self._player_zones = inside
+
+	def step(self, dt: float = 1.0 / 60.0) -> None:
+		"""Steps full-detail enemies every call and each reduced enemy every `reduced_period` calls."""
+		for e in self.full:
+			e.step(dt=dt)
+		period = self.reduced_period
+		if self.reduced:
+			bucket = self._tick % period
+			reduced = self.reduced
+			for i in range(bucket, len(reduced), period):
+				reduced[i].step(dt=dt * period)
+		self._tick += 1
+
+	def counts(self) -> Tuple[int, int, int, int]:
+		return len(self.full), len(self.reduced), self.sleeping_count, self.dead_count
\ No newline at end of file
@@ -0,0 +1,153 @@
+from __future__ import annotations
+from typing import Callable, Generic, Iterable, Iterator, List, NamedTuple, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class Handle(NamedTuple):
+	"""Reference to a pooled entity. Stale once the entity is despawned and its slot reused."""
+
+	index: int
+	generation: int
+
+
+class EntityRegistry(Generic[T]):
+	"""Pooled storage for one entity type with generational handles.
+
+	Entity objects are created by `factory` once and reused: spawn takes a free slot and calls the
+	entity's `reset(*args, **kwargs)`, despawn returns the slot to the free list. `active` is a dense
+	list of live entities that update, collision and draw loops iterate directly; it is mutated in
+	place, so it can be shared by reference. Despawns are queued and applied by `flush()`, which the
+	simulation runs at the end of every tick, so no loop sees the list change while iterating it.
+	"""
+
+	def __init__(self, factory: Callable[[], T], capacity: int = 0):
+		self._factory = factory
+		self._entities: List[T] = []
+		self._generations: List[int] = []
+		# Position of each slot in `active`, -1 while the slot is free
+		self._dense: List[int] = []
+		self._free: List[int] = []
+		self._pending: List[Handle] = []
+		self.active: List[T] = []
+		self.on_spawn: Callable[[T], None] | None = None
+		self.on_despawn: Callable[[T], None] | None = None
+		self.reserve(capacity)
+
+	def __len__(self) -> int:
+		return len(self.active)
+
+	def __iter__(self) -> Iterator[T]:
+		return iter(self.active)
+
+	@property
+	def capacity(self) -> int:
+		return len(self._entities)
+
+	def reserve(self, count: int) -> None:
+		"""Grows the pool so `count` entities can be live without allocating on spawn."""
+		start = len(self._entities)
+		if count <= start:
+			return
+		for _ in range(start, count):
+			self._entities.append(self._factory())
+			self._generations.append(0)
+			self._dense.append(-1)
+		# Free list is a stack popped from the end; kept descending (as restore() builds it) so low indices go first
+		freed = len(self._free)
+		self._free.extend(range(count - 1, start - 1, -1))
+		if freed:
+			self._free.sort(reverse=True)
+
+	def spawn(self, *args, **kwargs) -> Handle:
+		if not self._free:
+			self.reserve(max(8, len(self._entities) * 2))
+		index = self._free.pop()
+		entity = self._entities[index]
+		entity.reset(*args, **kwargs)
+		handle = Handle(index, self._generations[index])
+		entity.handle = handle
+		self._dense[index] = len(self.active)
+		self.active.append(entity)
+		if self.on_spawn is not None:
+			self.on_spawn(entity)
+		return handle
+
+	def get(self, handle: Handle) -> Optional[T]:
+		index, generation = handle
+		if 0 <= index < len(self._entities) and self._dense[index] >= 0 and self._generations[index] == generation:
+			return self._entities[index]
+		return None
+
+	def is_alive(self, handle: Handle) -> bool:
+		return self.get(handle) is not None
+
+	def despawn(self, handle: Handle) -> None:
+		"""Queues the entity for removal at the next flush(). Stale handles are ignored."""
+		if self.get(handle) is not None:
+			self._pending.append(handle)
+
+	def flush(self) -> int:
+		"""Applies queued despawns. Returns how many entities were removed."""
+		if not self._pending:
+			return 0
+		removed = 0
+		for handle in self._pending:
+			# A handle may be queued twice in one tick; the generation check drops the repeat
+			if self.get(handle) is not None:
+				self._release(handle.index)
+				removed += 1
+		self._pending.clear()
+		return removed
+
+	def _release(self, index: int) -> None:
+		active = self.active
+		pos = self._dense[index]
+		last = active.pop()
+		if pos < len(active):
+			# Swap-remove: the last entity takes the freed position
+			active[pos] = last
+			self._dense[last.handle.index] = pos
+		entity = self._entities[index]
+		self._dense[index] = -1
+		self._generations[index] += 1
+		self._free.append(index)
+		if self.on_despawn is not None:
+			self.on_despawn(entity)
+
+	def clear(self) -> None:
+		"""Despawns every entity immediately."""
+		self._pending.clear()
+		for index in [e.handle.index for e in self.active]:
+			self._release(index)
+
+	def restore(self, handles: Iterable[Tuple[int, int]]) -> List[T]:
+		"""Makes exactly `handles` live, in this order, keeping their generations.
+
+		Used to load saves and snapshots; the caller then writes the entities' state. Entities that
+		stay live are not re-spawned, so only the ones entering or leaving fire the callbacks.
+		"""
+		handles = [Handle(int(i), int(g)) for i, g in handles]
+		indices = {h.index for h in handles}
+		if len(indices) != len(handles):
+			raise ValueError("duplicate entity index in restored handles")
+		self.reserve(max(indices, default=-1) + 1)
+		self._pending.clear()
+
+		for entity in list(self.active):
+			if entity.handle.index not in indices:
+				self._release(entity.handle.index)
+		entering = [h.index for h in handles if self._dense[h.index] < 0]
+
+		self.active.clear()
+		for pos, handle in enumerate(handles):
+			entity = self._entities[handle.index]
+			self._generations[handle.index] = handle.generation
+			entity.handle = handle
+			self._dense[handle.index] = pos
+			self.active.append(entity)
+		self._free = [i for i in range(len(self._entities) - 1, -1, -1) if self._dense[i] < 0]
+		if self.on_spawn is not None:
+			for index in entering:
+				self.on_spawn(self._entities[index])
+		return self.active
\ No newline at end of file
@@ -0,0 +1,214 @@
+from __future__ import annotations
+from typing import Dict, List, Set, Tuple
+
+import pygame
+
+from .tilemap import TileMap
+
+# Overlay alpha per tile state
+ALPHA_HIDDEN = 255
+ALPHA_EXPLORED = 150
+ALPHA_VISIBLE = 0
+
+# Octant transforms for shadowcasting: (xx, xy, yx, yy)
+_OCTANTS = (
+	(1, 0, 0, 1), (0, 1, 1, 0), (0, -1, 1, 0), (-1, 0, 0, 1),
+	(-1, 0, 0, -1), (0, -1, -1, 0), (0, 1, -1, 0), (1, 0, 0, -1),
+)
+
+
+class FogOfWar:
+	"""Fog-of-war layer over a TileMap.
+
+	Visibility is recomputed with recursive shadowcasting only when the viewer moves to another tile.
+	Explored state is kept as one bit per tile in per-chunk bytearrays, allocated only for chunks that
+	have been seen. The darkening overlay is cached in blocks of `block_tiles` (a fraction of a chunk,
+	so a visibility change only rebuilds a few small surfaces) and a block is rebuilt only when one of
+	its tiles changes state.
+	"""
+
+	def __init__(self, tile_map: TileMap, radius_tiles: int = 12, block_tiles: int = 8):
+		self.tile_map = tile_map
+		self.radius = radius_tiles
+		self.chunk = tile_map._chunk_size_tiles
+		self.block = block_tiles
+		self._explored: Dict[Tuple[int, int], bytearray] = {}
+		self._explored_blocks: Set[Tuple[int, int]] = set()
+		self._visible: Set[Tuple[int, int]] = set()
+		self._viewer_tile: Tuple[int, int] | None = None
+		self._overlays: Dict[Tuple[int, int], pygame.Surface] = {}
+		self._dirty: Set[Tuple[int, int]] = set()
+		self._overlay_tile_px = tile_map.tile_size
+		# Caps how many changed overlays one draw rebuilds; the rest show their previous fog for a few
+		# frames, so a big visibility change (e.g. an explosion opening a room) is spread out
+		self.max_overlay_builds_per_frame: int | None = 6
+		self.recomputes = 0
+
+	def is_visible(self, tx: int, ty: int) -> bool:
+		return (tx, ty) in self._visible
+
+	def is_explored(self, tx: int, ty: int) -> bool:
+		bits = self._explored.get((tx // self.chunk, ty // self.chunk))
+		if bits is None:
+			return False
+		i = (ty % self.chunk) * self.chunk + (tx % self.chunk)
+		return bool(bits[i >> 3] & (1 << (i & 7)))
+
+	def invalidate(self) -> None:
+		"""Forces visibility to be recomputed on the next update (e.g. after the map changed)."""
+		self._viewer_tile = None
+
+	def on_tiles_changed(self, tiles: List[Tuple[int, int]]) -> None:
+		"""TileMap listener: recomputes visibility only if a changed tile is within view range."""
+		if self._viewer_tile is None:
+			return
+		vx, vy = self._viewer_tile
+		r = self.radius
+		for tx, ty in tiles:
+			if abs(tx - vx) <= r and abs(ty - vy) <= r:
+				self.invalidate()
+				return
+
+	def update(self, viewer_pos: Tuple[float, float]) -> bool:
+		ts = self.tile_map.tile_size
+		tile = (int(viewer_pos[0]) // ts, int(viewer_pos[1]) // ts)
+		if tile == self._viewer_tile:
+			return False
+		self._viewer_tile = tile
+		self.recomputes += 1
+
+		old_visible = self._visible
+		visible: Set[Tuple[int, int]] = set()
+		self._compute_fov(tile[0], tile[1], visible)
+		self._visible = visible
+
+		chunk = self.chunk
+		block = self.block
+		dirty = self._dirty
+		for tx, ty in visible - old_visible:
+			key = (tx // chunk, ty // chunk)
+			bits = self._explored.get(key)
+			if bits is None:
+				bits = bytearray(chunk * chunk // 8)
+				self._explored[key] = bits
+			i = (ty % chunk) * chunk + (tx % chunk)
+			bits[i >> 3] |= 1 << (i & 7)
+			block_key = (tx // block, ty // block)
+			self._explored_blocks.add(block_key)
+			dirty.add(block_key)
+		for tx, ty in old_visible - visible:
+			dirty.add((tx // block, ty // block))
+		return True
+
+	def _compute_fov(self, ox: int, oy: int, visible: Set[Tuple[int, int]]) -> None:
+		tm = self.tile_map
+		if not (0 <= ox < tm.tiles_w and 0 <= oy < tm.tiles_h):
+			return
+		visible.add((ox, oy))
+		for xx, xy, yx, yy in _OCTANTS:
+			self._cast(ox, oy, 1, 1.0, 0.0, xx, xy, yx, yy, visible)
+
+	def _cast(self, ox: int, oy: int, row: int, start: float, end: float, xx: int, xy: int, yx: int, yy: int, visible: Set[Tuple[int, int]]) -> None:
+		# Recursive shadowcasting (Bergström) over one octant
+		if start < end:
+			return
+		collision = self.tile_map.collision
+		w = self.tile_map.tiles_w
+		h = self.tile_map.tiles_h
+		radius = self.radius
+		radius2 = radius * radius
+		new_start = 0.0
+		for j in range(row, radius + 1):
+			dx = -j - 1
+			dy = -j
+			blocked = False
+			while dx <= 0:
+				dx += 1
+				mx = ox + dx * xx + dy * xy
+				my = oy + dx * yx + dy * yy
+				l_slope = (dx - 0.5) / (dy + 0.5)
+				r_slope = (dx + 0.5) / (dy - 0.5)
+				if start < r_slope:
+					continue
+				if end > l_slope:
+					break
+				in_bounds = 0 <= mx < w and 0 <= my < h
+				if in_bounds and dx * dx + dy * dy < radius2:
+					visible.add((mx, my))
+				wall = not in_bounds or collision[my][mx]
+				if blocked:
+					if wall:
+						new_start = r_slope
+						continue
+					blocked = False
+					start = new_start
+				elif wall and j < radius:
+					blocked = True
+					self._cast(ox, oy, j + 1, start, l_slope, xx, xy, yx, yy, visible)
+					new_start = r_slope
+			if blocked:
+				break
+
+	def _build_overlay(self, key: Tuple[int, int]) -> pygame.Surface:
+		tm = self.tile_map
+		chunk = self.chunk
+		block = self.block
+		bx, by = key
+		x0 = bx * block
+		y0 = by * block
+		w = min(tm.tiles_w, x0 + block) - x0
+		h = min(tm.tiles_h, y0 + block) - y0
+		explored = self._explored
+		visible = self._visible
+		# One RGBA pixel per tile written in bulk, then scaled up to tile size in a single call
+		pixels = bytearray(w * h * 4)
+		o = 3
+		for ty in range(y0, y0 + h):
+			for tx in range(x0, x0 + w):
+				bits = explored.get((tx // chunk, ty // chunk))
+				i = (ty % chunk) * chunk + (tx % chunk)
+				if bits is not None and bits[i >> 3] & (1 << (i & 7)):
+					pixels[o] = ALPHA_VISIBLE if (tx, ty) in visible else ALPHA_EXPLORED
+				else:
+					pixels[o] = ALPHA_HIDDEN
+				o += 4
+		small = pygame.image.frombuffer(bytes(pixels), (w, h), "RGBA")
+		overlay = pygame.transform.scale(small, (w * self._overlay_tile_px, h * self._overlay_tile_px))
+		# Fog is long runs of identical alpha; RLE lets blits skip through them
+		overlay.set_alpha(255, pygame.RLEACCEL)
+		self._overlays[key] = overlay
+		return overlay
+
+	def draw(self, surface: pygame.Surface, camera) -> None:
+		tm = self.tile_map
+		block = self.block
+		block_px = block * tm.tile_size
+		tile_px = tm.scaled_tile_size(camera.render_scale)
+		if tile_px != self._overlay_tile_px:
+			# Overlays are cheap to rebuild, so a render scale change just drops them
+			self._overlay_tile_px = tile_px
+			self._overlays.clear()
+		half_w = camera.view_width * 0.5
+		half_h = camera.view_height * 0.5
+		min_bx = max(0, int((camera.position_x - half_w) // block_px))
+		max_bx = min((tm.tiles_w - 1) // block, int((camera.position_x + half_w) // block_px))
+		min_by = max(0, int((camera.position_y - half_h) // block_px))
+		max_by = min((tm.tiles_h - 1) // block, int((camera.position_y + half_h) // block_px))
+		builds_left = self.max_overlay_builds_per_frame
+		for by in range(min_by, max_by + 1):
+			for bx in range(min_bx, max_bx + 1):
+				key = (bx, by)
+				sx, sy = camera.world_to_screen((bx * block_px, by * block_px))
+				if key not in self._explored_blocks:
+					# Never seen: solid black without an overlay surface
+					w = min(tm.tiles_w - bx * block, block) * tile_px
+					h = min(tm.tiles_h - by * block, block) * tile_px
+					surface.fill((0, 0, 0), pygame.Rect(sx, sy, w, h))
+					continue
+				overlay = self._overlays.get(key)
+				if overlay is None or (key in self._dirty and (builds_left is None or builds_left > 0)):
+					overlay = self._build_overlay(key)
+					self._dirty.discard(key)
+					if builds_left is not None:
+						builds_left -= 1
+				surface.blit(overlay, (sx, sy))
\ No newline at end of file
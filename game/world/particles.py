@@ -28,8 +28,7 @@ class ParticleSystem:
 				p.ttl = ttl
 				return
 
-	def update(self) -> None:
-		dt = 1.0 / 60.0
+	def update(self, dt: float = 1.0 / 60.0) -> None:
 		for p in self.particles:
 			if not p.active:
 				continue
@@ -37,11 +36,15 @@ class ParticleSystem:
 			if p.ttl <= 0:
 				p.active = False
 				continue
-			p.position += p.velocity * dt
+			pos = p.position
+			vel = p.velocity
+			pos.update(pos.x + vel.x * dt, pos.y + vel.y * dt)
 
-	def draw(self, surface: pygame.Surface, camera) -> None:
+	def draw(self, surface: pygame.Surface, camera, lead_time: float = 0.0) -> None:
+		# lead_time moves particles along their velocity to the frame's time when updates run slower than rendering
+		size = camera.to_screen_length(2)
 		for p in self.particles:
 			if not p.active:
 				continue
-			sx, sy = camera.world_to_screen(p.position.xy)
-			surface.fill(p.color, rect=pygame.Rect(int(sx), int(sy), 2, 2))
\ No newline at end of file
+			sx, sy = camera.world_to_screen((p.position.x + p.velocity.x * lead_time, p.position.y + p.velocity.y * lead_time))
+			surface.fill(p.color, rect=pygame.Rect(int(sx), int(sy), size, size))
\ No newline at end of file
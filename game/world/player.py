@@ -1,6 +1,7 @@
 from __future__ import annotations
+import math
 import pygame
-from typing import List, Tuple
+from typing import Callable, List, Tuple
 
 from game.core.input import InputManager
 from .projectiles import ProjectilePool
@@ -21,50 +22,72 @@ class Player:
 		self.move_decel = 2400.0
 		self.max_speed = 220.0
 		self.fire_cooldown = 0.2
+		self.explosive_cooldown = 0.8
+		self.build_cooldown = 0.25
 		self._fire_timer = 0.0
 		self.health = 100.0
 		self.armor = 0.1
 		self.is_dead = False
 		self.statuses: List[Tuple[str, float]] = []
+		# Called with (position, radius) when the player makes noise that nearby enemies can hear
+		self.on_noise: Callable[[Tuple[float, float], float], None] | None = None
+		self.shot_noise_radius = 600.0
+		self._rect = pygame.Rect(0, 0, int(self.size.x), int(self.size.y))
 
 	@property
 	def rect(self) -> pygame.Rect:
-		return pygame.Rect(int(self.position.x - self.size.x * 0.5), int(self.position.y - self.size.y * 0.5), int(self.size.x), int(self.size.y))
+		"""Bounds at the current position. One Rect refreshed in place on every access; copy it to keep it."""
+		r = self._rect
+		r.x = int(self.position.x - self.size.x * 0.5)
+		r.y = int(self.position.y - self.size.y * 0.5)
+		return r
 
 	def update(self, camera) -> None:
 		dt = 1.0 / 60.0
 		if self.is_dead:
 			return
+		# Movement works on plain floats and in-place updates, so a tick allocates no vectors or rects
 		move_x, move_y = self.input.get_move_vector()
-		input_dir = pygame.Vector2(move_x, move_y)
-		if input_dir.length_squared() > 1e-5:
-			input_dir = input_dir.normalize()
-			desired = input_dir * self.max_speed
-			self.velocity = self._approach(self.velocity, desired, self.move_accel * dt)
+		length2 = move_x * move_x + move_y * move_y
+		if length2 > 1e-5:
+			scale = self.max_speed / math.sqrt(length2)
+			self._approach_velocity(move_x * scale, move_y * scale, self.move_accel * dt)
 		else:
-			self.velocity = self._approach(self.velocity, pygame.Vector2(0, 0), self.move_decel * dt)
+			self._approach_velocity(0.0, 0.0, self.move_decel * dt)
 
-		dx = self.velocity.x * dt
-		dy = self.velocity.y * dt
-		_, _, new_rect = self.tile_map.resolve_movement(self.rect, dx, dy)
-		self.position.update(new_rect.centerx, new_rect.centery)
+		rect = self.rect
+		self.tile_map.resolve_movement_ip(rect, self.velocity.x * dt, self.velocity.y * dt)
+		self.position.update(rect.centerx, rect.centery)
 
-		dps = self.tile_map.get_damage_in_rect_per_second(new_rect)
+		dps = self.tile_map.get_damage_in_rect_per_second(rect)
 		if dps > 0.0:
 			self.take_damage(dps * dt, damage_type="environment")
 
 		self._fire_timer -= dt
-		if self.input.is_action_held("fire") and self._fire_timer <= 0.0:
-			mouse_world = camera.screen_to_world(self.input.get_mouse_screen())
-			direction = pygame.Vector2(mouse_world[0] - self.position.x, mouse_world[1] - self.position.y)
-			if direction.length_squared() > 1e-6:
-				direction = direction.normalize()
-				self.projectiles.spawn(self.position.xy, direction.xy, speed=520.0, ttl=1.2, damage=15.0, owner="player", spread_deg=4.0, knockback=140.0)
-				self._fire_timer = self.fire_cooldown
+		if self._fire_timer > 0.0:
+			return
+		if self.input.is_action_held("fire"):
+			self._shoot(camera, self.fire_cooldown, speed=520.0, ttl=1.2, damage=15.0, spread_deg=4.0, knockback=140.0)
+		elif self.input.is_action_held("alt_fire"):
+			# Explosive shot: clears walls around its impact point
+			self._shoot(camera, self.explosive_cooldown, speed=420.0, ttl=1.0, damage=25.0, knockback=200.0, blast_radius=56.0)
+		elif self.input.is_action_held("build"):
+			# Builder shot: places a wall where it stops
+			self._shoot(camera, self.build_cooldown, speed=360.0, ttl=0.35, damage=0.0, builds=True)
+
+	def _shoot(self, camera, cooldown: float, **projectile) -> None:
+		mouse_world = camera.screen_to_world(self.input.get_mouse_screen())
+		direction = pygame.Vector2(mouse_world[0] - self.position.x, mouse_world[1] - self.position.y)
+		if direction.length_squared() > 1e-6:
+			direction = direction.normalize()
+			self.projectiles.spawn(self.position.xy, direction.xy, owner="player", **projectile)
+			self._fire_timer = cooldown
+			if self.on_noise is not None:
+				self.on_noise((self.position.x, self.position.y), self.shot_noise_radius)
 
 	def draw(self, surface: pygame.Surface, camera) -> None:
 		sx, sy = camera.world_to_screen(self.position.xy)
-		rect = pygame.Rect(0, 0, int(self.size.x), int(self.size.y))
+		rect = pygame.Rect(0, 0, camera.to_screen_length(self.size.x), camera.to_screen_length(self.size.y))
 		rect.center = (sx, sy)
 		color = (80, 200, 120) if not self.is_dead else (80, 80, 80)
 		pygame.draw.rect(surface, color, rect, border_radius=4)
@@ -77,9 +100,14 @@ class Player:
 		if self.health <= 0.0:
 			self.is_dead = True
 
-	def _approach(self, current: pygame.Vector2, target: pygame.Vector2, delta: float) -> pygame.Vector2:
-		diff = target - current
-		length = diff.length()
+	def _approach_velocity(self, target_x: float, target_y: float, delta: float) -> None:
+		"""Moves velocity toward the target by at most `delta`, in place."""
+		v = self.velocity
+		diff_x = target_x - v.x
+		diff_y = target_y - v.y
+		length = math.hypot(diff_x, diff_y)
 		if length <= delta or length < 1e-6:
-			return target
-		return current + diff.normalize() * delta
\ No newline at end of file
+			v.update(target_x, target_y)
+		else:
+			k = delta / length
+			v.update(v.x + diff_x * k, v.y + diff_y * k)
\ No newline at end of file
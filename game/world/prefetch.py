@@ -0,0 +1,90 @@
+from __future__ import annotations
+import time
+from typing import List, Tuple
+
+from .tilemap import TileMap
+
+
+class ChunkPrefetcher:
+	"""Builds tile map chunks before the camera reaches them, in time slices outside of draw().
+
+	The camera's velocity is estimated from its position each frame. Missing chunks under the view
+	swept `lookahead` seconds ahead, widened by `margin` pixels, are queued nearest-first to where the
+	camera is heading; run() builds them a tile row at a time until its budget is spent, so
+	TileMap.draw() rarely has to build a chunk inside the frame.
+	"""
+
+	def __init__(self, tile_map: TileMap, lookahead: float = 0.75, margin: float | None = None, smoothing: float = 0.2):
+		self.tile_map = tile_map
+		self.lookahead = lookahead
+		self.margin = tile_map.chunk_pixels * 0.5 if margin is None else margin
+		self.smoothing = smoothing
+		self.velocity_x = 0.0
+		self.velocity_y = 0.0
+		self._last_position: Tuple[float, float] | None = None
+		# Missing chunks, farthest first so the next one to build is popped from the end
+		self._queue: List[Tuple[int, int]] = []
+		self.built = 0
+
+	@property
+	def pending(self) -> int:
+		return len(self._queue)
+
+	def update(self, camera, dt: float) -> None:
+		x = camera.position_x
+		y = camera.position_y
+		last = self._last_position
+		self._last_position = (x, y)
+		if last is not None and dt > 0.0:
+			dx = x - last[0]
+			dy = y - last[1]
+			if abs(dx) > camera.view_width or abs(dy) > camera.view_height:
+				# A jump (load, respawn) is not motion to extrapolate
+				self.velocity_x = self.velocity_y = 0.0
+			else:
+				k = self.smoothing
+				self.velocity_x += (dx / dt - self.velocity_x) * k
+				self.velocity_y += (dy / dt - self.velocity_y) * k
+
+		ahead_x = x + self.velocity_x * self.lookahead
+		ahead_y = y + self.velocity_y * self.lookahead
+		half_w = camera.view_width * 0.5 + self.margin
+		half_h = camera.view_height * 0.5 + self.margin
+		tm = self.tile_map
+		cp = tm.chunk_pixels
+		min_cx = max(0, int((min(x, ahead_x) - half_w) // cp))
+		max_cx = min(tm.chunks_w - 1, int((max(x, ahead_x) + half_w) // cp))
+		min_cy = max(0, int((min(y, ahead_y) - half_h) // cp))
+		max_cy = min(tm.chunks_h - 1, int((max(y, ahead_y) + half_h) // cp))
+
+		# Halfway to the predicted position: chunks the camera enters soonest come first, ones behind it last
+		focus_x = (x + ahead_x) * 0.5
+		focus_y = (y + ahead_y) * 0.5
+		queue = self._queue
+		queue.clear()
+		for cy in range(min_cy, max_cy + 1):
+			for cx in range(min_cx, max_cx + 1):
+				if not tm.has_chunk((cx, cy)):
+					queue.append((cx, cy))
+		if len(queue) > 1:
+			queue.sort(key=lambda key: ((key[0] + 0.5) * cp - focus_x) ** 2 + ((key[1] + 0.5) * cp - focus_y) ** 2, reverse=True)
+		# Finish a half-built chunk before starting another, which would throw its rows away
+		building = tm.building_chunk
+		if building is not None and building in queue and queue[-1] != building:
+			queue.remove(building)
+			queue.append(building)
+
+	def run(self, budget_ms: float) -> int:
+		"""Builds queued chunks for up to `budget_ms`. Returns how many were completed."""
+		if budget_ms <= 0.0 or not self._queue:
+			return 0
+		deadline = time.perf_counter() + budget_ms / 1000.0
+		queue = self._queue
+		built = 0
+		while queue and time.perf_counter() < deadline:
+			if not self.tile_map.prefetch_chunk(queue[-1], deadline):
+				break
+			queue.pop()
+			built += 1
+		self.built += built
+		return built
\ No newline at end of file
@@ -1,14 +1,14 @@
 from __future__ import annotations
 import math
-import random
 from typing import List, Tuple
 import pygame
 
+from .rng import stream_value
 from .tilemap import TileMap
 
 
 class Projectile:
-	__slots__ = ("active", "position", "velocity", "ttl", "damage", "owner", "knockback")
+	__slots__ = ("active", "position", "velocity", "ttl", "damage", "owner", "knockback", "blast_radius", "builds")
 
 	def __init__(self):
 		self.active = False
@@ -18,18 +18,27 @@ class Projectile:
 		self.damage = 0.0
 		self.owner = "player"
 		self.knockback = 0.0
+		# Tile effects: clear walls within blast_radius on impact, or place a wall where a builder shot stops
+		self.blast_radius = 0.0
+		self.builds = False
 
 
 class ProjectilePool:
-	def __init__(self, max_projectiles: int = 256):
+	def __init__(self, max_projectiles: int = 256, rng_seed: int = 0):
 		self.projectiles: List[Projectile] = [Projectile() for _ in range(max_projectiles)]
+		# Spread angles come from a stream indexed by a draw counter, like Enemy's
+		self.rng_seed = rng_seed
+		self.rng_draws = 0
+		# Collision bounds of the projectile being moved, reused for each one
+		self._rect = pygame.Rect(0, 0, 6, 6)
 
-	def spawn(self, position: Tuple[float, float], direction: Tuple[float, float], speed: float, ttl: float, damage: float, owner: str, spread_deg: float = 0.0, knockback: float = 0.0) -> None:
+	def spawn(self, position: Tuple[float, float], direction: Tuple[float, float], speed: float, ttl: float, damage: float, owner: str, spread_deg: float = 0.0, knockback: float = 0.0, blast_radius: float = 0.0, builds: bool = False) -> None:
 		for p in self.projectiles:
 			if not p.active:
 				angle = math.atan2(direction[1], direction[0])
 				if spread_deg > 0.0:
-					spread = math.radians(random.uniform(-spread_deg * 0.5, spread_deg * 0.5))
+					spread = math.radians((stream_value(self.rng_seed, self.rng_draws) - 0.5) * spread_deg)
+					self.rng_draws += 1
 					angle += spread
 				p.active = True
 				p.position.update(position[0], position[1])
@@ -38,24 +47,42 @@ class ProjectilePool:
 				p.damage = damage
 				p.owner = owner
 				p.knockback = knockback
+				p.blast_radius = blast_radius
+				p.builds = builds
 				return
 
-	def update(self, tile_map: TileMap, player, enemies: List[object]):
+	def update(self, tile_map: TileMap, player, enemies: List[object], players: List[object] | None = None):
 		dt = 1.0 / 60.0
+		targets = players if players is not None else (player,)
+		# Players don't move when hit, so their rects can be read once per update
+		target_rects = [(t, t.rect) for t in targets]
+		new_rect = self._rect
 		for p in self.projectiles:
 			if not p.active:
 				continue
 			p.ttl -= dt
 			if p.ttl <= 0:
 				p.active = False
+				if p.builds:
+					self._build_tile(p, tile_map, target_rects, enemies)
 				continue
 			# Move
-			dx = p.velocity.x * dt
-			dy = p.velocity.y * dt
-			rect = pygame.Rect(int(p.position.x) - 3, int(p.position.y) - 3, 6, 6)
-			dx, dy, new_rect = tile_map.resolve_movement(rect, dx, dy)
+			want_dx = p.velocity.x * dt
+			want_dy = p.velocity.y * dt
+			new_rect.x = int(p.position.x) - 3
+			new_rect.y = int(p.position.y) - 3
+			dx, dy = tile_map.resolve_movement_ip(new_rect, want_dx, want_dy)
 			p.position.update(new_rect.centerx, new_rect.centery)
 
+			if (p.blast_radius > 0.0 or p.builds) and (int(dx) != int(want_dx) or int(dy) != int(want_dy)):
+				# Tile-effect shots act on the first wall they run into instead of sliding along it
+				p.active = False
+				if p.builds:
+					self._build_tile(p, tile_map, target_rects, enemies)
+				else:
+					tile_map.destroy_tiles_in_radius(p.position.xy, p.blast_radius)
+				continue
+
 			# Collision with walls
 			if abs(dx) < 1e-5 and abs(dy) < 1e-5 and tile_map.collides_aabb(new_rect):
 				p.active = False
@@ -67,15 +94,34 @@ class ProjectilePool:
 					if new_rect.colliderect(e.rect):
 						e.take_damage(p.damage)
 						p.active = False
+						if p.blast_radius > 0.0:
+							tile_map.destroy_tiles_in_radius(p.position.xy, p.blast_radius)
 						break
 			elif p.owner == "enemy":
-				if new_rect.colliderect(player.rect):
-					player.take_damage(p.damage, damage_type="projectile")
-					p.active = False
+				for target, target_rect in target_rects:
+					if new_rect.colliderect(target_rect):
+						target.take_damage(p.damage, damage_type="projectile")
+						p.active = False
+						break
+
+	def _build_tile(self, p: Projectile, tile_map: TileMap, target_rects, enemies: List[object]) -> None:
+		ts = tile_map.tile_size
+		tx = int(p.position.x) // ts
+		ty = int(p.position.y) // ts
+		tile_rect = pygame.Rect(tx * ts, ty * ts, ts, ts)
+		# Never wall anyone in
+		for _, target_rect in target_rects:
+			if tile_rect.colliderect(target_rect):
+				return
+		for e in enemies:
+			if tile_rect.colliderect(e.rect):
+				return
+		tile_map.set_tile(tx, ty, True)
 
 	def draw(self, surface: pygame.Surface, camera) -> None:
+		radius = camera.to_screen_length(3)
 		for p in self.projectiles:
 			if not p.active:
 				continue
 			sx, sy = camera.world_to_screen(p.position.xy)
-			pygame.draw.circle(surface, (230, 230, 80) if p.owner == "player" else (230, 100, 100), (int(sx), int(sy)), 3)
\ No newline at end of file
+			pygame.draw.circle(surface, (230, 230, 80) if p.owner == "player" else (230, 100, 100), (int(sx), int(sy)), radius)
\ No newline at end of file
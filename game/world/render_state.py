@@ -0,0 +1,84 @@
+from __future__ import annotations
+import time
+from typing import List, Tuple
+
+import pygame
+
+
+class RenderSnapshot:
+	"""Immutable copy of everything the renderer needs from one simulation tick.
+
+	Entity records are plain tuples so a snapshot can be read on another thread while the
+	simulation keeps mutating the live objects.
+	"""
+
+	__slots__ = ("tick", "published_at", "dt", "camera", "player", "enemies", "projectiles", "particles", "particles_ahead")
+
+	def __init__(self, tick: int, dt: float, camera: Tuple[float, float], player: Tuple[float, float, int, int, bool, float], enemies: List[Tuple[float, float, int, int]], projectiles: List[Tuple[int, float, float, bool]], particles: List[Tuple[float, float, float, float, Tuple[int, int, int]]], particles_ahead: float = 0.0):
+		self.tick = tick
+		self.published_at = time.perf_counter()
+		self.dt = dt
+		self.camera = camera
+		self.player = player
+		self.enemies = enemies
+		self.projectiles = projectiles
+		self.particles = particles
+		# Seconds the particles' state is ahead of this tick when they update at a lower rate (ScheduledSystem.ahead_time)
+		self.particles_ahead = particles_ahead
+
+
+def capture_render_state(tick: int, dt: float, camera, player, enemies, projectiles, particles, particles_ahead: float = 0.0) -> RenderSnapshot:
+	return RenderSnapshot(
+		tick,
+		dt,
+		(camera.position_x, camera.position_y),
+		(player.position.x, player.position.y, int(player.size.x), int(player.size.y), player.is_dead, player.health),
+		[(e.position.x, e.position.y, int(e.size.x), int(e.size.y)) for e in enemies if e.health > 0],
+		[(i, p.position.x, p.position.y, p.owner == "player") for i, p in enumerate(projectiles.projectiles) if p.active],
+		[(p.position.x, p.position.y, p.velocity.x, p.velocity.y, p.color) for p in particles.particles if p.active],
+		particles_ahead,
+	)
+
+
+def _lerp(a: float, b: float, t: float) -> float:
+	return a + (b - a) * t
+
+
+def interpolate_camera(camera, prev: RenderSnapshot, curr: RenderSnapshot, alpha: float) -> None:
+	camera.position_x = _lerp(prev.camera[0], curr.camera[0], alpha)
+	camera.position_y = _lerp(prev.camera[1], curr.camera[1], alpha)
+
+
+def draw_render_state(surface: pygame.Surface, camera, prev: RenderSnapshot, curr: RenderSnapshot, alpha: float) -> None:
+	"""Draws entities interpolated between two consecutive snapshots; matches the entities' own draw()."""
+	same_enemies = len(prev.enemies) == len(curr.enemies)
+	length = camera.to_screen_length
+	for i, (x, y, w, h) in enumerate(curr.enemies):
+		if same_enemies:
+			px, py = prev.enemies[i][0], prev.enemies[i][1]
+			x = _lerp(px, x, alpha)
+			y = _lerp(py, y, alpha)
+		rect = pygame.Rect(0, 0, length(w), length(h))
+		rect.center = camera.world_to_screen((x, y))
+		pygame.draw.rect(surface, (200, 80, 80), rect, border_radius=4)
+
+	x, y, w, h, dead, _health = curr.player
+	rect = pygame.Rect(0, 0, length(w), length(h))
+	rect.center = camera.world_to_screen((_lerp(prev.player[0], x, alpha), _lerp(prev.player[1], y, alpha)))
+	pygame.draw.rect(surface, (80, 80, 80) if dead else (80, 200, 120), rect, border_radius=4)
+
+	prev_projectiles = {rec[0]: rec for rec in prev.projectiles}
+	radius = length(3)
+	for index, x, y, from_player in curr.projectiles:
+		before = prev_projectiles.get(index)
+		if before is not None:
+			x = _lerp(before[1], x, alpha)
+			y = _lerp(before[2], y, alpha)
+		sx, sy = camera.world_to_screen((x, y))
+		pygame.draw.circle(surface, (230, 230, 80) if from_player else (230, 100, 100), (int(sx), int(sy)), radius)
+
+	lead = alpha * curr.dt - curr.particles_ahead
+	size = length(2)
+	for x, y, vx, vy, color in curr.particles:
+		sx, sy = camera.world_to_screen((x + vx * lead, y + vy * lead))
+		surface.fill(color, rect=pygame.Rect(int(sx), int(sy), size, size))
\ No newline at end of file
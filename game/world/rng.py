@@ -0,0 +1,16 @@
+from __future__ import annotations
+
+_MASK64 = (1 << 64) - 1
+
+
+def stream_value(seed: int, draw: int) -> float:
+	"""Number `draw` of the stream for `seed`, uniform in [0, 1) (SplitMix64 over seed and draw).
+
+	A stream indexed by a draw counter has seed and counter as its whole state, so snapshots store
+	one number per stream instead of a generator's internal state.
+	"""
+	z = (seed + (draw + 1) * 0x9E3779B97F4A7C15) & _MASK64
+	z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+	z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & _MASK64
+	z ^= z >> 31
+	return (z >> 11) * (1.0 / (1 << 53))
@@ -0,0 +1,70 @@
+from __future__ import annotations
+import collections
+import math
+from typing import Deque, List, Tuple
+
+from .entities import EntityRegistry
+from .rng import stream_value
+from .tilemap import TileMap
+
+
+class WaveSpawner:
+	"""Spawns waves of enemies through an EntityRegistry, spread over several ticks.
+
+	A queued wave reserves its pool slots up front, so the ticks that spawn it only reuse pooled
+	enemies; at most `per_tick` spawn per tick so a wave of hundreds never lands in a single frame.
+	Positions are random free tiles in a ring around the wave's center, drawn from a stream indexed
+	by `rng_draws`, so the draw counter and the queued waves are all a snapshot needs.
+	"""
+
+	def __init__(self, registry: EntityRegistry, tile_map: TileMap, per_tick: int = 24, seed: int = 7):
+		self.registry = registry
+		self.tile_map = tile_map
+		self.per_tick = max(1, per_tick)
+		self.seed = seed
+		self.rng_draws = 0
+		# Remaining count, center and ring radii of each queued wave
+		self._waves: Deque[List] = collections.deque()
+		self.spawned = 0
+
+	@property
+	def pending(self) -> int:
+		return sum(w[0] for w in self._waves)
+
+	def queue_wave(self, count: int, center: Tuple[float, float], min_radius: float = 400.0, max_radius: float = 900.0) -> None:
+		if count <= 0:
+			return
+		self.registry.reserve(len(self.registry) + self.pending + count)
+		self._waves.append([count, center, min_radius, max_radius])
+
+	def update(self, _dt: float = 1.0 / 60.0) -> None:
+		budget = self.per_tick
+		while budget > 0 and self._waves:
+			wave = self._waves[0]
+			_, center, min_radius, max_radius = wave
+			while budget > 0 and wave[0] > 0:
+				pos = self._pick_position(center, min_radius, max_radius)
+				wave[0] -= 1
+				budget -= 1
+				if pos is not None:
+					self.registry.spawn(pos)
+					self.spawned += 1
+			if wave[0] == 0:
+				self._waves.popleft()
+
+	def _uniform(self, a: float, b: float) -> float:
+		value = stream_value(self.seed, self.rng_draws)
+		self.rng_draws += 1
+		return a + (b - a) * value
+
+	def _pick_position(self, center: Tuple[float, float], min_radius: float, max_radius: float, attempts: int = 8) -> Tuple[float, float] | None:
+		tm = self.tile_map
+		ts = tm.tile_size
+		for _ in range(attempts):
+			angle = self._uniform(0.0, math.tau)
+			radius = self._uniform(min_radius, max_radius)
+			tx = int((center[0] + math.cos(angle) * radius) // ts)
+			ty = int((center[1] + math.sin(angle) * radius) // ts)
+			if 0 < tx < tm.tiles_w - 1 and 0 < ty < tm.tiles_h - 1 and not tm.collision[ty][tx]:
+				return (tx + 0.5) * ts, (ty + 0.5) * ts
+		return None
\ No newline at end of file
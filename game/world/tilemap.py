@@ -1,26 +1,54 @@
 from __future__ import annotations
+import collections
+import copy
 import pygame
 import random
-from typing import Dict, List, Tuple
+import time
+from typing import Callable, Deque, Dict, List, Sequence, Tuple
+
+FLOOR_COLOR_A = (30, 30, 36)
+FLOOR_COLOR_B = (34, 34, 40)
+WALL_COLOR = (48, 48, 60)
 
 
 class TileMap:
-	def __init__(self, tiles_w: int, tiles_h: int, tile_size: int):
+	def __init__(self, tiles_w: int, tiles_h: int, tile_size: int, seed: int = 1337):
 		self.tiles_w = tiles_w
 		self.tiles_h = tiles_h
 		self.tile_size = tile_size
 		self.pixel_width = tiles_w * tile_size
 		self.pixel_height = tiles_h * tile_size
+		self._world_rect = pygame.Rect(0, 0, self.pixel_width, self.pixel_height)
 
 		self.ground: List[List[int]] = [[0 for _ in range(tiles_w)] for _ in range(tiles_h)]
 		self.collision: List[List[bool]] = [[False for _ in range(tiles_w)] for _ in range(tiles_h)]
 		self.zones: List[Dict] = []
 
-		self._rng = random.Random(1337)
+		self.seed = seed
+		self._rng = random.Random(seed)
 		self._generate()
 
 		self._chunk_size_tiles = 32
 		self._chunk_cache: Dict[Tuple[int, int], Tuple[pygame.Surface, pygame.Rect]] = {}
+		# Chunks are cached at the camera's render scale; on a scale change the old surfaces are kept
+		# and resampled on demand, which is exact for the flat-coloured tiles and cheaper than a rebuild
+		self._chunk_scale = 1.0
+		self._stale_chunks: Dict[Tuple[int, int], Tuple[pygame.Surface, pygame.Rect]] = {}
+		# Limits how many missing chunks one draw call may build; the rest show the flat floor color until a later frame
+		self.max_chunk_builds_per_frame: int | None = None
+		# Chunk being built in slices by prefetch_chunk(): key, surface, next row to paint and tile size
+		self._partial_chunk: Tuple[Tuple[int, int], pygame.Surface, int, int] | None = None
+		# Measured cost of allocating and clearing a chunk surface, the one step that cannot be sliced
+		self._chunk_setup_ms = 0.0
+
+		# Tile mutations change `collision` at once; derived data (chunk surfaces, listeners such as the
+		# minimap and fog) catches up in one batch per apply_tile_changes() call
+		self._changed_tiles: Deque[Tuple[int, int]] = collections.deque()
+		self.tile_listeners: List[Callable[[List[Tuple[int, int]]], None]] = []
+		# Original value of every tile changed since generation, for saves
+		self.modified: Dict[Tuple[int, int], bool] = {}
+		# (tx, ty, previous value) per change while a SnapshotRing records them for rewind
+		self.journal: List[Tuple[int, int, bool]] | None = None
 
 	def _generate(self) -> None:
 		for x in range(self.tiles_w):
@@ -55,53 +83,260 @@ class TileMap:
 		start_cy = min_ty // chunk
 		end_cy = max_ty // chunk
 
+		if camera.render_scale != self._chunk_scale:
+			self._chunk_scale = camera.render_scale
+			self._stale_chunks = self._chunk_cache
+			self._chunk_cache = {}
+		ts_s = self.scaled_tile_size(camera.render_scale)
+
+		builds_left = self.max_chunk_builds_per_frame
 		for cy in range(start_cy, end_cy + 1):
 			for cx in range(start_cx, end_cx + 1):
 				key = (cx, cy)
-				if key not in self._chunk_cache:
-					self._build_chunk_surface(cx, cy)
+				# Resampling a stale chunk is cheap enough to skip the build budget, so a scale change never shows placeholders
+				if key not in self._chunk_cache and not self._resample_stale_chunk(key, ts_s):
+					if builds_left is not None and builds_left <= 0:
+						self._draw_chunk_placeholder(surface, camera, cx, cy)
+						continue
+					self._build_chunk_surface(cx, cy, ts_s)
+					if builds_left is not None:
+						builds_left -= 1
 				chunk_surface, chunk_rect = self._chunk_cache[key]
 				screen_pos = camera.world_to_screen((chunk_rect.x + chunk_rect.w * 0.5, chunk_rect.y + chunk_rect.h * 0.5))
 				draw_rect = chunk_surface.get_rect()
 				draw_rect.center = screen_pos
 				surface.blit(chunk_surface, draw_rect)
 
-		color_wall = (48, 48, 60)
-		for ty in range(min_ty, max_ty + 1):
-			for tx in range(min_tx, max_tx + 1):
-				if self.collision[ty][tx]:
-					wx = tx * self.tile_size
-					wy = ty * self.tile_size
-					rect = pygame.Rect(wx, wy, self.tile_size, self.tile_size)
-					sx, sy = camera.world_to_screen((rect.centerx, rect.centery))
-					r = pygame.Rect(0, 0, rect.w, rect.h)
-					r.center = (sx, sy)
-					pygame.draw.rect(surface, color_wall, r)
-
 		for zone in self.zones:
 			zr = zone["rect"]
 			if view_rect.colliderect(zr):
 				sx, sy = camera.world_to_screen((zr.centerx, zr.centery))
-				rr = pygame.Rect(0, 0, zr.w, zr.h)
+				rr = pygame.Rect(0, 0, camera.to_screen_length(zr.w), camera.to_screen_length(zr.h))
 				rr.center = (sx, sy)
 				pygame.draw.rect(surface, (180, 50, 50), rr, width=2)
 
-	def _build_chunk_surface(self, cx: int, cy: int) -> None:
+	def _draw_chunk_placeholder(self, surface: pygame.Surface, camera, cx: int, cy: int) -> None:
+		chunk_px = self._chunk_size_tiles * self.tile_size
+		x0 = cx * chunk_px
+		y0 = cy * chunk_px
+		w = min(self.pixel_width - x0, chunk_px)
+		h = min(self.pixel_height - y0, chunk_px)
+		sx, sy = camera.world_to_screen((x0, y0))
+		surface.fill(FLOOR_COLOR_A, pygame.Rect(sx, sy, camera.to_screen_length(w), camera.to_screen_length(h)))
+		# Walls stay visible (they still collide) until the chunk surface is built
+		ts = self.scaled_tile_size(camera.render_scale)
+		tx0 = cx * self._chunk_size_tiles
+		ty0 = cy * self._chunk_size_tiles
+		for ty in range(ty0, min(self.tiles_h, ty0 + self._chunk_size_tiles)):
+			row = self.collision[ty]
+			for tx in range(tx0, min(self.tiles_w, tx0 + self._chunk_size_tiles)):
+				if row[tx]:
+					surface.fill(WALL_COLOR, (sx + (tx - tx0) * ts, sy + (ty - ty0) * ts, ts, ts))
+
+	def scaled_tile_size(self, render_scale: float) -> int:
+		return max(1, round(self.tile_size * render_scale))
+
+	@property
+	def chunk_pixels(self) -> int:
+		return self._chunk_size_tiles * self.tile_size
+
+	@property
+	def chunks_w(self) -> int:
+		return (self.tiles_w + self._chunk_size_tiles - 1) // self._chunk_size_tiles
+
+	@property
+	def chunks_h(self) -> int:
+		return (self.tiles_h + self._chunk_size_tiles - 1) // self._chunk_size_tiles
+
+	@property
+	def cached_chunks(self) -> int:
+		return len(self._chunk_cache)
+
+	@property
+	def building_chunk(self) -> Tuple[int, int] | None:
+		"""Key of the chunk prefetch_chunk() left half-built, if any."""
+		return self._partial_chunk[0] if self._partial_chunk is not None else None
+
+	def has_chunk(self, key: Tuple[int, int]) -> bool:
+		"""True if drawing chunk `key` at the current render scale needs no build."""
+		return key in self._chunk_cache or key in self._stale_chunks
+
+	def prefetch_chunk(self, key: Tuple[int, int], deadline: float) -> bool:
+		"""Builds chunk `key` at the current render scale, one tile row at a time, until
+		time.perf_counter() passes `deadline`. Returns True once the chunk is cached.
+
+		An unfinished chunk is resumed by the next call for the same key (or by draw()); starting another
+		chunk discards it.
+		"""
+		if key in self._chunk_cache:
+			return True
+		ts = self.scaled_tile_size(self._chunk_scale)
+		if self._resample_stale_chunk(key, ts):
+			return True
+		return self._build_chunk_surface(key[0], key[1], ts, deadline)
+
+	def _resample_stale_chunk(self, key: Tuple[int, int], ts: int) -> bool:
+		stale = self._stale_chunks.pop(key, None)
+		if stale is None:
+			return False
+		old_surface, old_rect = stale
+		size = (old_rect.w // self.tile_size * ts, old_rect.h // self.tile_size * ts)
+		self._chunk_cache[key] = (pygame.transform.scale(old_surface, size), old_rect)
+		return True
+
+	def _build_chunk_surface(self, cx: int, cy: int, ts: int | None = None, deadline: float | None = None) -> bool:
 		chunk = self._chunk_size_tiles
 		x0 = cx * chunk
 		y0 = cy * chunk
 		x1 = min(self.tiles_w, x0 + chunk)
 		y1 = min(self.tiles_h, y0 + chunk)
-		surf = pygame.Surface(((x1 - x0) * self.tile_size, (y1 - y0) * self.tile_size)).convert()
-		surf.fill((24, 24, 28))
-		color_a = (30, 30, 36)
-		color_b = (34, 34, 40)
-		for ty in range(y0, y1):
+		if ts is None:
+			ts = self.tile_size
+		partial = self._partial_chunk
+		if partial is not None and partial[0] == (cx, cy) and partial[3] == ts:
+			_, surf, start_ty, _ = partial
+		else:
+			setup_start = time.perf_counter()
+			if deadline is not None and (deadline - setup_start) * 1000.0 < self._chunk_setup_ms:
+				return False
+			size = ((x1 - x0) * ts, (y1 - y0) * ts)
+			display = pygame.display.get_surface()
+			# Creating the surface in the display format skips the full-chunk copy that convert() makes
+			surf = pygame.Surface(size, 0, display) if display is not None else pygame.Surface(size)
+			# Base fill with the first floor color, then only the odd checker tiles and the walls; fill() is much cheaper than draw.rect
+			surf.fill(FLOOR_COLOR_A)
+			setup_ms = (time.perf_counter() - setup_start) * 1000.0
+			self._chunk_setup_ms = setup_ms if self._chunk_setup_ms == 0.0 else self._chunk_setup_ms + (setup_ms - self._chunk_setup_ms) * 0.25
+			start_ty = y0
+		for ty in range(start_ty, y1):
+			start_tx = x0 + ((x0 + ty + 1) % 2)
+			for tx in range(start_tx, x1, 2):
+				surf.fill(FLOOR_COLOR_B, ((tx - x0) * ts, (ty - y0) * ts, ts, ts))
+			row = self.collision[ty]
 			for tx in range(x0, x1):
-				color = color_a if (tx + ty) % 2 == 0 else color_b
-				pygame.draw.rect(surf, color, pygame.Rect((tx - x0) * self.tile_size, (ty - y0) * self.tile_size, self.tile_size, self.tile_size))
-		rect = pygame.Rect(x0 * self.tile_size, y0 * self.tile_size, surf.get_width(), surf.get_height())
+				if row[tx]:
+					surf.fill(WALL_COLOR, ((tx - x0) * ts, (ty - y0) * ts, ts, ts))
+			if deadline is not None and ty + 1 < y1 and time.perf_counter() >= deadline:
+				self._partial_chunk = ((cx, cy), surf, ty + 1, ts)
+				return False
+		if partial is not None and partial[0] == (cx, cy):
+			self._partial_chunk = None
+		rect = pygame.Rect(x0 * self.tile_size, y0 * self.tile_size, (x1 - x0) * self.tile_size, (y1 - y0) * self.tile_size)
 		self._chunk_cache[(cx, cy)] = (surf, rect)
+		return True
+
+	def set_tile(self, tx: int, ty: int, solid: bool, record: bool = True) -> bool:
+		"""Makes a tile a wall or floor. Returns True if it changed; the map border cannot be changed."""
+		if not (0 < tx < self.tiles_w - 1 and 0 < ty < self.tiles_h - 1):
+			return False
+		row = self.collision[ty]
+		old = row[tx]
+		if old == solid:
+			return False
+		row[tx] = solid
+		key = (tx, ty)
+		original = self.modified.setdefault(key, old)
+		if original == solid:
+			del self.modified[key]
+		if record and self.journal is not None:
+			self.journal.append((tx, ty, old))
+		self._changed_tiles.append(key)
+		return True
+
+	def destroy_tiles_in_radius(self, center: Tuple[float, float], radius: float) -> int:
+		"""Clears every wall whose center lies within `radius` of `center`. Returns how many were removed."""
+		ts = self.tile_size
+		cx, cy = center
+		r2 = radius * radius
+		removed = 0
+		for ty in range(max(1, int((cy - radius) // ts)), min(self.tiles_h - 1, int((cy + radius) // ts) + 1)):
+			dy = (ty + 0.5) * ts - cy
+			row = self.collision[ty]
+			for tx in range(max(1, int((cx - radius) // ts)), min(self.tiles_w - 1, int((cx + radius) // ts) + 1)):
+				if row[tx]:
+					dx = (tx + 0.5) * ts - cx
+					if dx * dx + dy * dy <= r2 and self.set_tile(tx, ty, False):
+						removed += 1
+		return removed
+
+	def take_journal(self) -> Sequence[Tuple[int, int, bool]]:
+		"""Returns the changes recorded since the last call and starts a new journal."""
+		journal = self.journal
+		if not journal:
+			return ()
+		self.journal = []
+		return journal
+
+	def render_copy(self) -> "TileMap":
+		"""Copy of the tiles with its own chunk cache, for a render thread to draw while the simulation
+		changes this map. The simulation side hands it changes with take_tile_changes(); the copy
+		applies them with set_tiles() and apply_tile_changes()."""
+		view = copy.copy(self)
+		view.collision = [row[:] for row in self.collision]
+		view.modified = dict(self.modified)
+		view.journal = None
+		view._changed_tiles = collections.deque()
+		view.tile_listeners = []
+		view._chunk_cache = {}
+		view._stale_chunks = {}
+		view._partial_chunk = None
+		return view
+
+	def take_tile_changes(self) -> Sequence[Tuple[int, int, bool]]:
+		"""Drains the changed tiles as (tx, ty, value), for a render_copy() on another thread."""
+		queue = self._changed_tiles
+		if not queue:
+			return ()
+		collision = self.collision
+		changes = []
+		while queue:
+			tx, ty = queue.popleft()
+			changes.append((tx, ty, collision[ty][tx]))
+		return changes
+
+	def set_tiles(self, changes: Sequence[Tuple[int, int, bool]]) -> None:
+		for tx, ty, solid in changes:
+			self.set_tile(tx, ty, solid, record=False)
+
+	def apply_tile_changes(self) -> List[Tuple[int, int]]:
+		"""Refreshes data derived from changed tiles in one batch and returns the tiles.
+
+		Cached chunk surfaces are patched per tile instead of rebuilt, so even an explosion removing
+		hundreds of tiles costs a few hundred small fills. Reads `collision`, so in threaded mode the
+		render thread calls it on its render_copy(), never on the map the simulation changes.
+		"""
+		queue = self._changed_tiles
+		if not queue:
+			return []
+		changed = set()
+		while queue:
+			changed.add(queue.popleft())
+		tiles = sorted(changed)
+
+		chunk = self._chunk_size_tiles
+		ts = self.scaled_tile_size(self._chunk_scale)
+		partial = self._partial_chunk
+		for tx, ty in tiles:
+			key = (tx // chunk, ty // chunk)
+			# Surfaces kept for another render scale would be resampled with the old tiles; drop them
+			self._stale_chunks.pop(key, None)
+			cached = self._chunk_cache.get(key)
+			if cached is not None:
+				surf = cached[0]
+			elif partial is not None and partial[0] == key and ty < partial[2] and partial[3] == ts:
+				# Rows of a half-built chunk that were painted before the change
+				surf = partial[1]
+			else:
+				continue
+			if self.collision[ty][tx]:
+				color = WALL_COLOR
+			else:
+				color = FLOOR_COLOR_B if (tx + ty) % 2 else FLOOR_COLOR_A
+			surf.fill(color, ((tx % chunk) * ts, (ty % chunk) * ts, ts, ts))
+
+		for listener in self.tile_listeners:
+			listener(tiles)
+		return tiles
 
 	def collides_aabb(self, rect: pygame.Rect) -> bool:
 		min_tx = max(0, rect.left // self.tile_size)
@@ -116,34 +351,42 @@ class TileMap:
 
 	def resolve_movement(self, rect: pygame.Rect, dx: float, dy: float):
 		new_rect = rect.copy()
-		new_rect.x += int(dx)
-		if self.collides_aabb(new_rect):
+		dx, dy = self.resolve_movement_ip(new_rect, dx, dy)
+		return dx, dy, new_rect
+
+	def resolve_movement_ip(self, rect: pygame.Rect, dx: float, dy: float) -> Tuple[float, float]:
+		"""resolve_movement() without the copy: moves `rect` itself. Returns the distance moved per axis."""
+		rect.x += int(dx)
+		if self.collides_aabb(rect):
 			step = 1 if dx > 0 else -1
 			while int(dx) != 0:
-				new_rect.x -= step
+				rect.x -= step
 				dx -= step
-				if not self.collides_aabb(new_rect):
+				if not self.collides_aabb(rect):
 					break
 			else:
-				new_rect.x += step
+				rect.x += step
 				dx = 0
-		new_rect.y += int(dy)
-		if self.collides_aabb(new_rect):
+		rect.y += int(dy)
+		if self.collides_aabb(rect):
 			step = 1 if dy > 0 else -1
 			while int(dy) != 0:
-				new_rect.y -= step
+				rect.y -= step
 				dy -= step
-				if not self.collides_aabb(new_rect):
+				if not self.collides_aabb(rect):
 					break
 			else:
-				new_rect.y += step
+				rect.y += step
 				dy = 0
-		new_rect.clamp_ip(pygame.Rect(0, 0, self.pixel_width, self.pixel_height))
-		return dx, dy, new_rect
+		rect.clamp_ip(self._world_rect)
+		return dx, dy
 
 	def raycast_block(self, start: Tuple[float, float], end: Tuple[float, float]) -> bool:
-		x0, y0 = start
-		x1, y1 = end
+		# Indexing instead of unpacking, so Vector2 positions can be passed without building tuples
+		x0 = start[0]
+		y0 = start[1]
+		x1 = end[0]
+		y1 = end[1]
 		dx = x1 - x0
 		dy = y1 - y0
 		steps = int(max(abs(dx), abs(dy)) // self.tile_size) + 1
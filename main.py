@@ -1,76 +1,317 @@
+import argparse
 import os
+import random
 import sys
-from typing import Tuple
+import tempfile
+import time
+from array import array
+from typing import Optional, Tuple
+
+_PROCESS_START = time.perf_counter()
 
 # Configure headless mode audio to avoid errors if SDL_VIDEODRIVER=dummy
 if os.environ.get("SDL_VIDEODRIVER") == "dummy":
     os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
 
+# Opt-in (GAME_FAST_IMPORT=1): pygame.pkgdata imports setuptools' pkg_resources only to look up its
+# bundled data files and falls back to plain file paths without it. Hiding the module during the pygame
+# import saves ~100 ms of startup, but it changes how pygame finds its data, so it is off by default.
+_block_pkg_resources = os.environ.get("GAME_FAST_IMPORT") == "1" and "pkg_resources" not in sys.modules
+if _block_pkg_resources:
+    sys.modules["pkg_resources"] = None  # type: ignore[assignment]
+
 import pygame
 
+if _block_pkg_resources:
+    del sys.modules["pkg_resources"]
+
 from game.core.config import Config
 from game.core.input import InputManager
 from game.core.time_step import FixedTimeStep
+from game.core.metrics import JsonLinesSink, MetricsEmitter, StatsdSink
+from game.core.scheduler import Scheduler
+from game.core.threaded import InputMailbox, RenderBuffer, SimulationThread
+from game.core.render_scale import DynamicResolution, quantize_scale
 from game.core.camera import Camera
-from game.core.profiling import FrameProfiler
+from game.core.profiling import FrameProfiler, ProfileCapture, StartupProfiler
+from game.core.gc_control import ManualGC
+from game.core.replay import InputFrame, InputRecorder, InputReplay
 from game.world.tilemap import TileMap
 from game.world.player import Player
 from game.world.enemy import Enemy
+from game.world.enemy_lod import EnemyLOD
+from game.world.crowd import CrowdSeparation
+from game.world.entities import EntityRegistry
+from game.world.fog import FogOfWar
 from game.world.projectiles import ProjectilePool
 from game.world.particles import ParticleSystem
+from game.world.prefetch import ChunkPrefetcher
+from game.world.spawner import WaveSpawner
+from game.world.render_state import capture_render_state, draw_render_state, interpolate_camera
 from game.ui.hud import HUD
 from game.ui.menus import PauseMenu
+from game.ui.minimap import Minimap
 from game.ui.localization import Localization
 from game.saves.save_manager import SaveManager
+from game.saves.snapshots import SnapshotRing
+from game.net.protocol import DEFAULT_PORT
 
 
 def initialize_pygame(window_size: Tuple[int, int], title: str) -> Tuple[pygame.Surface, pygame.Surface]:
-    pygame.init()
+    # Only the modules the game uses; joystick is opened lazily by InputManager and audio is unused
+    pygame.display.init()
+    pygame.font.init()
     pygame.display.set_caption(title)
     screen = pygame.display.set_mode(window_size, pygame.RESIZABLE | pygame.SCALED)
     surface = pygame.Surface(window_size).convert_alpha()
     return screen, surface
 
 
-def main() -> None:
+def parse_address(value: str) -> Tuple[str, int]:
+    host, _, port = value.partition(":")
+    return host or "127.0.0.1", int(port) if port else DEFAULT_PORT
+
+
+def main(connect: Optional[Tuple[str, int]] = None, startup_report: bool = False, threaded: bool = False, record: Optional[str] = None, replay_path: Optional[str] = None, render: bool = True) -> None:
+    startup = StartupProfiler(start=_PROCESS_START)
+
+    # A replay recreates the recorded session: same seeds, world and starting quick save
+    replay = InputReplay(replay_path) if replay_path is not None else None
+    render = render or replay is None
+    session = replay.session if replay is not None else {
+        "random_seed": random.getrandbits(32),
+        "map_seed": 1337,
+        "enemy_seed": 42,
+        "spawner_seed": 7,
+        "world_tiles": [160, 160],
+    }
+    startup.phases.append(("imports", (time.perf_counter() - _PROCESS_START) * 1000.0))
+
     window_width, window_height = 1280, 720
-    screen, scene_surface = initialize_pygame((window_width, window_height), "Python 2D Game")
+    with startup.phase("display"):
+        screen, scene_surface = initialize_pygame((window_width, window_height), "Python 2D Game")
 
     clock = pygame.time.Clock()
     profiler = FrameProfiler()
 
     # Systems
-    config = Config.load_or_create()
-    localization = Localization.load(preferred_language=config.settings.get("lang", "ru"))
-    input_manager = InputManager(config)
+    with startup.phase("config/locale/input"):
+        config = Config.load_or_create()
+        localization = Localization.load(preferred_language=config.settings.get("lang", "ru"))
+        input_manager = InputManager(config)
 
     tile_size = 32
-    world_tiles_w, world_tiles_h = 160, 160
-    tile_map = TileMap(world_tiles_w, world_tiles_h, tile_size)
+    world_tiles_w, world_tiles_h = session["world_tiles"]
+    with startup.phase("tile map"):
+        tile_map = TileMap(world_tiles_w, world_tiles_h, tile_size, seed=session["map_seed"])
+        # Spread building of the initially visible chunks over the first frames
+        tile_map.max_chunk_builds_per_frame = 2
+
+    threaded = threaded and connect is None and record is None and replay is None
+    # Drawing, fog and minimap read the tiles; in threaded mode they get a copy the render thread owns,
+    # patched with the tile changes the simulation publishes
+    render_map = tile_map.render_copy() if threaded else tile_map
+
+    graphics = config.settings.get("graphics", {})
+    fog = FogOfWar(render_map) if graphics.get("fog_of_war") else None
+    if fog is not None:
+        render_map.tile_listeners.append(fog.on_tiles_changed)
+
+    # The world is drawn at render_scale and upscaled once; with dynamic resolution "scale" is the upper bound
+    render_scale = quantize_scale(float(graphics.get("scale", 1.0)))
+    resolution = DynamicResolution(target_fps=float(graphics.get("target_fps", 60)), max_scale=render_scale) if graphics.get("dynamic_resolution") else None
+    world_surface = scene_surface
+    frame_budget_ms = 1000.0 / float(graphics.get("target_fps", 60))
+    prefetcher = ChunkPrefetcher(render_map)
+
+    performance = config.settings.get("performance", {})
+    # Replay frames run as many ticks as fit the budget and always exceed it; they are not hitches
+    profiler.budget_ms = frame_budget_ms if replay is None else None
+    profiler.track_gc()
+    if performance.get("log_hitches"):
+        profiler.on_hitch = print
+    profiler.capture = ProfileCapture(out_dir=performance.get("profile_dir", "profiles"), frames=int(performance.get("profile_frames", 300)))
+    profile_at_frame = int(performance.get("profile_at_frame", 0))
 
     camera = Camera(view_width=window_width, view_height=window_height, world_width=tile_map.pixel_width, world_height=tile_map.pixel_height)
 
-    projectiles = ProjectilePool(max_projectiles=256)
-    particles = ParticleSystem(max_particles=512)
-
-    # Entities
-    player = Player(spawn_pos=(tile_size * 4, tile_size * 4), input_manager=input_manager, projectiles=projectiles, particles=particles, tile_map=tile_map)
-
-    enemies = [
-        Enemy(spawn_pos=(tile_size * 50, tile_size * 40), tile_map=tile_map, target_getter=lambda: player, projectiles=projectiles, particles=particles),
-        Enemy(spawn_pos=(tile_size * 80, tile_size * 75), tile_map=tile_map, target_getter=lambda: player, projectiles=projectiles, particles=particles),
-    ]
-
-    hud = HUD(localization=localization, config=config)
-    pause_menu = PauseMenu(localization=localization, config=config, input_manager=input_manager)
-
-    save_manager = SaveManager()
+    with startup.phase("entities"):
+        projectiles = ProjectilePool(max_projectiles=256, rng_seed=session["random_seed"])
+        particles = ParticleSystem(max_particles=512)
+
+        # Entities
+        player = Player(spawn_pos=(tile_size * 4, tile_size * 4), input_manager=input_manager, projectiles=projectiles, particles=particles, tile_map=tile_map)
+
+        # Enemies are pooled in a registry; `enemies` is its live list, dead ones leave it at the end of the tick
+        def make_enemy() -> Enemy:
+            enemy = Enemy(spawn_pos=(0, 0), tile_map=tile_map, target_getter=lambda: player, projectiles=projectiles, particles=particles, rng_seed=session["enemy_seed"])
+            enemy.on_death = lambda e: enemy_registry.despawn(e.handle)
+            return enemy
+
+        enemy_registry = EntityRegistry(make_enemy)
+        enemy_registry.spawn((tile_size * 50, tile_size * 40))
+        enemy_registry.spawn((tile_size * 80, tile_size * 75))
+        enemies = enemy_registry.active
+        spawner = WaveSpawner(enemy_registry, tile_map, seed=session["spawner_seed"])
+
+    with startup.phase("ui"):
+        hud = HUD(localization=localization, config=config)
+        pause_menu = PauseMenu(localization=localization, config=config, input_manager=input_manager)
+        minimap = Minimap(render_map) if graphics.get("minimap", True) else None
+        if minimap is not None:
+            render_map.tile_listeners.append(minimap.update_tiles)
+
+    with startup.phase("saves/snapshots"):
+        save_manager = SaveManager()
+        if replay is not None:
+            # Quick saves made during the replay go to a scratch file instead of over the player's own
+            save_manager.redirect_quick_save(os.path.join(tempfile.mkdtemp(prefix="replay-"), "quick_save.json"), session.get("quick_save"))
+        elif record is not None:
+            session["quick_save"] = save_manager.read_quick_save()
+        snapshots = SnapshotRing(player, enemy_registry, projectiles, particles, tile_map, capacity=180, spawner=spawner)
+    sim_tick = 0
 
     time_step = FixedTimeStep(target_fps=60)
+    # In threaded mode the simulation thread owns its own clock; time_step then only paces the pause menu
+    sim_time_step = FixedTimeStep(target_fps=60) if threaded else time_step
+
+    # Far-away enemies step at a reduced rate or sleep; noise, damage and zone entry wake them
+    enemy_lod = EnemyLOD(enemies, tile_map)
+    enemy_registry.on_spawn = enemy_lod.add
+    enemy_registry.on_despawn = enemy_lod.remove
+    player.on_noise = enemy_lod.make_noise
+    # Awake enemies steer apart from their neighbours instead of stacking up on the player; the push
+    # changes slowly, so it is refreshed at half the physics rate
+    crowd = CrowdSeparation(enemies, tile_map)
+
+    # While recording or replaying, the simulation sees one fixed InputFrame per tick instead of the live input;
+    # so does the simulation thread, which gets the input the render thread posts through `input_mailbox`
+    input_frame = replay.frame if replay is not None else InputFrame(list(config.settings.get("input", {})))
+    input_mailbox = InputMailbox(input_frame.actions) if threaded else None
+    sim_input = input_frame if record is not None or replay is not None or threaded else input_manager
+    player.input = sim_input
+
+    def read_input(_dt: float) -> None:
+        if input_mailbox is not None:
+            input_mailbox.take(input_frame)
+            if (camera.view_width, camera.view_height) != input_frame.view:
+                camera.resize_view(*input_frame.view)
+        else:
+            input_manager.update()
+
+    def quick_save_load(_dt: float) -> None:
+        if sim_input.was_action_pressed("quicksave"):
+            save_manager.quick_save(player, enemy_registry, tile_map, config)
+        if sim_input.was_action_pressed("quickload"):
+            save_manager.quick_load(player, enemy_registry, tile_map, config)
+
+    def spawn_waves(dt: float) -> None:
+        if sim_input.was_action_pressed("spawn_wave"):
+            spawner.queue_wave(200, player.position.xy)
+        spawner.update(dt)
+
+    # Simulation systems in update order. Enemy AI decisions (line of sight, state changes) run at
+    # 10 Hz spread across ticks, movement stays at the physics rate.
+    scheduler = Scheduler(sim_time_step)
+    scheduler.register("enemy_lod", lambda dt: enemy_lod.reassign(player, camera), rate_hz=4)
+    scheduler.register("input", read_input)
+    scheduler.register("player", lambda dt: player.update(camera))
+    scheduler.register_staggered("enemy_ai", lambda: enemy_lod.awake, lambda enemy, dt: enemy.think(), rate_hz=10, budget_ms=2.0)
+    scheduler.register("crowd", lambda dt: crowd.update(enemy_lod.awake), rate_hz=30)
+    scheduler.register("enemies", enemy_lod.step)
+    scheduler.register("projectiles", lambda dt: projectiles.update(tile_map=tile_map, player=player, enemies=enemies))
+    scheduler.register("particles", particles.update, rate_hz=30)
+    # Camera follows player with dead zone and world clamp
+    scheduler.register("camera", lambda dt: camera.update_follow(player.position))
+    scheduler.register("saves", quick_save_load)
+    scheduler.register("spawner", spawn_waves)
+    # Deferred despawns land last, so every system saw a stable enemy list during the tick
+    scheduler.register("despawn", lambda dt: enemy_registry.flush())
+    particle_system = scheduler.get("particles")
+
+    recorder = None
+    if record is not None or replay is not None:
+        # The AI budget cuts a tick's share short by wall-clock time, which would differ between runs
+        scheduler.get("enemy_ai").budget_ms = None
+    if record is not None:
+        recorder = InputRecorder(record, input_manager, input_frame, session)
+    trace = recorder if recorder is not None else replay
+    tick_ms = array("d")
+
+    metrics = None
+    metrics_sink = performance.get("metrics", "off")
+    if metrics_sink in ("jsonl", "statsd"):
+        if metrics_sink == "jsonl":
+            sink = JsonLinesSink(performance.get("metrics_path", "metrics/frames.jsonl"))
+        else:
+            sink = StatsdSink(parse_address(performance.get("metrics_address", "127.0.0.1:8125")))
+        metrics = MetricsEmitter(sink, scheduler.systems, {
+            "enemies": lambda: len(enemies),
+            "projectiles": lambda: sum(1 for p in projectiles.projectiles if p.active),
+            "particles": lambda: sum(1 for p in particles.particles if p.active),
+            "chunks": lambda: render_map.cached_chunks,
+        }, flush_interval=float(performance.get("metrics_flush_s", 1.0)))
+        metrics.start()
+
+    def simulate_tick() -> None:
+        nonlocal sim_tick
+        if recorder is not None:
+            input_manager.update()
+            recorder.record_tick((camera.view_width, camera.view_height))
+        elif replay is not None:
+            replay.next_tick()
+            if (camera.view_width, camera.view_height) != input_frame.view:
+                camera.resize_view(*input_frame.view)
+        if sim_input.is_action_held("rewind"):
+            # Step back through recorded ticks instead of simulating
+            restored = snapshots.rewind(1)
+            if restored >= 0:
+                sim_tick = restored
+                camera.update_follow(player.position)
+        else:
+            scheduler.tick()
+            sim_tick += 1
+            snapshots.capture(sim_tick)
+        if trace is not None and trace.checksum_due:
+            trace.checksum(snapshots.checksum())
+
+    def replay_ticks():
+        # As many ticks as fit in one frame budget, or in 100 ms when nothing is drawn between batches
+        deadline = time.perf_counter() + (frame_budget_ms if render else 100.0) / 1000.0
+        while not replay.finished and time.perf_counter() < deadline:
+            yield None
+
+    # Threaded mode: simulation runs on a worker and hands the renderer immutable snapshots
+    sim_thread = None
+    render_buffer = None
+    render_camera = None
+    if threaded:
+        render_buffer = RenderBuffer()
+        render_camera = Camera(view_width=window_width, view_height=window_height, world_width=tile_map.pixel_width, world_height=tile_map.pixel_height)
+
+        def publish() -> None:
+            render_buffer.publish(capture_render_state(sim_tick, sim_time_step.dt, camera, player, enemies, projectiles, particles, particle_system.ahead_time), tile_map.take_tile_changes())
+
+        publish()
+        sim_thread = SimulationThread(sim_time_step, simulate_tick, publish, is_paused=lambda: pause_menu.is_open)
+        sim_thread.start()
+
+    # Multiplayer client: the server simulates, we only send input and mirror its snapshots
+    net_client = None
+    if connect is not None:
+        from game.net.client import GameClient
+        net_client = GameClient(connect, (window_width, window_height), player, enemy_registry, projectiles, tile_map)
+        net_client.connect()
 
     headless_mode = os.environ.get("SDL_VIDEODRIVER") == "dummy"
     frames_in_headless = 0
 
+    # Everything built so far lives for the whole session; frozen, later collections never traverse it
+    manual_gc = ManualGC() if performance.get("manual_gc") else None
+    if manual_gc is not None:
+        manual_gc.freeze()
+
+    replay_started = time.perf_counter()
     running = True
     while running:
         profiler.begin_frame()
@@ -83,83 +324,189 @@ def main() -> None:
             pause_menu.process_event(event)
 
         # Toggle pause
-        if input_manager.was_action_pressed("pause"):
+        if input_manager.take_action_pressed("pause"):
             pause_menu.toggle()
 
+        # Profile the next frames; the capture starts with the next frame and writes its files in the background
+        if input_manager.take_action_pressed("profile_capture") or profiler.frames + 1 == profile_at_frame:
+            profiler.capture.request()
+
         # Window resizes
         if pygame.display.get_window_size() != (window_width, window_height):
             window_width, window_height = pygame.display.get_window_size()
             scene_surface = pygame.Surface((window_width, window_height)).convert_alpha()
-            camera.resize_view(window_width, window_height)
+            # The simulation thread's camera gets the new size with the next posted input
+            (render_camera if render_camera is not None else camera).resize_view(window_width, window_height)
+
+        # Hand this frame's input to the simulation thread, which must not touch the InputManager itself
+        if input_mailbox is not None:
+            input_manager.update()
+            input_mailbox.post(input_manager, (window_width, window_height))
 
         # Update logic with fixed time step
-        for _ in time_step.step():
-            if not pause_menu.is_open:
+        for _ in (time_step.step() if replay is None else replay_ticks()):
+            if net_client is not None:
                 input_manager.update()
-
-                # Update entities
-                player.update(camera)
-                for enemy in enemies:
-                    enemy.update()
-
-                projectiles.update(tile_map=tile_map, player=player, enemies=enemies)
+                net_client.send_input(input_manager)
                 particles.update()
-
-                # Camera follows player with dead zone and world clamp
-                camera.update_follow(player.position)
-
-                # Quick save/load
-                if input_manager.was_action_pressed("quicksave"):
-                    save_manager.quick_save(player, enemies, tile_map, config)
-                if input_manager.was_action_pressed("quickload"):
-                    save_manager.quick_load(player, enemies, tile_map, config)
-
-            else:
+            elif pause_menu.is_open:
                 # Pause menu interaction while paused
                 pause_menu.update()
                 if pause_menu.request_quit:
                     running = False
-
-        # Render
-        scene_surface.fill((16, 16, 20))
-
-        tile_map.draw(scene_surface, camera)
-
-        # Draw entities
-        for enemy in enemies:
-            enemy.draw(scene_surface, camera)
-        player.draw(scene_surface, camera)
-
-        projectiles.draw(scene_surface, camera)
-        particles.draw(scene_surface, camera)
+            elif replay is not None:
+                start = time.perf_counter()
+                simulate_tick()
+                tick_ms.append((time.perf_counter() - start) * 1000.0)
+            elif sim_thread is None:
+                simulate_tick()
+            # The first tick of the frame consumes the presses; later ticks must not see them again. A frame
+            # without a tick keeps them for the next one so a press between two steps still reaches the sim
+            input_manager.end_frame()
+
+        if sim_thread is not None and sim_thread.error is not None:
+            raise sim_thread.error
+
+        if net_client is not None and net_client.poll():
+            camera.update_follow(player.position)
+        if net_client is not None and net_client.rejected:
+            print("Connection rejected:", net_client.reject_reason)
+            running = False
+
+        if replay is not None and replay.finished:
+            running = False
+        if not render:
+            # Replay without drawing: only drain the tile changes the render pass would have applied
+            tile_map.apply_tile_changes()
+            profiler.end_frame(clock.tick())
+            continue
+
+        # Render the world at render_scale, then upscale it once; the UI below stays at native resolution
+        if resolution is not None:
+            render_scale = resolution.update(profiler)
+        world_size = (max(1, int(window_width * render_scale)), max(1, int(window_height * render_scale)))
+        if world_surface.get_size() != world_size:
+            world_surface = scene_surface if world_size == scene_surface.get_size() else pygame.Surface(world_size, 0, screen)
+        (render_camera if render_buffer is not None else camera).render_scale = render_scale
+        world_surface.fill((16, 16, 20))
+
+        # Tiles destroyed or placed since the last frame: patch chunk surfaces, minimap and fog in one batch
+        if render_buffer is not None:
+            render_map.set_tiles(render_buffer.take_tile_changes())
+        render_map.apply_tile_changes()
+
+        if render_buffer is not None:
+            prev_state, curr_state = render_buffer.read()
+            alpha = RenderBuffer.alpha(curr_state)
+            interpolate_camera(render_camera, prev_state, curr_state, alpha)
+            render_map.draw(world_surface, render_camera)
+            draw_render_state(world_surface, render_camera, prev_state, curr_state, alpha)
+            if fog is not None:
+                fog.update(curr_state.player[:2])
+                fog.draw(world_surface, render_camera)
+        else:
+            tile_map.draw(world_surface, camera)
+
+            # Draw entities
+            for enemy in enemies:
+                enemy.draw(world_surface, camera)
+            player.draw(world_surface, camera)
+            if net_client is not None:
+                net_client.draw_remote_players(world_surface, camera)
+
+            projectiles.draw(world_surface, camera)
+            particles.draw(world_surface, camera, lead_time=particle_system.lead_time if net_client is None else 0.0)
+
+            # Visibility only changes when the player enters another tile
+            if fog is not None:
+                fog.update(player.position.xy)
+                fog.draw(world_surface, camera)
+
+        # Present; a scaled-down world is upscaled straight into the screen, which also saves the full-size blit
+        if world_surface is scene_surface:
+            screen.blit(scene_surface, (0, 0))
+        else:
+            pygame.transform.scale(world_surface, screen.get_size(), screen)
 
         # UI
-        hud.draw(scene_surface, player=player, enemies=enemies, projectiles=projectiles, config=config, profiler=profiler)
+        if render_buffer is not None:
+            # The simulation thread is mutating the live objects; read the snapshot that was just drawn
+            hud.draw_counts(screen, curr_state.player[5], len(curr_state.enemies), len(curr_state.projectiles), profiler)
+            if minimap is not None:
+                minimap.draw_points(screen, curr_state.player[:2], curr_state.enemies, render_camera)
+        else:
+            hud.draw(screen, player=player, enemies=enemies, projectiles=projectiles, config=config, profiler=profiler)
+            if minimap is not None:
+                minimap.draw(screen, player, enemies, camera)
         if pause_menu.is_open:
-            pause_menu.draw(scene_surface)
+            pause_menu.draw(screen)
 
-        # Present
-        screen.blit(scene_surface, (0, 0))
         pygame.display.flip()
-
-        # Cap frame rate
-        profiler.end_frame(clock.tick(120))
+        profiler.end_work()
+
+        # Spend what is left of the frame budget on garbage collection, then on building the chunks the
+        # camera is heading for; this is idle time, so it stays out of the work time dynamic resolution reads
+        if manual_gc is not None:
+            manual_gc.collect(frame_budget_ms - profiler.elapsed_ms - 1.0)
+        prefetcher.update(render_camera if render_buffer is not None else camera, clock.get_time() / 1000.0)
+        prefetch_ms = frame_budget_ms - profiler.elapsed_ms - 1.0
+        if prefetch_ms > 0.0:
+            prefetcher.run(prefetch_ms)
+        if startup.first_frame_ms is None:
+            startup.mark_first_frame()
+            if startup_report:
+                print(startup.report())
+
+        # Cap frame rate; a replay runs as fast as it can
+        profiler.end_frame(clock.tick(120 if replay is None else 0))
+        if metrics is not None:
+            metrics.record(profiler.frames, profiler.times_ms[-1], profiler.work_ms[-1])
 
         # Auto-exit in headless environments to avoid hanging CI
-        if headless_mode:
+        if headless_mode and replay is None:
             frames_in_headless += 1
             if frames_in_headless > 120:
                 running = False
 
-    # Save on exit
-    save_manager.auto_save(player, enemies, tile_map, config)
+    if sim_thread is not None:
+        sim_thread.stop()
+    profiler.capture.wait(timeout=5.0)
+    if metrics is not None:
+        metrics.close()
+
+    if recorder is not None:
+        recorder.close(snapshots.checksum())
+        print(f"Recorded {recorder.ticks} ticks to {record}")
+    if replay is not None:
+        print(replay.report(tick_ms, time.perf_counter() - replay_started, 1.0 / time_step.dt))
+
+    if net_client is not None:
+        net_client.disconnect()
+    elif replay is None:
+        # Save on exit
+        save_manager.auto_save(player, enemy_registry, tile_map, config)
 
     pygame.quit()
+    if replay is not None and replay.diverged_at is not None:
+        sys.exit(2)
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Python 2D Game")
+    parser.add_argument("--server", nargs="?", const=f"0.0.0.0:{DEFAULT_PORT}", metavar="HOST[:PORT]", help="run a headless authoritative server")
+    parser.add_argument("--connect", metavar="HOST[:PORT]", help="join a server instead of simulating locally")
+    parser.add_argument("--threaded", action="store_true", help="run the simulation on a worker thread")
+    parser.add_argument("--startup-report", action="store_true", help="print time per initialization phase and time to first frame")
+    parser.add_argument("--record", metavar="FILE", help="record the input of every tick and the RNG seeds to FILE")
+    parser.add_argument("--replay", metavar="FILE", help="replay a recording as fast as possible and check it ends in the recorded state")
+    parser.add_argument("--no-render", action="store_true", help="with --replay, only simulate")
+    args = parser.parse_args()
     try:
-        main()
+        if args.server is not None:
+            from game.net.server import run_server
+            run_server(*parse_address(args.server))
+        else:
+            main(connect=parse_address(args.connect) if args.connect else None, startup_report=args.startup_report, threaded=args.threaded, record=args.record, replay_path=args.replay, render=not args.no_render)
     except Exception as exc:
         print("Fatal error:", exc)
         pygame.quit()